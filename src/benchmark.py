@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+benchmark.py — Banco de pruebas de rendimiento de todos los motores.
+
+Corre cada motor registrado en MOTORES dentro del mismo proceso sobre
+fincas generadas con semilla fija, y para cada (motor, n):
+  - hace `calentamiento` corridas sin medir (imports, cachés, JIT de NumPy);
+  - mide `repeticiones` corridas con time.perf_counter y reporta mínimo,
+    mediana, p95 y media;
+  - hace una corrida extra bajo tracemalloc para el pico de memoria (aparte,
+    porque tracemalloc vuelve más lento el código que mide).
+
+El resultado es un JSON con los datos del entorno (Python, NumPy, sistema,
+núcleos, commit de git) y una fila por (motor, n). Con una base guardada,
+comparar() marca como regresión un motor que se volvió más lento que la
+tolerancia o que cambió de costo en la misma instancia.
+
+Uso desde consola (ejemplos):
+    python src/benchmark.py --salida bench.json
+    python src/benchmark.py --motores roV,roPD_numpy --repeticiones 9
+    python src/benchmark.py --base tests/benchmarks/base.json
+  Con --base la salida es 1 si hay regresiones.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.busqueda_local import roV_local
+from src.dinamica import roPD, roPD_ideales, roPD_numpy, roPD_paralelo
+from src.fuerza_bruta import roFB
+from src.ramificacion_poda import roBB
+from src.voraz import roV
+
+
+class Motor(NamedTuple):
+    """Un motor del banco: función finca -> (perm, costo) y tamaños por defecto."""
+    funcion: Callable
+    tamanos: Tuple[int, ...]
+
+
+MOTORES: Dict[str, Motor] = {}
+
+
+def registrar_motor(nombre: str, tamanos, funcion: Callable) -> None:
+    """Agrega un motor al banco. funcion(finca) debe devolver (perm, costo)."""
+    MOTORES[nombre] = Motor(funcion, tuple(tamanos))
+
+
+def _invertir(funcion):
+    """Adapta los motores de DP, que devuelven (costo, orden)."""
+    def adaptado(finca):
+        costo, orden = funcion(finca)
+        return orden, costo
+    return adaptado
+
+
+registrar_motor("roFB", (6, 8, 9), roFB)
+registrar_motor("roPD", (10, 12, 14), _invertir(roPD))
+registrar_motor("roPD_numpy", (14, 18, 20), _invertir(roPD_numpy))
+registrar_motor("roPD_paralelo", (18, 20, 22), _invertir(roPD_paralelo))
+registrar_motor("roBB", (15, 20, 25), roBB)
+registrar_motor("roPD_ideales", (20, 25, 30), _invertir(roPD_ideales))
+registrar_motor("roV", (1_000, 10_000, 50_000), roV)
+registrar_motor("roV_local", (500, 1_000), roV_local)
+
+
+def generar_finca(n: int, semilla: int, media: int = 30) -> List[Tuple[int, int, int]]:
+    """
+    Finca sintética con la distribución de las pruebas de voraz:
+    p en 1..4, tr en 1..10, ts ~ N(media, 15) truncado a >= 0.
+    """
+    rnd = random.Random(semilla)
+    finca = []
+    for _ in range(n):
+        tr = rnd.randint(1, 10)
+        p = rnd.randint(1, 4)
+        ts = max(0, int(rnd.gauss(mu=media, sigma=15)))
+        finca.append((ts, tr, p))
+    return finca
+
+
+def entorno() -> dict:
+    """Metadatos de la máquina y del código para interpretar los tiempos."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sistema": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def _percentil(valores, q):
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * q
+    bajo = int(k)
+    alto = min(bajo + 1, len(ordenados) - 1)
+    return ordenados[bajo] + (ordenados[alto] - ordenados[bajo]) * (k - bajo)
+
+
+def medir(funcion: Callable, finca, repeticiones: int = 5, calentamiento: int = 1) -> dict:
+    """
+    Mide funcion(finca).
+
+    Devuelve:
+      diccionario con costo, min_s, mediana_s, p95_s, media_s (segundos) y
+      pico_bytes (tracemalloc, en una corrida aparte).
+    """
+    for _ in range(calentamiento):
+        funcion(finca)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        _, costo = funcion(finca)
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        funcion(finca)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "costo": int(costo),
+        "min_s": min(tiempos),
+        "mediana_s": statistics.median(tiempos),
+        "p95_s": _percentil(tiempos, 0.95),
+        "media_s": statistics.fmean(tiempos),
+        "pico_bytes": pico,
+    }
+
+
+def correr_suite(motores=None, tamanos=None, repeticiones: int = 5, calentamiento: int = 1,
+                 semilla: int = 0, progreso=None) -> dict:
+    """
+    Corre el banco completo.
+
+    Parámetros:
+      motores: nombres de MOTORES (por defecto todos)
+      tamanos: lista de n para todos los motores (por defecto los de cada motor)
+      repeticiones, calentamiento: ver medir
+      semilla: la finca de tamaño n usa la semilla semilla + n
+      progreso: función opcional que recibe cada fila al terminarla
+
+    Devuelve:
+      {"entorno": {...}, "parametros": {...}, "resultados": [filas]}
+    """
+    motores = list(motores or MOTORES)
+    resultados = []
+    for nombre in motores:
+        if nombre not in MOTORES:
+            raise ValueError(f"Motor desconocido: {nombre}. Opciones: {', '.join(MOTORES)}")
+        motor = MOTORES[nombre]
+        for n in tamanos or motor.tamanos:
+            fila = {"motor": nombre, "n": n, "semilla": semilla + n, "repeticiones": repeticiones}
+            fila.update(medir(motor.funcion, generar_finca(n, semilla + n), repeticiones, calentamiento))
+            resultados.append(fila)
+            if progreso is not None:
+                progreso(fila)
+    return {
+        "entorno": entorno(),
+        "parametros": {"repeticiones": repeticiones, "calentamiento": calentamiento, "semilla": semilla},
+        "resultados": resultados,
+    }
+
+
+def comparar(actual: dict, base: dict, tolerancia: float = 0.25, piso_segundos: float = 0.005) -> List[str]:
+    """
+    Compara dos corridas de correr_suite por (motor, n).
+
+    Es regresión:
+      - un costo distinto para la misma instancia (semilla);
+      - una mediana mayor que base * (1 + tolerancia), si además la
+        diferencia supera piso_segundos (por debajo de eso manda el ruido).
+
+    Devuelve:
+      lista de mensajes, vacía si no hay regresiones.
+    """
+    previas = {(f["motor"], f["n"], f["semilla"]): f for f in base["resultados"]}
+    regresiones = []
+    for fila in actual["resultados"]:
+        previa = previas.get((fila["motor"], fila["n"], fila["semilla"]))
+        if previa is None:
+            continue
+        clave = f"{fila['motor']} n={fila['n']}"
+        if fila["costo"] != previa["costo"]:
+            regresiones.append(f"{clave}: costo {previa['costo']} -> {fila['costo']}")
+        limite = previa["mediana_s"] * (1 + tolerancia)
+        if fila["mediana_s"] > limite and fila["mediana_s"] - previa["mediana_s"] > piso_segundos:
+            regresiones.append(
+                f"{clave}: mediana {previa['mediana_s']:.4f} s -> {fila['mediana_s']:.4f} s "
+                f"(+{100 * (fila['mediana_s'] / previa['mediana_s'] - 1):.0f}%)"
+            )
+    return regresiones
+
+
+# ============================
+# CLI (para correr desde terminal)
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de los motores de riego.")
+    parser.add_argument("--motores", default=None, help="lista separada por comas (por defecto todos)")
+    parser.add_argument("--tamanos", default=None, help="lista de n separada por comas")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--calentamiento", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default=None, help="archivo JSON de resultados")
+    parser.add_argument("--base", default=None, help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    def mostrar(fila):
+        print(f"{fila['motor']:>11} n={fila['n']:<6} mediana={fila['mediana_s']:.4f}s "
+              f"p95={fila['p95_s']:.4f}s pico={fila['pico_bytes'] / 2**20:.1f}MB costo={fila['costo']}")
+
+    actual = correr_suite(
+        args.motores.split(",") if args.motores else None,
+        [int(n) for n in args.tamanos.split(",")] if args.tamanos else None,
+        args.repeticiones, args.calentamiento, args.semilla, progreso=mostrar,
+    )
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(actual, f, indent=2)
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = comparar(actual, base, args.tolerancia)
+        for mensaje in regresiones:
+            print(f"REGRESIÓN {mensaje}")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones respecto de la base.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+busqueda_local.py — Mejora local de un orden de riego.
+
+Toma cualquier permutación (la de roV u otra) y aplica movimientos de:
+  - intercambio adyacente: regar b antes que a cuando están seguidos;
+  - inserción: sacar un tablón de su posición y llevarlo hasta `ventana`
+    posiciones más adelante o más atrás.
+
+El cambio de costo de cada movimiento se calcula en O(1) a partir de los
+arreglos start/completion que mantiene la búsqueda (los mismos que arma
+voraz._calc_cost_and_starts): solo cambian los tablones que se mueven, el
+resto sigue empezando en el mismo instante. Una inserción a distancia d es
+una cadena de d intercambios adyacentes, así que recorrer todas las
+posiciones de la ventana cuesta O(1) por posición.
+
+Para escalar (n=50 000) se usan "don't look bits": en cada pasada solo se
+revisan los tablones cuya vecindad cambió en la pasada anterior.
+"""
+
+import time
+from typing import List, Tuple
+
+from src.finca import columnas
+from src.voraz import _calc_cost_and_starts, roV
+
+
+def mejorar_local(
+    finca: List[Tuple[int, int, int]],
+    perm: List[int],
+    ventana: int = 8,
+    max_pasadas: int = 50,
+    limite_segundos=None,
+    detener=None,
+):
+    """
+    Mejora por búsqueda local (primer mejor movimiento por tablón).
+
+    Parámetros:
+      finca: lista de tuplas (ts, tr, p) o Finca
+      perm: orden inicial de riego (no se modifica)
+      ventana: distancia máxima de una inserción (1 = solo intercambios)
+      max_pasadas: tope de pasadas sobre la permutación
+      limite_segundos: si se da, la búsqueda se detiene al cumplirse (se
+        revisa cada 1024 posiciones) y devuelve el mejor orden hasta ahí
+      detener: función opcional sin argumentos; si devuelve True (se
+        consulta junto con el límite de tiempo) la búsqueda termina igual
+
+    Cada pasada cuesta O(n * ventana); con n=50 000 y ventana=8 son ~2 s.
+
+    Devuelve:
+      (pi, costo) con costo <= costo(perm).
+    """
+    n = len(finca)
+    orden = list(perm)
+    start, completion, costo = _calc_cost_and_starts(finca, orden)
+    ts, tr, p = columnas(finca)
+
+    def costo_en(j, fin):
+        retraso = fin - ts[j]
+        return p[j] * retraso if retraso > 0 else 0
+
+    fin_limite = None if limite_segundos is None else time.perf_counter() + limite_segundos
+    vigilar = fin_limite is not None or detener is not None
+    revisar = [True] * n
+    for _ in range(max_pasadas):
+        hubo_mejora = False
+        i = 0
+        while i < n:
+            if vigilar and i % 1024 == 0 and (
+                (fin_limite is not None and time.perf_counter() > fin_limite)
+                or (detener is not None and detener())
+            ):
+                return orden, costo
+            x = orden[i]
+            if not revisar[x]:
+                i += 1
+                continue
+            revisar[x] = False
+            tr_x = tr[x]
+
+            mejor_delta = 0
+            mejor_pos = i
+            # hacia adelante: x pasa por encima de orden[i+1], orden[i+2], ...
+            delta = 0
+            s = start[x]
+            costo_x = costo_en(x, s + tr_x)
+            for k in range(i + 1, min(n, i + 1 + ventana)):
+                y = orden[k]
+                tr_y = tr[y]
+                nuevo_x = costo_en(x, s + tr_y + tr_x)
+                delta += costo_en(y, s + tr_y) + nuevo_x - costo_x - costo_en(y, s + tr_x + tr_y)
+                costo_x = nuevo_x
+                s += tr_y
+                if delta < mejor_delta:
+                    mejor_delta = delta
+                    mejor_pos = k
+            # hacia atrás: x pasa por debajo de orden[i-1], orden[i-2], ...
+            delta = 0
+            costo_x = costo_en(x, completion[x])
+            fin_x = completion[x]
+            for k in range(i - 1, max(-1, i - 1 - ventana), -1):
+                y = orden[k]
+                s = start[y]
+                nuevo_x = costo_en(x, fin_x - tr[y])
+                delta += nuevo_x + costo_en(y, fin_x) - costo_en(y, s + tr[y]) - costo_x
+                costo_x = nuevo_x
+                fin_x -= tr[y]
+                if delta < mejor_delta:
+                    mejor_delta = delta
+                    mejor_pos = k
+
+            if mejor_pos != i:
+                hubo_mejora = True
+                costo += mejor_delta
+                lo, hi = min(i, mejor_pos), max(i, mejor_pos)
+                t = start[orden[lo]]
+                orden.pop(i)
+                orden.insert(mejor_pos, x)
+                for k in range(lo, hi + 1):
+                    j = orden[k]
+                    start[j] = t
+                    t += tr[j]
+                    completion[j] = t
+                for k in range(max(0, lo - ventana), min(n, hi + 1 + ventana)):
+                    revisar[orden[k]] = True
+            i += 1
+        if not hubo_mejora:
+            break
+
+    return orden, costo
+
+
+def roV_local(finca: List[Tuple[int, int, int]], ventana: int = 8, max_pasadas: int = 50, limite_segundos=None):
+    """
+    roV seguido de mejorar_local. Devuelve (pi, costo) igual que roV.
+    """
+    perm, _ = roV(finca)
+    return mejorar_local(finca, perm, ventana, max_pasadas, limite_segundos)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+cache.py — Caché de resultados por contenido de la finca.
+
+La clave es sha256(algoritmo + finca canónica), donde la finca canónica son
+los tablones ordenados por (ts, tr, p). Dos fincas con los mismos tablones
+en otro orden tienen la misma clave: el orden guardado está expresado en
+posiciones canónicas y se traduce a los índices de cada finca al leerlo.
+Si hay tablones idénticos, cualquiera de ellos sirve en su lugar, así que
+el costo del orden traducido es el mismo.
+
+Dos niveles:
+  - memoria: LRU (OrderedDict) acotado por bytes (8 por tablón);
+  - disco (opcional): un archivo <clave>.bin por resultado, en el formato
+    de salida binaria de formato_binario; se escribe a un temporal y se
+    renombra (os.replace), así varios procesos pueden compartir el
+    directorio. Si el total supera max_bytes_disco se borran los archivos
+    usados hace más tiempo (la fecha de modificación se actualiza en cada
+    acierto). El total se lleva en un contador y el directorio solo se
+    recorre al crear la caché y al limpiar; lo que escriben otros procesos
+    se ve en la próxima limpieza.
+
+Uso:
+    cache = CacheResultados("cache_riego/")
+    costo, orden = cache.resolver(finca, "pd")
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from src.formato_binario import guardar_salida_binaria, leer_salida_binaria
+from src.instrumentacion import normalizar
+
+_VERSION = b"riego-cache-v1\0"
+
+
+def canonica(finca):
+    """
+    Devuelve (datos, orden): datos es el arreglo (n, 3) de la finca con los
+    tablones ordenados por (ts, tr, p) y orden[k] el índice original del
+    tablón en la posición canónica k.
+    """
+    datos = np.asarray(finca, dtype=np.int64).reshape(-1, 3)
+    orden = np.lexsort((datos[:, 2], datos[:, 1], datos[:, 0]))
+    return datos[orden], orden
+
+
+def clave(finca, algoritmo: str) -> str:
+    """Hash hexadecimal del algoritmo y el contenido canónico de la finca."""
+    return _clave_canonica(canonica(finca)[0], algoritmo)
+
+
+def _clave_canonica(datos, algoritmo):
+    h = hashlib.sha256(_VERSION)
+    h.update(algoritmo.encode("utf-8") + b"\0")
+    h.update(datos.astype("<i8").tobytes())
+    return h.hexdigest()
+
+
+def _motor(algoritmo):
+    # import diferido: lote importa todos los algoritmos
+    from src.lote import ALGORITMOS
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}. Opciones: {', '.join(ALGORITMOS)}")
+    return ALGORITMOS[algoritmo]
+
+
+class CacheResultados:
+    """
+    Caché de (costo, orden) por finca y algoritmo.
+
+    Parámetros:
+      directorio: carpeta del nivel en disco (None = solo memoria)
+      max_bytes_memoria: tope del LRU en memoria
+      max_bytes_disco: tope del directorio
+    """
+
+    def __init__(self, directorio=None, max_bytes_memoria=64 << 20, max_bytes_disco=1 << 30):
+        self.directorio = directorio
+        self.max_bytes_memoria = max_bytes_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()  # clave -> (costo, orden canónico)
+        self._bytes_memoria = 0
+        self.estadisticas = {"aciertos_memoria": 0, "aciertos_disco": 0, "fallos": 0}
+        self._bytes_disco = 0
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+            self._bytes_disco = sum(tam for _, tam, _ in self._archivos_disco())
+
+    def _ruta(self, k):
+        return os.path.join(self.directorio, k + ".bin")
+
+    def _recordar(self, k, costo, orden_canonico):
+        previo = self._memoria.pop(k, None)
+        if previo is not None:
+            self._bytes_memoria -= 8 * len(previo[1])
+        self._memoria[k] = (costo, orden_canonico)
+        self._bytes_memoria += 8 * len(orden_canonico)
+        while self._bytes_memoria > self.max_bytes_memoria and len(self._memoria) > 1:
+            _, (_, viejo) = self._memoria.popitem(last=False)
+            self._bytes_memoria -= 8 * len(viejo)
+
+    def _buscar(self, k):
+        if k in self._memoria:
+            self._memoria.move_to_end(k)
+            self.estadisticas["aciertos_memoria"] += 1
+            return self._memoria[k]
+        if self.directorio is not None:
+            ruta = self._ruta(k)
+            try:
+                costo, orden = leer_salida_binaria(ruta)
+                orden = np.array(orden)
+                os.utime(ruta)
+            except (OSError, ValueError):
+                pass  # no está, o lo borró la limpieza de otro proceso
+            else:
+                self.estadisticas["aciertos_disco"] += 1
+                self._recordar(k, costo, orden)
+                return costo, orden
+        self.estadisticas["fallos"] += 1
+        return None
+
+    def _archivos_disco(self):
+        """(fecha de modificación, tamaño, ruta) de cada .bin del directorio."""
+        archivos = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(".bin"):
+                try:
+                    info = entrada.stat()
+                except OSError:
+                    continue
+                archivos.append((info.st_mtime, info.st_size, entrada.path))
+        return archivos
+
+    def _limpiar_disco(self):
+        archivos = self._archivos_disco()
+        total = sum(tam for _, tam, _ in archivos)
+        for _, tam, ruta in sorted(archivos):
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            total -= tam
+        self._bytes_disco = total
+
+    def obtener(self, finca, algoritmo: str):
+        """(costo, orden) guardado para la finca, con índices de esta finca, o None."""
+        _, orden_finca, k = self._canonica(finca, algoritmo)
+        return self._obtener(k, orden_finca)
+
+    def guardar(self, finca, algoritmo: str, costo, orden) -> None:
+        """Guarda el (costo, orden) de la finca (orden con índices de la finca)."""
+        self._guardar(self._canonica(finca, algoritmo), costo, orden)
+
+    def resolver(self, finca, algoritmo: str = "pd", funcion=None):
+        """
+        (costo, orden) de la finca: de la caché si está, y si no se resuelve
+        con funcion (por defecto lote.ALGORITMOS[algoritmo]) y se guarda.
+        """
+        canonizada = self._canonica(finca, algoritmo)
+        encontrado = self._obtener(canonizada[2], canonizada[1])
+        if encontrado is not None:
+            return encontrado
+        orden, costo = normalizar((funcion or _motor(algoritmo))(finca))
+        self._guardar(canonizada, costo, orden)
+        return costo, list(orden)
+
+    def _canonica(self, finca, algoritmo):
+        datos, orden_finca = canonica(finca)
+        return datos, orden_finca, _clave_canonica(datos, algoritmo)
+
+    def _obtener(self, k, orden_finca):
+        encontrado = self._buscar(k)
+        if encontrado is None:
+            return None
+        costo, orden_canonico = encontrado
+        return costo, orden_finca[orden_canonico].tolist()
+
+    def _guardar(self, canonizada, costo, orden):
+        _, orden_finca, k = canonizada
+        posicion = np.empty_like(orden_finca)
+        posicion[orden_finca] = np.arange(len(orden_finca))
+        orden_canonico = posicion[np.asarray(orden, dtype=np.int64)]
+        self._recordar(k, costo, orden_canonico)
+        if self.directorio is not None:
+            ruta = self._ruta(k)
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            guardar_salida_binaria(temporal, costo, orden_canonico)
+            try:
+                self._bytes_disco -= os.path.getsize(ruta)  # se reemplaza
+            except OSError:
+                pass
+            self._bytes_disco += os.path.getsize(temporal)
+            os.replace(temporal, ruta)
+            if self._bytes_disco > self.max_bytes_disco:
+                self._limpiar_disco()
@@ -1,23 +1,52 @@
+import hashlib
+import json
 import math
+import mmap
+import multiprocessing as mp
+import os
+import time
+from array import array
+from functools import lru_cache
 from itertools import combinations
 
+import numpy as np
 
-def roPD(finca):
+from src.finca import columnas, columnas_np
+from src.instrumentacion import NULO
+from src.ramificacion_poda import precedencias
+from src.utils import _cabe_en_int64
+
+# Valor centinela para estados no alcanzables en las tablas planas (int64)
+_INF = 2 ** 62
+
+
+def roPD(finca, instrumentos=NULO):
     """
     Programación dinámica Bottom-Up (sin máscaras)
     Retorna el costo mínimo y el orden óptimo de riego.
-    finca: lista de tuplas (ts, tr, p)
+    finca: lista de tuplas (ts, tr, p) o Finca
+    instrumentos: ver src/instrumentacion.py (fases "tabla" y
+      "reconstruccion", contador "estados_dp")
     """
+    with instrumentos.fase("tabla"):
+        dp, parent = _tabla_roPD(finca)
+    if instrumentos.activo:
+        instrumentos.contar("estados_dp", sum(len(fila) for fila in dp.values()))
+    with instrumentos.fase("reconstruccion"):
+        return _reconstruir_roPD(finca, dp, parent)
+
+
+def _tabla_roPD(finca):
     n = len(finca)
+    ts, tr, p = columnas(finca)
     dp = {}         
     parent = {}     
 
     # Casos base (subconjuntos de tamaño 1)
     for i in range(n):
         subset = (i,)
-        ts, tr, p = finca[i]
-        retraso = max(0, tr - ts)
-        dp[subset] = {i: p * retraso}        
+        retraso = max(0, tr[i] - ts[i])
+        dp[subset] = {i: p[i] * retraso}        
         parent[subset] = {i: None}
         
     # Construcción Bottom-Up
@@ -32,11 +61,10 @@ def roPD(finca):
                 mejor_prev = None
 
                 # tiempo acumulado previo
-                tiempo_prev = sum(finca[x][1] for x in prev_subset)
-                ts_j, tr_j, p_j = finca[j]
-                fin_riego = tiempo_prev + tr_j
-                retraso = max(0, fin_riego - ts_j)
-                costo_extra = p_j * retraso
+                tiempo_prev = sum(tr[x] for x in prev_subset)
+                fin_riego = tiempo_prev + tr[j]
+                retraso = max(0, fin_riego - ts[j])
+                costo_extra = p[j] * retraso
 
                 # buscamos mejor previo
                 for prev_last, costo_prev in dp[prev_subset].items():
@@ -48,6 +76,11 @@ def roPD(finca):
                 dp[subset][j] = mejor
                 parent[subset][j] = mejor_prev
 
+    return dp, parent
+
+
+def _reconstruir_roPD(finca, dp, parent):
+    n = len(finca)
     # Solución óptima final
     full = tuple(range(n))
     mejor_tablon = min(dp[full], key=dp[full].get)
@@ -64,4 +97,593 @@ def roPD(finca):
         actual = prev
     orden.reverse()
 
-    return mejor_costo, orden
\ No newline at end of file
+    return mejor_costo, orden
+
+
+def _tiempos_subconjuntos(tr, exacto=False):
+    """
+    Precalcula tiempo[mask] = suma de tr de los tablones en mask, para las
+    2^n máscaras, reutilizando la máscara sin su bit más bajo: O(2^n).
+    Con exacto=True la tabla es una lista de enteros de Python.
+    """
+    total = 1 << len(tr)
+    tiempo = [0] * total if exacto else array('q', bytes(8 * total))
+    for mask in range(1, total):
+        bajo = mask & -mask
+        tiempo[mask] = tiempo[mask ^ bajo] + tr[bajo.bit_length() - 1]
+    return tiempo
+
+
+def _reconstruir_orden(elegido, n):
+    """
+    Reconstruye el orden óptimo quitando el último tablón de cada
+    subconjunto, desde la máscara completa hasta el vacío.
+    """
+    orden = []
+    mask = (1 << n) - 1
+    while mask:
+        j = int(elegido[mask])
+        orden.append(j)
+        mask ^= 1 << j
+    orden.reverse()
+    return orden
+
+
+def roPD_mascaras(finca):
+    """
+    Programación dinámica Bottom-Up indexada por máscaras de bits.
+    Misma recurrencia y mismo desempate que roPD, pero:
+      - cada subconjunto es un entero (bit i encendido = tablón i regado),
+      - dp y parent son arreglos planos preasignados de tamaño 2^n * n
+        (el estado (mask, j) vive en la posición mask*n + j),
+      - el tiempo acumulado de cada subconjunto se calcula una sola vez,
+      - el mínimo de cada fila dp[mask] se guarda al terminarla, así buscar
+        el mejor previo cuesta O(1) en lugar de recorrer dp[prev].
+    Si los costos pueden pasar de int64 (ver utils._cabe_en_int64) las
+    tablas 'q' no sirven y se resuelve con roPD, que usa enteros de Python.
+    Retorna (costo, orden) igual que roPD.
+    finca: lista de tuplas (ts, tr, p) o Finca
+    """
+    n = len(finca)
+    if n == 0:
+        return 0, []
+    if not _cabe_en_int64(*columnas_np(finca)):
+        return roPD(finca)
+
+    ts, tr, p = columnas(finca)
+    total = 1 << n
+    tiempo = _tiempos_subconjuntos(tr)
+
+    dp = array('q', [_INF]) * (total * n)
+    parent = array('b', [-1]) * (total * n)
+    # mínimo de cada fila dp[mask] y el primer j que lo alcanza
+    fila_min = array('q', [_INF]) * total
+    fila_arg = array('b', [-1]) * total
+
+    for mask in range(1, total):
+        fin_riego = tiempo[mask]
+        base = mask * n
+        resto = mask
+        while resto:
+            bit = resto & -resto
+            resto ^= bit
+            j = bit.bit_length() - 1
+            prev = mask ^ bit
+            retraso = fin_riego - ts[j]
+            costo_extra = p[j] * retraso if retraso > 0 else 0
+            if prev:
+                dp[base + j] = fila_min[prev] + costo_extra
+                parent[base + j] = fila_arg[prev]
+            else:
+                dp[base + j] = costo_extra
+
+        fila = dp[base:base + n]
+        mejor = min(fila)
+        fila_min[mask] = mejor
+        fila_arg[mask] = fila.index(mejor)
+
+    # Solución óptima final y reconstrucción del orden
+    full = total - 1
+    mejor_costo = fila_min[full]
+    orden = []
+    mask = full
+    actual = fila_arg[full]
+    while actual != -1:
+        orden.append(actual)
+        prev = parent[mask * n + actual]
+        mask ^= 1 << actual
+        actual = prev
+    orden.reverse()
+
+    return mejor_costo, orden
+
+
+def roPD_compacto(finca):
+    """
+    Programación dinámica con estado reducido a solo el subconjunto.
+    El costo extra de regar j al final de mask depende únicamente de
+    tiempo[mask] (suma de tr), no de cuál fue el último tablón, así que
+    dp[mask][j] de roPD se colapsa en:
+        mejor[mask]   = min_j (mejor[mask - {j}] + p_j * max(0, tiempo[mask] - ts_j))
+        elegido[mask] = el primer j que alcanza ese mínimo
+    Se guardan 2^n enteros de 8 bytes y 2^n de 1 byte (en vez de 2^n * n
+    de cada uno), con el mismo desempate que roPD. Si los costos pueden
+    pasar de int64 (ver utils._cabe_en_int64), tiempo y mejor son listas
+    de enteros de Python y el centinela es math.inf, así el resultado
+    sigue siendo exacto.
+    Retorna (costo, orden) igual que roPD.
+    finca: lista de tuplas (ts, tr, p) o Finca
+    """
+    n = len(finca)
+    if n == 0:
+        return 0, []
+
+    exacto = not _cabe_en_int64(*columnas_np(finca))
+    ts, tr, p = columnas(finca)
+    total = 1 << n
+    tiempo = _tiempos_subconjuntos(tr, exacto)
+
+    mejor = [0] * total if exacto else array('q', bytes(8 * total))
+    elegido = array('b', [-1]) * total
+    infinito = math.inf if exacto else _INF
+
+    for mask in range(1, total):
+        fin_riego = tiempo[mask]
+        costo_mask = infinito
+        ultimo = -1
+        resto = mask
+        while resto:
+            bit = resto & -resto
+            resto ^= bit
+            j = bit.bit_length() - 1
+            retraso = fin_riego - ts[j]
+            total_j = mejor[mask ^ bit] + (p[j] * retraso if retraso > 0 else 0)
+            if total_j < costo_mask:
+                costo_mask = total_j
+                ultimo = j
+        mejor[mask] = costo_mask
+        elegido[mask] = ultimo
+
+    return mejor[total - 1], _reconstruir_orden(elegido, n)
+
+
+# Máscaras procesadas por bloque en roPD_numpy (limita la matriz bloque x n)
+_BLOQUE_NUMPY = 1 << 15
+
+
+def _capas_numpy(n):
+    """
+    Agrupa las 2^n máscaras por cantidad de bits encendidos: la capa k
+    (k = 1..n) es el arreglo de todos los subconjuntos de tamaño k, en
+    orden creciente.
+    """
+    total = 1 << n
+    popcount = np.zeros(total, dtype=np.int8)
+    for j in range(n):
+        popcount[1 << j:2 << j] = popcount[:1 << j] + 1
+    orden = np.argsort(popcount, kind="stable")
+    cortes = np.cumsum(np.bincount(popcount, minlength=n + 1))
+    return [orden[cortes[k - 1]:cortes[k]] for k in range(1, n + 1)]
+
+
+def _tiempos_numpy(tr):
+    """
+    Versión vectorizada de _tiempos_subconjuntos: cada bit j duplica la
+    tabla sumando tr[j] a la mitad superior.
+    """
+    n = len(tr)
+    tiempo = np.zeros(1 << n, dtype=np.int64)
+    for j in range(n):
+        tiempo[1 << j:2 << j] = tiempo[:1 << j] + tr[j]
+    return tiempo
+
+
+def _relajar_capa(masks, mejor, elegido, tiempo, ts, p):
+    """
+    Calcula mejor[mask] y elegido[mask] para un bloque de máscaras de la
+    misma capa, con operaciones sobre arreglos completos:
+      - fin de riego de cada máscara: tiempo[masks]
+      - penalización de cada tablón j como último: p_j * max(0, fin - ts_j)
+      - reducción min sobre los predecesores mask - {j} (argmin toma el
+        primer j, el mismo desempate que roPD)
+    Las columnas de tablones que no están en la máscara se tapan con _INF
+    después de sumar la penalización: si se sumara sobre _INF podría
+    desbordar y ganar un tablón ajeno a la máscara.
+    """
+    n = len(ts)
+    bits = np.left_shift(1, np.arange(n, dtype=np.int64))
+    pertenece = (masks[:, None] & bits) != 0
+    prev = masks[:, None] ^ bits
+    fin_riego = tiempo[masks][:, None]
+    candidatos = mejor[prev] + p * np.maximum(fin_riego - ts, 0)
+    candidatos = np.where(pertenece, candidatos, _INF)
+    ultimo = candidatos.argmin(axis=1)
+    mejor[masks] = candidatos[np.arange(len(masks)), ultimo]
+    elegido[masks] = ultimo
+
+
+def roPD_numpy(finca, instrumentos=NULO):
+    """
+    Programación dinámica por capas vectorizada con NumPy.
+    Misma recurrencia que roPD_compacto (un estado por subconjunto), pero
+    todos los subconjuntos de una capa (misma cantidad de tablones) se
+    resuelven a la vez, en bloques de _BLOQUE_NUMPY máscaras. Si los costos
+    pueden pasar de int64 (ver utils._cabe_en_int64) se resuelve con
+    roPD_compacto, que en ese caso usa enteros de Python.
+    Retorna (costo, orden) igual que roPD.
+    finca: lista de tuplas (ts, tr, p) o Finca
+    instrumentos: ver src/instrumentacion.py (fases "tiempos", "capas" y
+      "reconstruccion", contadores "estados_dp" y "transiciones_dp")
+    """
+    n = len(finca)
+    if n == 0:
+        return 0, []
+    if not _cabe_en_int64(*columnas_np(finca)):
+        return roPD_compacto(finca)
+
+    ts, tr, p = (np.asarray(c, dtype=np.int64) for c in columnas_np(finca))
+    total = 1 << n
+    with instrumentos.fase("tiempos"):
+        tiempo = _tiempos_numpy(tr)
+
+    mejor = np.zeros(total, dtype=np.int64)
+    elegido = np.full(total, -1, dtype=np.int8)
+
+    with instrumentos.fase("capas"):
+        for capa in _capas_numpy(n):
+            for inicio in range(0, len(capa), _BLOQUE_NUMPY):
+                _relajar_capa(capa[inicio:inicio + _BLOQUE_NUMPY], mejor, elegido, tiempo, ts, p)
+    instrumentos.contar("estados_dp", total - 1)
+    instrumentos.contar("transiciones_dp", n << (n - 1))
+
+    with instrumentos.fase("reconstruccion"):
+        orden = _reconstruir_orden(elegido, n)
+    return int(mejor[total - 1]), orden
+
+
+def roPD_ideales(finca, estadisticas=None, instrumentos=NULO):
+    """
+    Programación dinámica sobre ideales: la recurrencia de roPD_compacto,
+    pero solo con los subconjuntos que pueden ser el comienzo de un orden
+    que respete las precedencias de ramificacion_poda.precedencias (reglas
+    de dominancia de Emmons para tardanza ponderada). Un subconjunto S entra
+    si para cada j en S todos los predecesores de j también están en S; los
+    demás nunca son prefijo de un orden óptimo y la DP no los visita.
+
+    Las capas se generan hacia adelante desde el vacío, agregando a cada
+    ideal los tablones cuyos predecesores ya están todos, así el costo es
+    proporcional a la cantidad de ideales (y no a 2^n). Con los datos de
+    las pruebas quedan miles o decenas de miles de estados con n = 30, en
+    vez de 10^9. Empata como roPD (el menor j).
+    Retorna (costo, orden) igual que roPD.
+
+    finca: lista de tuplas (ts, tr, p) o Finca
+    estadisticas: diccionario opcional donde se reportan estados (ideales
+      no vacíos visitados), subconjuntos (2^n - 1, los de roPD),
+      precedencias (pares i antes de j) y tiempo_segundos
+    instrumentos: ver src/instrumentacion.py (fases "precedencias", "capas"
+      y "reconstruccion", contadores "estados_dp" y "transiciones_dp")
+    """
+    inicio = time.perf_counter()
+    n = len(finca)
+    ts, tr, p = columnas(finca)
+    with instrumentos.fase("precedencias"):
+        pred = precedencias(finca)
+
+    # capa actual: ideal -> (mejor costo, tiempo de riego acumulado)
+    capa = {0: (0, 0)}
+    elegido = {}
+    estados = transiciones = 0
+    with instrumentos.fase("capas"):
+        for _ in range(n):
+            siguiente = {}
+            for mask, (costo, t) in capa.items():
+                for j in range(n):
+                    if mask >> j & 1 or pred[j] & ~mask:
+                        continue
+                    fin_riego = t + tr[j]
+                    retraso = fin_riego - ts[j]
+                    total_j = costo + (p[j] * retraso if retraso > 0 else 0)
+                    hijo = mask | (1 << j)
+                    previo = siguiente.get(hijo)
+                    if previo is None or total_j < previo[0] or (total_j == previo[0] and j < elegido[hijo]):
+                        siguiente[hijo] = (total_j, fin_riego)
+                        elegido[hijo] = j
+                    transiciones += 1
+            capa = siguiente
+            estados += len(capa)
+    instrumentos.contar("estados_dp", estados)
+    instrumentos.contar("transiciones_dp", transiciones)
+
+    with instrumentos.fase("reconstruccion"):
+        orden = _reconstruir_orden(elegido, n)
+    if estadisticas is not None:
+        estadisticas["estados"] = estados
+        estadisticas["subconjuntos"] = (1 << n) - 1
+        estadisticas["precedencias"] = sum(bin(mask).count("1") for mask in pred)
+        estadisticas["tiempo_segundos"] = time.perf_counter() - inicio
+    return capa[(1 << n) - 1][0], orden
+
+
+# roPD_disco: bits bajos de la tabla de máscaras por popcount (2^16 entradas)
+_BITS_BAJOS = 16
+# roPD_disco: máscaras por bloque; después de cada uno se sueltan las páginas,
+# así la memoria residente es del orden de bloque * n páginas
+_BLOQUE_DISCO = 1 << 10
+# Archivos de roPD_disco dentro del directorio de trabajo
+_ARCHIVOS_DISCO = ("tiempo.npy", "mejor.npy", "elegido.npy")
+_ESTADO_DISCO = "estado.json"
+
+
+@lru_cache(maxsize=4)
+def _bajos_por_popcount(b):
+    """bajos[c] = los números de b bits con c bits encendidos, en orden creciente."""
+    popcount = np.zeros(1 << b, dtype=np.int8)
+    for j in range(b):
+        popcount[1 << j:2 << j] = popcount[:1 << j] + 1
+    return [np.flatnonzero(popcount == c) for c in range(b + 1)]
+
+
+def _capa_en_bloques(n, k, bloque, b=None, desde=0, hasta=None):
+    """
+    Máscaras de n bits con k encendidos, en orden creciente y en bloques de
+    al menos `bloque` (salvo el último), sin la tabla de 2^n de _capas_numpy:
+    cada máscara es (alto << b) | bajo, y los bajos de cada popcount salen
+    de una tabla de 2^b, con b = min(n, _BITS_BAJOS) por defecto. Con
+    desde/hasta se generan solo las de alto en [desde, hasta), así una capa
+    se reparte en tramos independientes.
+    """
+    b = min(n, _BITS_BAJOS) if b is None else b
+    bajos = _bajos_por_popcount(b)
+    hasta = 1 << (n - b) if hasta is None else hasta
+
+    pendientes, tamano = [], 0
+    for alto in range(desde, hasta):
+        resto = k - bin(alto).count("1")
+        if 0 <= resto <= b:
+            pendientes.append((alto << b) | bajos[resto])
+            tamano += len(pendientes[-1])
+            if tamano >= bloque:
+                yield np.concatenate(pendientes)
+                pendientes, tamano = [], 0
+    if pendientes:
+        yield np.concatenate(pendientes)
+
+
+class _TablaDisco:
+    """
+    Un .npy de roPD_disco mapeado con mmap propio (y no np.memmap) para
+    poder soltar sus páginas con madvise: quedan en el caché de archivos
+    del sistema, pero dejan de contar como memoria residente del proceso.
+    Se marca MADV_RANDOM porque los accesos a mask - {j} saltan por toda la
+    tabla: sin eso cada fallo de página mapea también las vecinas.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "r+b") as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                forma, _, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                forma, _, dtype = np.lib.format.read_array_header_2_0(f)
+            inicio = f.tell()
+            self._mapa = mmap.mmap(f.fileno(), 0)
+        if hasattr(mmap, "MADV_RANDOM"):
+            self._mapa.madvise(mmap.MADV_RANDOM)
+        self.datos = np.frombuffer(self._mapa, dtype=dtype, count=forma[0], offset=inicio)
+
+    def soltar(self):
+        """Saca las páginas mapeadas de la memoria del proceso."""
+        if hasattr(mmap, "MADV_DONTNEED"):
+            self._mapa.madvise(mmap.MADV_DONTNEED)
+
+    def bajar(self):
+        """Escribe los cambios al archivo (msync)."""
+        self._mapa.flush()
+
+    def cerrar(self):
+        self.datos = None
+        self._mapa.flush()
+        try:
+            self._mapa.close()
+        except BufferError:
+            pass  # un traceback todavía ve el arreglo; se desmapea al liberarlo
+
+
+def _huella(ts, tr, p):
+    """sha256 de las columnas: identifica la finca de un directorio de roPD_disco."""
+    return hashlib.sha256(np.stack((ts, tr, p)).astype("<i8").tobytes()).hexdigest()
+
+
+def _guardar_estado(directorio, estado):
+    """Escribe estado.json a un temporal y lo renombra: nunca queda a medias."""
+    ruta = os.path.join(directorio, _ESTADO_DISCO)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(estado, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(ruta + ".tmp", ruta)
+
+
+def roPD_disco(finca, directorio, borrar=True, estadisticas=None, instrumentos=NULO):
+    """
+    Programación dinámica por capas con las tablas en disco.
+    La misma recurrencia y el mismo desempate que roPD_numpy (usa
+    _relajar_capa), pero tiempo, mejor y elegido son archivos .npy mapeados
+    en memoria dentro de `directorio` (17 bytes por subconjunto: con n = 28
+    son 4.6 GB de disco), y las capas se generan en bloques de
+    _BLOQUE_DISCO máscaras sin la tabla de popcount de 2^n. Después de cada
+    bloque se sueltan las páginas de los archivos (ver _TablaDisco), así la
+    memoria residente no crece con 2^n.
+
+    Después de cada capa completa se bajan las tablas a disco y se anota la
+    capa en estado.json, así una corrida interrumpida (corte de luz, kill,
+    Ctrl-C) sigue desde la capa siguiente al volver a llamarla con el mismo
+    directorio y la misma finca.
+    Retorna (costo, orden) igual que roPD.
+
+    finca: lista de tuplas (ts, tr, p) o Finca; si sus costos pueden pasar
+      de int64 (ver utils._cabe_en_int64) lanza ValueError, porque las
+      tablas en disco son de int64 (con n chico sirve roPD_compacto)
+    directorio: carpeta de trabajo (se crea si no existe); con otra finca
+      a medias lanza ValueError
+    borrar: si es True, al terminar se borran los archivos; si es False
+      quedan y una nueva llamada solo reconstruye el orden
+    estadisticas: diccionario opcional donde se reportan capas_retomadas
+      (capas que ya estaban hechas), bytes_disco y tiempo_segundos
+    instrumentos: ver src/instrumentacion.py (fases "tiempos", "capas" y
+      "reconstruccion", contadores "estados_dp" y "transiciones_dp")
+    """
+    inicio = time.perf_counter()
+    n = len(finca)
+    if n == 0:
+        return 0, []
+    if not _cabe_en_int64(*columnas_np(finca)):
+        raise ValueError("Los costos de esta finca no entran en int64; use roPD_compacto.")
+
+    ts, tr, p = (np.asarray(c, dtype=np.int64) for c in columnas_np(finca))
+    total = 1 << n
+    os.makedirs(directorio, exist_ok=True)
+    rutas = [os.path.join(directorio, nombre) for nombre in _ARCHIVOS_DISCO]
+    ruta_estado = os.path.join(directorio, _ESTADO_DISCO)
+    huella = _huella(ts, tr, p)
+
+    if os.path.exists(ruta_estado):
+        with open(ruta_estado, encoding="utf-8") as f:
+            estado = json.load(f)
+        if estado["huella"] != huella:
+            raise ValueError(f"{directorio} tiene las tablas de otra finca; use otro directorio o bórrelo.")
+    else:
+        for ruta, dtype in zip(rutas, (np.int64, np.int64, np.int8)):
+            np.lib.format.open_memmap(ruta, mode="w+", dtype=dtype, shape=(total,)).flush()
+        estado = {"huella": huella, "n": n, "capa": -1}
+        _guardar_estado(directorio, estado)
+
+    tablas = [_TablaDisco(ruta) for ruta in rutas]
+    tiempo, mejor, elegido = (tabla.datos for tabla in tablas)
+    try:
+        if estado["capa"] < 0:
+            with instrumentos.fase("tiempos"):
+                for j in range(n):
+                    for desde in range(0, 1 << j, _BLOQUE_NUMPY):
+                        hasta = min(1 << j, desde + _BLOQUE_NUMPY)
+                        tiempo[(1 << j) + desde:(1 << j) + hasta] = tiempo[desde:hasta] + tr[j]
+                        tablas[0].soltar()
+                elegido[0] = -1
+            for tabla in tablas:
+                tabla.bajar()
+            estado["capa"] = 0
+            _guardar_estado(directorio, estado)
+        capas_retomadas = estado["capa"]
+
+        with instrumentos.fase("capas"):
+            for k in range(estado["capa"] + 1, n + 1):
+                for masks in _capa_en_bloques(n, k, _BLOQUE_DISCO):
+                    _relajar_capa(masks, mejor, elegido, tiempo, ts, p)
+                    for tabla in tablas:
+                        tabla.soltar()
+                # la capa queda en disco antes de anotarla
+                tablas[1].bajar()
+                tablas[2].bajar()
+                estado["capa"] = k
+                _guardar_estado(directorio, estado)
+        instrumentos.contar("estados_dp", total - 1)
+        instrumentos.contar("transiciones_dp", n << (n - 1))
+
+        with instrumentos.fase("reconstruccion"):
+            costo, orden = int(mejor[total - 1]), _reconstruir_orden(elegido, n)
+    finally:
+        del tiempo, mejor, elegido
+        for tabla in tablas:
+            tabla.cerrar()
+    if estadisticas is not None:
+        estadisticas["capas_retomadas"] = capas_retomadas
+        estadisticas["bytes_disco"] = sum(os.path.getsize(ruta) for ruta in rutas)
+        estadisticas["tiempo_segundos"] = time.perf_counter() - inicio
+    if borrar:
+        for ruta in rutas + [ruta_estado]:
+            os.remove(ruta)
+    return costo, orden
+
+
+# ============================
+# DP por capas en varios núcleos
+# ============================
+# Estado de cada proceso trabajador (lo fija _iniciar_trabajador)
+_trabajo = {}
+
+# Bits altos que definen los tramos de cada capa en roPD_paralelo (2^8 tramos)
+_BITS_TRAMO = 8
+
+
+def _iniciar_trabajador(ts, p, tiempo, mejor, elegido):
+    _trabajo["ts"], _trabajo["p"] = ts, p
+    _trabajo["tiempo"] = np.frombuffer(tiempo, dtype=np.int64)
+    _trabajo["mejor"] = np.frombuffer(mejor, dtype=np.int64)
+    _trabajo["elegido"] = np.frombuffer(elegido, dtype=np.int8)
+
+
+def _relajar_tramo(tarea):
+    """
+    Resuelve las máscaras de la capa k con alto en [desde, hasta) sobre las
+    tablas compartidas. Cada tramo escribe máscaras distintas y solo lee la
+    capa anterior, que ya está completa.
+    """
+    k, b, desde, hasta = tarea
+    ts, p = _trabajo["ts"], _trabajo["p"]
+    mejor, elegido, tiempo = _trabajo["mejor"], _trabajo["elegido"], _trabajo["tiempo"]
+    for masks in _capa_en_bloques(len(ts), k, _BLOQUE_NUMPY, b, desde, hasta):
+        _relajar_capa(masks, mejor, elegido, tiempo, ts, p)
+
+
+def roPD_paralelo(finca, procesos=None, instrumentos=NULO):
+    """
+    Programación dinámica por capas repartida en un pool de procesos.
+    Las máscaras de una misma capa no dependen entre sí: cada capa se
+    divide en tramos por los _BITS_TRAMO bits altos de la máscara
+    (ver _capa_en_bloques) y cada trabajador los resuelve con
+    _relajar_capa. Las tablas tiempo, mejor y elegido viven en memoria
+    compartida (mp.RawArray), así los trabajadores leen la capa anterior y
+    escriben la suya sin copiar ni serializar nada; al proceso principal
+    solo vuelve el aviso de que el tramo terminó. Entre capas hay una
+    barrera (pool.map).
+    Cada máscara se calcula igual que en roPD_numpy, así que el resultado
+    es idéntico al serial.
+    - procesos: cantidad de trabajadores (por defecto os.cpu_count());
+      con 1, con n <= _BITS_TRAMO o si los costos pueden pasar de int64
+      (ver utils._cabe_en_int64), se usa roPD_numpy.
+    Retorna (costo, orden) igual que roPD.
+    instrumentos: ver src/instrumentacion.py (mismas fases y contadores
+      que roPD_numpy)
+    """
+    n = len(finca)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or n <= _BITS_TRAMO or not _cabe_en_int64(*columnas_np(finca)):
+        return roPD_numpy(finca, instrumentos)
+
+    ts, tr, p = (np.asarray(c, dtype=np.int64) for c in columnas_np(finca))
+    total = 1 << n
+    tiempo_compartido = mp.RawArray("q", total)
+    mejor_compartido = mp.RawArray("q", total)
+    elegido_compartido = mp.RawArray("b", total)
+    with instrumentos.fase("tiempos"):
+        np.frombuffer(tiempo_compartido, dtype=np.int64)[:] = _tiempos_numpy(tr)
+    elegido = np.frombuffer(elegido_compartido, dtype=np.int8)
+    elegido[0] = -1
+
+    # b bits bajos por máscara, 2^(n - b) valores de alto a repartir
+    b = n - _BITS_TRAMO
+    altos = 1 << _BITS_TRAMO
+    cortes = np.linspace(0, altos, min(altos, 4 * procesos) + 1).astype(int)
+    tramos = list(zip(cortes[:-1].tolist(), cortes[1:].tolist()))
+    with instrumentos.fase("capas"):
+        with mp.Pool(procesos, initializer=_iniciar_trabajador,
+                     initargs=(ts, p, tiempo_compartido, mejor_compartido, elegido_compartido)) as pool:
+            for k in range(1, n + 1):
+                pool.map(_relajar_tramo, [(k, b, desde, hasta) for desde, hasta in tramos], chunksize=1)
+    instrumentos.contar("estados_dp", total - 1)
+    instrumentos.contar("transiciones_dp", n << (n - 1))
+
+    with instrumentos.fase("reconstruccion"):
+        orden = _reconstruir_orden(elegido, n)
+    return int(np.frombuffer(mejor_compartido, dtype=np.int64)[total - 1]), orden
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+finca.py — Finca compacta en columnas.
+
+La finca de siempre es una lista de tuplas (ts, tr, p): cada tablón cuesta
+el puntero de la lista, una tupla de 3 y sus enteros (unos 70-150 bytes) y
+los ciclos internos hacen finca[i][1]. Finca guarda tres arreglos int64 de
+NumPy (24 bytes por tablón) y sigue comportándose como la lista de tuplas
+donde hace falta (len, finca[i], iteración, np.asarray), así que todos los
+algoritmos la aceptan igual que antes.
+
+    finca = Finca.leer("entrada.txt")        # texto o binario
+    finca = Finca.desde([(10, 3, 2), ...])   # desde la lista de tuplas
+    perm, costo = roV(finca)
+
+Los algoritmos toman las columnas con columnas(finca) (listas de Python,
+para ciclos internos) o columnas_np(finca) (arreglos, sin copiar si ya es
+una Finca), que también aceptan la lista de tuplas.
+"""
+
+import numpy as np
+
+
+class Finca:
+    """
+    Tablones en columnas: ts, tr y p son arreglos int64 del mismo largo.
+
+    Parámetros:
+      ts, tr, p: secuencias o arreglos (no se copian si ya son int64 contiguos)
+    """
+    __slots__ = ("ts", "tr", "p")
+
+    def __init__(self, ts, tr, p):
+        self.ts = np.ascontiguousarray(ts, dtype=np.int64)
+        self.tr = np.ascontiguousarray(tr, dtype=np.int64)
+        self.p = np.ascontiguousarray(p, dtype=np.int64)
+        if not len(self.ts) == len(self.tr) == len(self.p):
+            raise ValueError(
+                f"Las columnas deben tener el mismo largo: ts={len(self.ts)}, tr={len(self.tr)}, p={len(self.p)}."
+            )
+
+    @classmethod
+    def desde(cls, finca) -> "Finca":
+        """Finca desde una lista de tuplas (ts, tr, p), un arreglo (n, 3) u otra Finca."""
+        if isinstance(finca, cls):
+            return finca
+        columnas = np.ascontiguousarray(np.asarray(finca, dtype=np.int64).reshape(-1, 3).T)
+        return cls(*columnas)
+
+    @classmethod
+    def leer(cls, ruta) -> "Finca":
+        """
+        Lee un archivo de entrada de texto o binario (utils.leer_finca_np, con
+        sus validaciones). Una finca binaria queda sobre el archivo mapeado,
+        sin copiar.
+        """
+        # import diferido: utils usa columnas_np de este módulo
+        from src.utils import leer_finca_np
+        return cls(*np.ascontiguousarray(leer_finca_np(ruta).T))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return Finca(self.ts[i], self.tr[i], self.p[i])
+        return int(self.ts[i]), int(self.tr[i]), int(self.p[i])
+
+    def __iter__(self):
+        return zip(self.ts.tolist(), self.tr.tolist(), self.p.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        return np.stack((self.ts, self.tr, self.p), axis=1).astype(dtype or np.int64, copy=False)
+
+    def __eq__(self, otra):
+        if not isinstance(otra, Finca):
+            return NotImplemented
+        return (np.array_equal(self.ts, otra.ts) and np.array_equal(self.tr, otra.tr)
+                and np.array_equal(self.p, otra.p))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Finca(n={len(self)})"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes de las tres columnas."""
+        return self.ts.nbytes + self.tr.nbytes + self.p.nbytes
+
+    def tolist(self):
+        """La lista de tuplas (ts, tr, p) de siempre."""
+        return list(self)
+
+
+def columnas(finca):
+    """
+    Listas (ts, tr, p) de la finca para los ciclos internos, sin
+    finca[i][k]. Acepta una Finca o la lista de tuplas.
+    """
+    if isinstance(finca, Finca):
+        return finca.ts.tolist(), finca.tr.tolist(), finca.p.tolist()
+    ts = [t[0] for t in finca]
+    tr = [t[1] for t in finca]
+    p = [t[2] for t in finca]
+    return ts, tr, p
+
+
+def columnas_np(finca):
+    """
+    Arreglos (ts, tr, p) de la finca: las columnas mismas si es una Finca,
+    o las columnas del arreglo (n, 3) si es una lista de tuplas o un arreglo.
+    """
+    if isinstance(finca, Finca):
+        return finca.ts, finca.tr, finca.p
+    datos = np.asarray(finca)
+    if datos.size == 0:
+        datos = np.zeros((0, 3), dtype=np.int64)
+    datos = datos.reshape(-1, 3)
+    return datos[:, 0], datos[:, 1], datos[:, 2]
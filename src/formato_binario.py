@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+formato_binario.py — Formato binario columnar para fincas y salidas.
+
+Finca (archivo .bin):
+    8 bytes   magia b"RIEGOFB1"
+    8 bytes   n (entero sin signo, little-endian)
+    8*n bytes ts0 .. ts(n-1)   (int64 little-endian)
+    8*n bytes tr0 .. tr(n-1)
+    8*n bytes p0 .. p(n-1)
+
+Salida (orden de riego):
+    8 bytes   magia b"RIEGOPB1"
+    8 bytes   costo (int64)
+    8 bytes   n
+    8*n bytes pi0 .. pi(n-1)   (int64)
+
+Las columnas quedan alineadas a 8 bytes, así que se leen con np.memmap sin
+copiar nada: leer_finca_binaria devuelve una vista (n, 3) sobre el archivo.
+
+Los lectores de texto (utils.leer_finca, utils.leer_finca_np y
+voraz._leer_finca_desde_archivo) reconocen la magia y leen el binario
+automáticamente, así que las CLI aceptan cualquiera de los dos formatos.
+
+Uso desde consola (convierte en el sentido que corresponda):
+    python src/formato_binario.py finca.txt finca.bin
+    python src/formato_binario.py finca.bin finca.txt
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import _escribir_filas, leer_finca_np
+
+MAGIA_FINCA = b"RIEGOFB1"
+MAGIA_SALIDA = b"RIEGOPB1"
+
+_TIPO = np.dtype("<i8")
+
+
+def _magia(ruta):
+    with open(ruta, "rb") as f:
+        return f.read(len(MAGIA_FINCA))
+
+
+def es_finca_binaria(ruta) -> bool:
+    """True si el archivo empieza con la magia de finca binaria."""
+    return _magia(ruta) == MAGIA_FINCA
+
+
+def es_salida_binaria(ruta) -> bool:
+    """True si el archivo empieza con la magia de salida binaria."""
+    return _magia(ruta) == MAGIA_SALIDA
+
+
+def guardar_finca_binaria(ruta, finca) -> None:
+    """
+    Escribe la finca (lista de tuplas o arreglo (n, 3)) en formato binario.
+    Cada columna se escribe de una vez desde el arreglo.
+    """
+    datos = np.asarray(finca, dtype=_TIPO).reshape(-1, 3)
+    with open(ruta, "wb") as f:
+        f.write(MAGIA_FINCA)
+        f.write(np.uint64(len(datos)).astype("<u8").tobytes())
+        for columna in range(3):
+            np.ascontiguousarray(datos[:, columna]).tofile(f)
+
+
+def leer_finca_binaria(ruta, validar: bool = True) -> np.ndarray:
+    """
+    Lee una finca binaria sin copiarla.
+
+    Parámetros:
+      ruta: archivo escrito por guardar_finca_binaria
+      validar: revisa p en 1..4, ts >= 0 y tr > 0 (una pasada por columna)
+
+    Devuelve:
+      arreglo (n, 3) de int64 con columnas ts, tr, p; es una vista de un
+      np.memmap de solo lectura sobre el archivo.
+    """
+    tam = os.path.getsize(ruta)
+    with open(ruta, "rb") as f:
+        cabecera = f.read(16)
+    if len(cabecera) < 16 or cabecera[:8] != MAGIA_FINCA:
+        raise ValueError("El archivo no es una finca binaria (falta la cabecera RIEGOFB1).")
+    n = int(np.frombuffer(cabecera, dtype="<u8", count=1, offset=8)[0])
+    if tam != 16 + 3 * 8 * n:
+        raise ValueError(
+            f"Finca binaria con tamaño inválido: n={n} requiere {16 + 24 * n} bytes; tiene {tam}."
+        )
+    if n == 0:
+        return np.zeros((0, 3), dtype=_TIPO)
+    columnas = np.memmap(ruta, dtype=_TIPO, mode="r", offset=16, shape=(3, n))
+    finca = columnas.T
+    if validar:
+        ts, tr, p = columnas
+        malos = np.flatnonzero((p < 1) | (p > 4))
+        if len(malos):
+            i = int(malos[0])
+            raise ValueError(f"Tablón {i}: p debe estar en 1..4, recibido p={p[i]}.")
+        malos = np.flatnonzero((ts < 0) | (tr <= 0))
+        if len(malos):
+            i = int(malos[0])
+            raise ValueError(f"Tablón {i}: ts >= 0 y tr > 0, recibido ts={ts[i]}, tr={tr[i]}.")
+    return finca
+
+
+def guardar_salida_binaria(ruta, costo, permutacion) -> None:
+    """Escribe costo y permutación en formato binario (ver cabecera del módulo)."""
+    perm = np.asarray(permutacion, dtype=_TIPO)
+    with open(ruta, "wb") as f:
+        f.write(MAGIA_SALIDA)
+        f.write(np.array([costo, len(perm)], dtype=_TIPO).tobytes())
+        perm.tofile(f)
+
+
+def leer_salida_binaria(ruta):
+    """
+    Lee una salida binaria.
+    Devuelve (costo, perm) con perm como np.memmap de int64 (sin copia).
+    """
+    tam = os.path.getsize(ruta)
+    with open(ruta, "rb") as f:
+        cabecera = f.read(24)
+    if len(cabecera) < 24 or cabecera[:8] != MAGIA_SALIDA:
+        raise ValueError("El archivo no es una salida binaria (falta la cabecera RIEGOPB1).")
+    costo, n = np.frombuffer(cabecera, dtype=_TIPO, count=2, offset=8).tolist()
+    if n < 0 or tam != 24 + 8 * n:
+        raise ValueError(f"Salida binaria con tamaño inválido: n={n}, {tam} bytes.")
+    if n == 0:
+        return costo, np.zeros(0, dtype=_TIPO)
+    return costo, np.memmap(ruta, dtype=_TIPO, mode="r", offset=24, shape=(n,))
+
+
+def texto_a_binario(entrada, salida) -> int:
+    """Convierte una finca de texto a binario. Devuelve n."""
+    finca = leer_finca_np(entrada)
+    guardar_finca_binaria(salida, finca)
+    return len(finca)
+
+
+def binario_a_texto(entrada, salida) -> int:
+    """Convierte una finca binaria al formato de texto del enunciado. Devuelve n."""
+    finca = leer_finca_binaria(entrada)
+    with open(salida, "wb") as f:
+        f.write(f"{len(finca)}\n".encode())
+        _escribir_filas(f, [finca[:, 0], finca[:, 1], finca[:, 2]])
+    return len(finca)
+
+
+# ============================
+# CLI (para correr desde terminal)
+# ============================
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if len(argv) != 2:
+        print("Uso: python src/formato_binario.py <finca_entrada> <finca_salida>", file=sys.stderr)
+        sys.exit(2)
+
+    entrada, salida = argv
+    try:
+        if es_finca_binaria(entrada):
+            n = binario_a_texto(entrada, salida)
+            print(f"{n} tablones: binario -> texto")
+        else:
+            n = texto_a_binario(entrada, salida)
+            print(f"{n} tablones: texto -> binario")
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,329 @@
 """
 Fuerza bruta.
-src/utils.py contiene la función `calcular_costo(finca, orden)`.   
+src/utils.py contiene la función `calcular_costo(finca, orden)` y el núcleo
+`costo_lote(finca, permutaciones)` que evalúa muchas permutaciones a la vez.
 """
+import heapq
 import itertools
+import multiprocessing as mp
+import os
 from typing import List, Tuple
-from src.utils import calcular_costo  # usa la función centralizada en utils
+import numpy as np
+from src.finca import columnas, columnas_np
+from src.instrumentacion import NULO
+from src.utils import costo_lote  # núcleo de costo centralizado en utils
+from src.voraz import roV
+
+# Permutaciones evaluadas por lote en la versión clásica
+_TAM_LOTE = 4096
 
 def roFB_all(finca: List[Tuple[int,int,int]]):
     """
     Genera todas las permutaciones y retorna lista de (perm, costo).
-    - finca: lista de tuplas (ts, tr, p)
+    - finca: lista de tuplas (ts, tr, p) o Finca
     - perm: lista de índices
+    Materializa n! resultados; para n grande usar roFB_iter, roFB_mejores
+    o roFB_dentro_de.
+    """
+    return list(roFB_iter(finca))
+
+
+def _enumerar(finca, cota=None, estricta=False):
+    """
+    Generador de (perm, costo) en el mismo orden que itertools.permutations,
+    por extensión de prefijos (el costo se arrastra, O(1) por nodo) y con
+    una pila explícita, así la memoria es O(n).
+    - cota: lista de un elemento con el costo máximo admitido; se relee en
+      cada nodo, de modo que quien consume el generador puede bajarla.
+      Un prefijo que la supera se poda (válido solo con prioridades >= 0).
+    - estricta: si es True también se poda el costo igual a la cota.
     """
     n = len(finca)
-    resultados = []
-    for perm in itertools.permutations(range(n)):
-        costo = calcular_costo(finca, perm)
-        resultados.append((list(perm), costo))
-    return resultados
+    ts, tr, p = columnas(finca)
+    usado = [False] * n
+    prefijo = []
+    tiempos = [0] * (n + 1)
+    costos = [0] * (n + 1)
+    siguiente = [0] * (n + 1)
+    d = 0
+    while True:
+        if d == n:
+            yield list(prefijo), costos[n]
+            if n == 0:
+                return
+            d -= 1
+            usado[prefijo.pop()] = False
+            continue
+
+        i = siguiente[d]
+        while i < n:
+            if not usado[i]:
+                fin_riego = tiempos[d] + tr[i]
+                retraso = fin_riego - ts[i]
+                nuevo = costos[d] + p[i] * retraso if retraso > 0 else costos[d]
+                if cota is None or nuevo < cota[0] or (nuevo == cota[0] and not estricta):
+                    break
+            i += 1
+
+        if i < n:
+            siguiente[d] = i + 1
+            usado[i] = True
+            prefijo.append(i)
+            tiempos[d + 1] = fin_riego
+            costos[d + 1] = nuevo
+            siguiente[d + 1] = 0
+            d += 1
+        elif d == 0:
+            return
+        else:
+            d -= 1
+            usado[prefijo.pop()] = False
+
+
+def roFB_iter(finca: List[Tuple[int,int,int]]):
+    """
+    Versión perezosa de roFB_all: produce (perm, costo) uno por uno, en el
+    mismo orden, sin guardar las n! permutaciones.
+    """
+    return _enumerar(finca)
+
+
+def roFB_dentro_de(finca: List[Tuple[int,int,int]], tolerancia):
+    """
+    Generador de todas las (perm, costo) con costo <= óptimo + tolerancia,
+    en orden lexicográfico. Primero calcula el óptimo con roFB y luego
+    enumera podando los prefijos que ya superan ese límite.
+    """
+    limite = roFB(finca)[1] + tolerancia
+    podar = bool((columnas_np(finca)[2] >= 0).all())
+    for perm, costo in _enumerar(finca, [limite] if podar else None):
+        if costo <= limite:
+            yield perm, costo
 
-def roFB(finca: List[Tuple[int,int,int]]):
+
+def roFB_mejores(finca: List[Tuple[int,int,int]], k):
+    """
+    Retorna las k permutaciones más baratas como lista de (perm, costo),
+    ordenada por costo (y ante empates, por orden lexicográfico).
+    Usa un heap acotado a k elementos: memoria O(k) sin importar n. Con el
+    heap lleno, la cota pasa a ser el peor costo guardado y se podan los
+    prefijos que ya lo alcanzan.
+    """
+    if k <= 0:
+        return []
+    podar = bool((columnas_np(finca)[2] >= 0).all())
+    cota = [float("inf")]
+    heap = []  # (-costo, -secuencia, perm): la raíz es el peor guardado
+    for secuencia, (perm, costo) in enumerate(_enumerar(finca, cota if podar else None, estricta=True)):
+        if len(heap) < k:
+            heapq.heappush(heap, (-costo, -secuencia, perm))
+        elif costo < -heap[0][0]:
+            heapq.heapreplace(heap, (-costo, -secuencia, perm))
+        else:
+            continue
+        if len(heap) == k:
+            cota[0] = -heap[0][0]
+    return [(perm, -costo) for costo, _, perm in sorted(heap, reverse=True)]
+
+def roFB(finca: List[Tuple[int,int,int]], podar=None, instrumentos=NULO):
     """
     Retorna la mejor permutación y su costo (sin almacenar todas).
     Devuelve: (mejor_perm: List[int], mejor_costo: int)
+    - podar: None (automático) usa la enumeración por prefijos con poda
+      cuando es equivalente a la clásica, es decir, cuando todas las
+      prioridades son >= 0 (así el costo de un prefijo nunca baja al
+      extenderlo). True/False fuerzan uno u otro modo.
+    - instrumentos: ver src/instrumentacion.py (contador
+      "permutaciones_evaluadas": las completas que se llegaron a evaluar)
+    """
+    if podar is None:
+        podar = bool((columnas_np(finca)[2] >= 0).all())
+    if podar:
+        return roFB_podado(finca, instrumentos)
+    return _roFB_clasico(finca, instrumentos)
+
+
+def _roFB_clasico(finca: List[Tuple[int,int,int]], instrumentos=NULO):
+    """
+    Recorre itertools.permutations y calcula el costo de cada una desde cero,
+    en lotes de _TAM_LOTE permutaciones evaluados juntos con costo_lote.
     """
     n = len(finca)
+    datos = np.asarray(finca).reshape(n, 3) if n else finca
+    mejor_perm = None
+    mejor_costo = float("inf")
+    evaluadas = 0
+    permutaciones = itertools.permutations(range(n))
+    while True:
+        lote = list(itertools.islice(permutaciones, _TAM_LOTE))
+        if not lote:
+            break
+        evaluadas += len(lote)
+        costos = costo_lote(datos, lote)
+        k = int(np.argmin(costos))  # primera de menor costo, como el recorrido uno a uno
+        if costos[k] < mejor_costo:
+            mejor_costo = int(costos[k])
+            mejor_perm = list(lote[k])
+    instrumentos.contar("permutaciones_evaluadas", evaluadas)
+    return mejor_perm, mejor_costo
+
+
+def roFB_podado(finca: List[Tuple[int,int,int]], instrumentos=NULO):
+    """
+    Fuerza bruta por extensión de prefijos.
+    Recorre las permutaciones en el mismo orden lexicográfico que
+    itertools.permutations, pero llevando el tiempo y el costo acumulados
+    del prefijo, así cada permutación cuesta O(1) adicional en lugar de O(n).
+    Una rama se corta en cuanto el costo del prefijo alcanza al mejor costo
+    completo encontrado: con prioridades >= 0 ninguna permutación de esa
+    rama puede ser estrictamente mejor, así que el resultado es idéntico al
+    de la versión clásica (misma permutación ante empates). Antes de la
+    primera permutación completa la cota es el costo de roV.
+    Devuelve: (mejor_perm: List[int], mejor_costo: int)
+    """
+    n = len(finca)
+    ts, tr, p = columnas(finca)
+    usado = [False] * n
+    prefijo = []
+    mejor_perm = None
+    # El costo de roV es alcanzable: mientras no haya permutación propia se
+    # poda solo lo estrictamente peor, así los empates con él no se pierden.
+    mejor_costo = roV(finca)[1] if n else float("inf")
+    completas = 0  # solo se cuenta en las hojas, para no frenar la búsqueda
+
+    def extender(tiempo_actual, costo):
+        nonlocal mejor_perm, mejor_costo, completas
+        if len(prefijo) == n:
+            completas += 1
+            if costo < mejor_costo or mejor_perm is None:
+                mejor_costo = costo
+                mejor_perm = list(prefijo)
+            return
+        for i in range(n):
+            if usado[i]:
+                continue
+            fin_riego = tiempo_actual + tr[i]
+            retraso = fin_riego - ts[i]
+            nuevo = costo + p[i] * retraso if retraso > 0 else costo
+            if nuevo >= mejor_costo and (mejor_perm is not None or nuevo > mejor_costo):
+                continue
+            usado[i] = True
+            prefijo.append(i)
+            extender(fin_riego, nuevo)
+            prefijo.pop()
+            usado[i] = False
+
+    extender(0, 0)
+    instrumentos.contar("permutaciones_evaluadas", completas)
+    return mejor_perm, mejor_costo
+
+
+# ============================
+# Fuerza bruta en varios núcleos
+# ============================
+# Estado de cada proceso trabajador (lo fija _iniciar_trabajador)
+_trabajo = {}
+
+# Cada cuántos nodos un trabajador relee la mejor cota compartida
+_NODOS_ENTRE_LECTURAS = 4096
+
+
+def _iniciar_trabajador(finca, cota_compartida, candado):
+    _trabajo["ts"], _trabajo["tr"], _trabajo["p"] = columnas(finca)
+    _trabajo["cota"] = cota_compartida
+    _trabajo["candado"] = candado
+
+
+def _buscar_rama(rama):
+    """
+    Busca la mejor permutación que empieza con el prefijo fijo rama.
+    Poda con dos cotas:
+      - la mejor local con >=, igual que roFB_podado;
+      - la mejor compartida entre procesos con > estricto, para no perder
+        una permutación empatada que sea lexicográficamente anterior.
+    Retorna (perm, costo) o None si toda la rama quedó podada.
+    """
+    ts, tr, p = _trabajo["ts"], _trabajo["tr"], _trabajo["p"]
+    compartida = _trabajo["cota"]
+    n = len(ts)
+    usado = [False] * n
+    prefijo = []
+    tiempo_actual = 0
+    costo = 0
+    for i in rama:
+        usado[i] = True
+        prefijo.append(i)
+        tiempo_actual += tr[i]
+        retraso = tiempo_actual - ts[i]
+        if retraso > 0:
+            costo += p[i] * retraso
+    if costo > compartida.value:
+        return None
+
+    mejor_perm = None
+    mejor_costo = float("inf")
+    cota = compartida.value
+    nodos = 0
+
+    def extender(tiempo_actual, costo):
+        nonlocal mejor_perm, mejor_costo, cota, nodos
+        nodos += 1
+        if nodos % _NODOS_ENTRE_LECTURAS == 0:
+            cota = compartida.value
+        if len(prefijo) == n:
+            if costo < mejor_costo:
+                mejor_costo = costo
+                mejor_perm = list(prefijo)
+                with _trabajo["candado"]:
+                    if costo < compartida.value:
+                        compartida.value = costo
+            return
+        for i in range(n):
+            if usado[i]:
+                continue
+            fin_riego = tiempo_actual + tr[i]
+            retraso = fin_riego - ts[i]
+            nuevo = costo + p[i] * retraso if retraso > 0 else costo
+            if nuevo >= mejor_costo or nuevo > cota:
+                continue
+            usado[i] = True
+            prefijo.append(i)
+            extender(fin_riego, nuevo)
+            prefijo.pop()
+            usado[i] = False
+
+    extender(tiempo_actual, costo)
+    if mejor_perm is None:
+        return None
+    return mejor_perm, mejor_costo
+
+
+def roFB_paralelo(finca: List[Tuple[int,int,int]], procesos=None, profundidad=2):
+    """
+    Fuerza bruta exhaustiva repartida en un pool de procesos.
+    El espacio de permutaciones se divide por las primeras `profundidad`
+    posiciones (1 o 2); cada rama la resuelve un trabajador con la misma
+    enumeración podada de roFB_podado, y todos comparten la mejor cota
+    encontrada (inicialmente la de roV) para podar.
+    Ante empates gana la rama lexicográficamente menor, así el resultado
+    es idéntico al de roFB serial.
+    - procesos: cantidad de trabajadores (por defecto os.cpu_count()).
+    Devuelve: (mejor_perm: List[int], mejor_costo: int)
+    """
+    n = len(finca)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or n < 2 or bool((columnas_np(finca)[2] < 0).any()):
+        return roFB(finca)
+
+    ramas = list(itertools.permutations(range(n), min(profundidad, n)))
+    cota = mp.RawValue("d", roV(finca)[1])
+    candado = mp.Lock()
+    with mp.Pool(procesos, initializer=_iniciar_trabajador, initargs=(finca, cota, candado)) as pool:
+        resultados = pool.map(_buscar_rama, ramas, chunksize=1)
+
     mejor_perm = None
     mejor_costo = float("inf")
-    for perm in itertools.permutations(range(n)):
-        costo = calcular_costo(finca, perm)
-        if costo < mejor_costo:
-            mejor_costo = costo
-            mejor_perm = list(perm)
+    for resultado in resultados:
+        if resultado is not None and resultado[1] < mejor_costo:
+            mejor_perm, mejor_costo = resultado
     return mejor_perm, mejor_costo
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+incremental.py — Reprogramación incremental del orden voraz (EDD).
+
+Cuando cambia un tablón, roV vuelve a ordenar toda la finca y a recorrerla
+entera para el costo. PlanificadorIncremental mantiene el orden EDD de roV
+(ts asc, p desc, tr asc, índice asc) en un treap y el costo total al día:
+
+    plan = PlanificadorIncremental(finca)
+    plan.modificar(17, tr=6)
+    i = plan.agregar(40, 3, 2)
+    plan.quitar(5)
+    plan.costo, plan.orden()
+
+Cada nodo guarda su retraso d = C - ts (C = fin de su riego) y, para su
+subárbol, la suma de tr (sumas prefijas por posición) y, sobre los tablones
+atrasados (d > 0), la suma de p y de p*d; además el mayor d <= 0 y el menor
+d > 0. Agregar o quitar un tablón corre en tr el fin de todos los que le
+siguen: en un subárbol donde nadie cruza el 0 (se mira con el mayor d <= 0
+o el menor d > 0) el corrimiento se aplica en O(1) y queda pendiente para
+los hijos; solo se baja por las ramas donde algún tablón pasa de a tiempo a
+atrasado o al revés.
+
+Complejidad (esperada, por el treap):
+- agregar / quitar / modificar: O(log n) más O(log n) por cada tablón que
+  cambia de estado (a tiempo <-> atrasado) por la edición.
+- costo: O(1). inicio(i): O(log n). orden(): O(n).
+- Construcción: O(n log n) por el ordenamiento, en NumPy.
+
+Los índices de los tablones son estables: agregar() devuelve n, n+1, ...
+y quitar un tablón no renumera a los demás.
+"""
+
+import random
+from array import array
+from typing import List, Tuple
+
+import numpy as np
+
+# Centinelas de "no hay" para el mayor d <= 0 y el menor d > 0
+_SIN_NEGATIVO = -(1 << 62)
+_SIN_POSITIVO = 1 << 62
+
+
+def _arreglo(codigo, valores):
+    a = array(codigo)
+    a.frombytes(np.ascontiguousarray(valores, dtype=np.float64 if codigo == "d" else np.int64).tobytes())
+    return a
+
+
+def _validar(i, ts, tr, p):
+    if not 1 <= p <= 4:
+        raise ValueError(f"Tablón {i}: p debe estar en 1..4, recibido p={p}.")
+    if ts < 0 or tr <= 0:
+        raise ValueError(f"Tablón {i}: ts >= 0 y tr > 0, recibido ts={ts}, tr={tr}.")
+
+
+class PlanificadorIncremental:
+    """
+    Orden voraz EDD y su costo, actualizados por edición.
+
+    Parámetros:
+      finca: lista de tuplas (ts, tr, p) o arreglo (n, 3) inicial
+      semilla: semilla de las prioridades del treap
+    """
+
+    def __init__(self, finca=(), semilla: int = 0):
+        datos = np.asarray(finca, dtype=np.int64).reshape(-1, 3)
+        n = len(datos)
+        ts, tr, p = datos[:, 0], datos[:, 1], datos[:, 2]
+        malos = np.flatnonzero((p < 1) | (p > 4) | (ts < 0) | (tr <= 0))
+        if len(malos):
+            i = int(malos[0])
+            _validar(i, int(ts[i]), int(tr[i]), int(p[i]))
+
+        self._azar = random.Random(semilla)
+        self._vivos = n
+        self._vivo = bytearray(b"\x01" * n)
+        self._ts = _arreglo("q", ts)
+        self._tr = _arreglo("q", tr)
+        self._p = _arreglo("q", p)
+        self._construir(datos, np.random.default_rng(semilla))
+
+    # ============================
+    # Construcción
+    # ============================
+    def _construir(self, datos, rng):
+        """
+        Árbol balanceado sobre el orden EDD, armado por niveles con NumPy.
+        Las prioridades son n valores al azar repartidos de mayor a menor
+        por niveles, así el árbol cumple el orden de heap del treap.
+        """
+        n = len(datos)
+        orden = np.lexsort((datos[:, 1], -datos[:, 2], datos[:, 0]))
+        izq = np.full(n, -1, dtype=np.int64)
+        der = np.full(n, -1, dtype=np.int64)
+        niveles = []
+        bajo = np.array([0], dtype=np.int64)
+        alto = np.array([n], dtype=np.int64)
+        while True:
+            vivos = bajo < alto
+            bajo, alto = bajo[vivos], alto[vivos]
+            if not len(bajo):
+                break
+            medio = (bajo + alto) // 2
+            niveles.append(medio)
+            hijo_izq = (bajo + medio) // 2
+            hijo_der = (medio + 1 + alto) // 2
+            izq[medio] = np.where(bajo < medio, hijo_izq, -1)
+            der[medio] = np.where(medio + 1 < alto, hijo_der, -1)
+            bajo, alto = np.concatenate((bajo, medio + 1)), np.concatenate((medio, alto))
+
+        # posiciones -> índices de tablón
+        nodo_izq = np.full(n, -1, dtype=np.int64)
+        nodo_der = np.full(n, -1, dtype=np.int64)
+        nodo_izq[orden] = np.where(izq >= 0, orden[izq], -1)
+        nodo_der[orden] = np.where(der >= 0, orden[der], -1)
+        prio = np.empty(n)
+        if n:
+            prio[orden[np.concatenate(niveles)]] = -np.sort(-rng.random(n))
+
+        ts, tr, p = datos[:, 0], datos[:, 1], datos[:, 2]
+        retraso = np.empty(n, dtype=np.int64)
+        retraso[orden] = np.cumsum(tr[orden]) - ts[orden]
+
+        # agregados de abajo hacia arriba; el índice n hace de hijo vacío
+        sumtr = np.zeros(n + 1, dtype=np.int64)
+        suma_p = np.zeros(n + 1, dtype=np.int64)
+        suma_pd = np.zeros(n + 1, dtype=np.int64)
+        max_neg = np.full(n + 1, _SIN_NEGATIVO, dtype=np.int64)
+        min_pos = np.full(n + 1, _SIN_POSITIVO, dtype=np.int64)
+        hi = np.where(nodo_izq >= 0, nodo_izq, n)
+        hd = np.where(nodo_der >= 0, nodo_der, n)
+        for medio in reversed(niveles):
+            t = orden[medio]
+            a, b = hi[t], hd[t]
+            d = retraso[t]
+            atrasado = d > 0
+            sumtr[t] = tr[t] + sumtr[a] + sumtr[b]
+            suma_p[t] = np.where(atrasado, p[t], 0) + suma_p[a] + suma_p[b]
+            suma_pd[t] = np.where(atrasado, p[t] * d, 0) + suma_pd[a] + suma_pd[b]
+            max_neg[t] = np.maximum(np.where(atrasado, _SIN_NEGATIVO, d), np.maximum(max_neg[a], max_neg[b]))
+            min_pos[t] = np.minimum(np.where(atrasado, d, _SIN_POSITIVO), np.minimum(min_pos[a], min_pos[b]))
+
+        self._raiz = int(orden[niveles[0][0]]) if n else -1
+        self._izq = _arreglo("q", nodo_izq)
+        self._der = _arreglo("q", nodo_der)
+        self._prio = _arreglo("d", prio)
+        self._d = _arreglo("q", retraso)
+        self._pendiente = array("q", bytes(8 * n))
+        self._sumtr = _arreglo("q", sumtr[:n])
+        self._suma_p = _arreglo("q", suma_p[:n])
+        self._suma_pd = _arreglo("q", suma_pd[:n])
+        self._max_neg = _arreglo("q", max_neg[:n])
+        self._min_pos = _arreglo("q", min_pos[:n])
+
+    # ============================
+    # Operaciones del treap
+    # ============================
+    def _clave(self, t):
+        return (self._ts[t], -self._p[t], self._tr[t], t)
+
+    def _actualizar(self, t):
+        """Recalcula los agregados de t a partir de su tablón y sus hijos."""
+        d = self._d[t]
+        if d > 0:
+            suma_p, suma_pd, max_neg, min_pos = self._p[t], self._p[t] * d, _SIN_NEGATIVO, d
+        else:
+            suma_p, suma_pd, max_neg, min_pos = 0, 0, d, _SIN_POSITIVO
+        sumtr = self._tr[t]
+        sumtrs, sumas_p, sumas_pd, max_negs, min_poss = (
+            self._sumtr, self._suma_p, self._suma_pd, self._max_neg, self._min_pos)
+        for h in (self._izq[t], self._der[t]):
+            if h >= 0:
+                sumtr += sumtrs[h]
+                suma_p += sumas_p[h]
+                suma_pd += sumas_pd[h]
+                if max_negs[h] > max_neg:
+                    max_neg = max_negs[h]
+                if min_poss[h] < min_pos:
+                    min_pos = min_poss[h]
+        sumtrs[t] = sumtr
+        sumas_p[t] = suma_p
+        sumas_pd[t] = suma_pd
+        max_negs[t] = max_neg
+        min_poss[t] = min_pos
+
+    def _correr_sin_cruces(self, t, delta):
+        """Corre en delta los retrasos del subárbol t sabiendo que ninguno cruza el 0."""
+        self._d[t] += delta
+        self._pendiente[t] += delta
+        self._suma_pd[t] += delta * self._suma_p[t]
+        if self._max_neg[t] != _SIN_NEGATIVO:
+            self._max_neg[t] += delta
+        if self._min_pos[t] != _SIN_POSITIVO:
+            self._min_pos[t] += delta
+
+    def _bajar(self, t):
+        """Pasa a los hijos el corrimiento pendiente de t."""
+        delta = self._pendiente[t]
+        if delta:
+            self._pendiente[t] = 0
+            for h in (self._izq[t], self._der[t]):
+                if h >= 0:
+                    self._correr_sin_cruces(h, delta)
+
+    def _correr(self, t, delta):
+        """Corre en delta los retrasos de todo el subárbol t."""
+        if t < 0 or not delta:
+            return
+        if delta > 0:
+            cruza = self._max_neg[t] != _SIN_NEGATIVO and self._max_neg[t] + delta > 0
+        else:
+            cruza = self._min_pos[t] != _SIN_POSITIVO and self._min_pos[t] + delta <= 0
+        if not cruza:
+            self._correr_sin_cruces(t, delta)
+            return
+        self._bajar(t)
+        self._d[t] += delta
+        self._correr(self._izq[t], delta)
+        self._correr(self._der[t], delta)
+        self._actualizar(t)
+
+    def _partir(self, t, clave):
+        """Parte el subárbol t en (claves < clave, claves >= clave)."""
+        if t < 0:
+            return -1, -1
+        self._bajar(t)
+        if self._clave(t) < clave:
+            a, b = self._partir(self._der[t], clave)
+            self._der[t] = a
+            self._actualizar(t)
+            return t, b
+        a, b = self._partir(self._izq[t], clave)
+        self._izq[t] = b
+        self._actualizar(t)
+        return a, t
+
+    def _unir(self, a, b):
+        """Une dos subárboles con todas las claves de a menores que las de b."""
+        if a < 0:
+            return b
+        if b < 0:
+            return a
+        if self._prio[a] > self._prio[b]:
+            self._bajar(a)
+            self._der[a] = self._unir(self._der[a], b)
+            self._actualizar(a)
+            return a
+        self._bajar(b)
+        self._izq[b] = self._unir(a, self._izq[b])
+        self._actualizar(b)
+        return b
+
+    def _insertar(self, r, t, antes):
+        """
+        Inserta el tablón t en el subárbol r (antes = suma de tr de los
+        tablones anteriores a r) y devuelve la nueva raíz del subárbol.
+        """
+        tr = self._tr[t]
+        if r < 0 or self._prio[t] > self._prio[r]:
+            a, b = self._partir(r, self._clave(t))
+            self._d[t] = antes + (self._sumtr[a] if a >= 0 else 0) + tr - self._ts[t]
+            self._pendiente[t] = 0
+            self._izq[t], self._der[t] = a, b
+            self._correr(b, tr)
+            self._actualizar(t)
+            return t
+        self._bajar(r)
+        if self._clave(t) < self._clave(r):
+            # r y todo su subárbol derecho terminan tr más tarde
+            self._d[r] += tr
+            self._correr(self._der[r], tr)
+            self._izq[r] = self._insertar(self._izq[r], t, antes)
+        else:
+            h = self._izq[r]
+            self._der[r] = self._insertar(self._der[r], t, antes + (self._sumtr[h] if h >= 0 else 0) + self._tr[r])
+        self._actualizar(r)
+        return r
+
+    def _extraer(self, r, t):
+        """Saca el tablón t del subárbol r y devuelve la nueva raíz del subárbol."""
+        self._bajar(r)
+        tr = self._tr[t]
+        if r == t:
+            self._correr(self._der[t], -tr)
+            return self._unir(self._izq[t], self._der[t])
+        if self._clave(t) < self._clave(r):
+            self._d[r] -= tr
+            self._correr(self._der[r], -tr)
+            self._izq[r] = self._extraer(self._izq[r], t)
+        else:
+            self._der[r] = self._extraer(self._der[r], t)
+        self._actualizar(r)
+        return r
+
+    def _comprobar(self, i):
+        if not (0 <= i < len(self._vivo) and self._vivo[i]):
+            raise ValueError(f"Tablón {i}: no está en la finca.")
+
+    # ============================
+    # Interfaz
+    # ============================
+    def __len__(self):
+        return self._vivos
+
+    def __contains__(self, i):
+        return isinstance(i, int) and 0 <= i < len(self._vivo) and bool(self._vivo[i])
+
+    @property
+    def costo(self) -> int:
+        """Costo total del orden EDD actual."""
+        return self._suma_pd[self._raiz] if self._raiz >= 0 else 0
+
+    def tablon(self, i: int) -> Tuple[int, int, int]:
+        """(ts, tr, p) del tablón i."""
+        self._comprobar(i)
+        return self._ts[i], self._tr[i], self._p[i]
+
+    def agregar(self, ts: int, tr: int, p: int) -> int:
+        """Agrega un tablón y devuelve su índice."""
+        i = len(self._vivo)
+        _validar(i, ts, tr, p)
+        for columna, valor in ((self._ts, ts), (self._tr, tr), (self._p, p), (self._izq, -1), (self._der, -1),
+                               (self._d, 0), (self._pendiente, 0), (self._sumtr, 0), (self._suma_p, 0),
+                               (self._suma_pd, 0), (self._max_neg, 0), (self._min_pos, 0)):
+            columna.append(valor)
+        self._prio.append(self._azar.random())
+        self._vivo.append(1)
+        self._vivos += 1
+        self._raiz = self._insertar(self._raiz, i, 0)
+        return i
+
+    def quitar(self, i: int) -> None:
+        """Quita el tablón i; los demás conservan su índice."""
+        self._comprobar(i)
+        self._raiz = self._extraer(self._raiz, i)
+        self._vivo[i] = 0
+        self._vivos -= 1
+
+    def modificar(self, i: int, ts: int = None, tr: int = None, p: int = None) -> None:
+        """Cambia ts, tr y/o p del tablón i y lo reubica en el orden."""
+        self._comprobar(i)
+        ts = self._ts[i] if ts is None else ts
+        tr = self._tr[i] if tr is None else tr
+        p = self._p[i] if p is None else p
+        _validar(i, ts, tr, p)
+        self._raiz = self._extraer(self._raiz, i)
+        self._ts[i], self._tr[i], self._p[i] = ts, tr, p
+        self._raiz = self._insertar(self._raiz, i, 0)
+
+    def inicio(self, i: int) -> int:
+        """Instante en que empieza el riego del tablón i."""
+        self._comprobar(i)
+        clave = self._clave(i)
+        t, acumulado = self._raiz, 0
+        while t != i:
+            if clave < self._clave(t):
+                t = self._izq[t]
+            else:
+                h = self._izq[t]
+                acumulado += (self._sumtr[h] if h >= 0 else 0) + self._tr[t]
+                t = self._der[t]
+        h = self._izq[i]
+        return acumulado + (self._sumtr[h] if h >= 0 else 0)
+
+    def orden(self) -> List[int]:
+        """Índices de los tablones en el orden de riego (recorrido en orden)."""
+        resultado, pila, t = [], [], self._raiz
+        izq, der = self._izq, self._der
+        while pila or t >= 0:
+            while t >= 0:
+                pila.append(t)
+                t = izq[t]
+            t = pila.pop()
+            resultado.append(t)
+            t = der[t]
+        return resultado
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+instrumentacion.py — Tiempos por fase, contadores y pico de memoria.
+
+Los algoritmos aceptan un parámetro opcional `instrumentos` y reportan en él:
+    with instrumentos.fase("capas"):
+        ...
+    instrumentos.contar("estados_dp", total)
+
+Por defecto reciben NULO, cuyo fase() devuelve siempre el mismo contexto
+vacío y cuyo contar() no hace nada: desactivado, el costo es una llamada por
+fase o por contador (no por iteración). Los contadores se acumulan en
+variables locales y se reportan una vez al final, nunca en el ciclo interno.
+
+Para medir una corrida completa:
+    medicion = instrumentar(roPD_numpy, finca, memoria=True)
+    medicion = ejecutar("finca.txt", roV, "salida.txt")
+devuelven una Medicion con (perm, costo) ya en ese orden, los segundos de
+cada fase (perf_counter), los contadores y el pico de tracemalloc.
+"""
+
+import inspect
+import time
+import tracemalloc
+from typing import Dict, List, NamedTuple, Optional
+
+
+class Medicion(NamedTuple):
+    """Resultado instrumentado de una corrida."""
+    perm: List[int]
+    costo: int
+    fases: Dict[str, float]
+    contadores: Dict[str, int]
+    pico_memoria_bytes: Optional[int]
+
+
+class _FaseNula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_FASE_NULA = _FaseNula()
+
+
+class InstrumentosNulos:
+    """Instrumentos desactivados: no miden ni guardan nada."""
+    __slots__ = ()
+    activo = False
+
+    def fase(self, nombre):
+        return _FASE_NULA
+
+    def contar(self, nombre, cantidad=1):
+        pass
+
+
+NULO = InstrumentosNulos()
+
+
+class _Fase:
+    __slots__ = ("_instrumentos", "_nombre", "_inicio")
+
+    def __init__(self, instrumentos, nombre):
+        self._instrumentos = instrumentos
+        self._nombre = nombre
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        fases = self._instrumentos.fases
+        fases[self._nombre] = fases.get(self._nombre, 0.0) + time.perf_counter() - self._inicio
+        return False
+
+
+class Instrumentos:
+    """
+    Instrumentos activos. Las fases con el mismo nombre se suman; las fases
+    anidadas se miden cada una por su lado (la de afuera incluye a la de
+    adentro).
+    """
+    activo = True
+
+    def __init__(self):
+        self.fases: Dict[str, float] = {}
+        self.contadores: Dict[str, int] = {}
+
+    def fase(self, nombre):
+        return _Fase(self, nombre)
+
+    def contar(self, nombre, cantidad=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+
+def normalizar(resultado):
+    """
+    Devuelve (perm, costo) tanto para los algoritmos que retornan
+    (perm, costo) (roFB, roV, roBB) como para los que retornan
+    (costo, orden) (las variantes de roPD).
+    """
+    a, b = resultado
+    if isinstance(b, (list, tuple)) or hasattr(b, "shape"):
+        return list(b), a
+    return a, b
+
+
+def _acepta_instrumentos(funcion):
+    try:
+        return "instrumentos" in inspect.signature(funcion).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _correr(instrumentos, memoria, cuerpo):
+    if memoria:
+        ya_activo = tracemalloc.is_tracing()
+        if not ya_activo:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    try:
+        perm, costo = cuerpo()
+        pico = tracemalloc.get_traced_memory()[1] if memoria else None
+    finally:
+        if memoria and not ya_activo:
+            tracemalloc.stop()
+    return Medicion(perm, costo, dict(instrumentos.fases), dict(instrumentos.contadores), pico)
+
+
+def instrumentar(funcion, finca, memoria: bool = False, **opciones) -> Medicion:
+    """
+    Corre funcion(finca, **opciones) con instrumentos activos.
+
+    Parámetros:
+      funcion: cualquier algoritmo; si acepta `instrumentos` se los pasa
+      memoria: medir el pico con tracemalloc (vuelve más lenta la corrida)
+
+    Devuelve:
+      Medicion; la fase "resolucion" es el tiempo total de funcion.
+    """
+    instrumentos = Instrumentos()
+    if _acepta_instrumentos(funcion):
+        opciones["instrumentos"] = instrumentos
+
+    def cuerpo():
+        with instrumentos.fase("resolucion"):
+            return normalizar(funcion(finca, **opciones))
+
+    return _correr(instrumentos, memoria, cuerpo)
+
+
+def ejecutar(entrada, funcion, salida=None, memoria: bool = False, **opciones) -> Medicion:
+    """
+    Lectura, resolución, verificación del costo y escritura, cada una como
+    fase: "lectura", "resolucion", "verificacion" y "escritura".
+    El costo se recalcula con costo_lote y debe coincidir con el reportado.
+    """
+    from src.finca import Finca
+    from src.utils import calcular_costo, guardar_salida
+
+    instrumentos = Instrumentos()
+    if _acepta_instrumentos(funcion):
+        opciones["instrumentos"] = instrumentos
+
+    def cuerpo():
+        with instrumentos.fase("lectura"):
+            finca = Finca.leer(entrada)
+        instrumentos.contar("tablones", len(finca))
+        with instrumentos.fase("resolucion"):
+            perm, costo = normalizar(funcion(finca, **opciones))
+        with instrumentos.fase("verificacion"):
+            recalculado = calcular_costo(finca, perm)
+        if recalculado != costo:
+            raise ValueError(f"Costo reportado {costo} distinto del recalculado {recalculado}.")
+        if salida is not None:
+            with instrumentos.fase("escritura"):
+                guardar_salida(salida, costo, perm)
+        return perm, costo
+
+    return _correr(instrumentos, memoria, cuerpo)
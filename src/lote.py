@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+lote.py — Resolver muchas fincas en una sola ejecución.
+
+Toma un directorio (todos sus .txt y .bin) o un patrón glob, resuelve cada
+finca con el algoritmo elegido en un pool de procesos y escribe:
+  - la salida de cada finca junto a su entrada: <nombre>.salida.txt
+    (o .salida.bin con --binaria), con el formato de siempre;
+  - un resumen CSV con archivo, n, algoritmo, costo, tiempo y error.
+
+Así el arranque del intérprete y las importaciones se pagan una vez por
+proceso trabajador y no una vez por finca. Los archivos se reparten en
+trozos (chunksize) para no pagar un viaje al pool por cada finca chica.
+
+Uso desde consola (ejemplos):
+    python src/lote.py data/
+    python src/lote.py "fincas/*.txt" --algoritmo auto --procesos 4
+    python src/lote.py fincas/ --resumen resumen.csv --binaria
+    python src/lote.py fincas/ --algoritmo pd --cache cache_riego/
+  Con --cache las fincas ya resueltas (aunque tengan los tablones en otro
+  orden) se toman de la caché en disco, compartida por los trabajadores.
+"""
+
+import argparse
+import csv
+import glob
+import multiprocessing as mp
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.busqueda_local import roV_local
+from src.cache import CacheResultados
+from src.dinamica import roPD_ideales, roPD_numpy
+from src.finca import Finca
+from src.fuerza_bruta import roFB
+from src.ramificacion_poda import roBB
+from src.resolver import resolver
+from src.utils import guardar_salida
+from src.voraz import roV
+
+
+def _pd(finca):
+    costo, orden = roPD_numpy(finca)
+    return orden, costo
+
+
+def _ideales(finca):
+    costo, orden = roPD_ideales(finca)
+    return orden, costo
+
+
+def _auto(finca):
+    resultado = resolver(finca)
+    return resultado.perm, resultado.costo
+
+
+# nombre -> función que devuelve (perm, costo)
+ALGORITMOS = {
+    "voraz": roV,
+    "local": roV_local,
+    "fb": roFB,
+    "pd": _pd,
+    "bb": roBB,
+    "ideales": _ideales,
+    "auto": _auto,
+}
+
+# Sufijo de las salidas; los archivos que lo tienen no se toman como entradas
+SUFIJO_SALIDA = ".salida"
+
+CAMPOS_RESUMEN = ["archivo", "n", "algoritmo", "costo", "tiempo_segundos", "salida", "error"]
+
+
+def buscar_entradas(patron):
+    """
+    Lista ordenada de fincas a resolver: si patron es un directorio, sus
+    archivos .txt y .bin; si no, los archivos que coinciden con el glob.
+    Se descartan las salidas de corridas anteriores.
+    """
+    if os.path.isdir(patron):
+        candidatos = [os.path.join(patron, nombre) for nombre in os.listdir(patron)
+                      if nombre.endswith((".txt", ".bin"))]
+    else:
+        candidatos = glob.glob(patron)
+    return sorted(
+        ruta for ruta in candidatos
+        if os.path.isfile(ruta) and SUFIJO_SALIDA not in os.path.basename(ruta)
+    )
+
+
+def ruta_salida(entrada, binaria=False):
+    """<dir>/<nombre>.salida.txt (o .bin) junto a la entrada."""
+    base, _ = os.path.splitext(entrada)
+    return base + SUFIJO_SALIDA + (".bin" if binaria else ".txt")
+
+
+# directorio -> CacheResultados, una por proceso trabajador
+_CACHES = {}
+
+
+def _resolver(finca, algoritmo, cache):
+    if cache is None:
+        return ALGORITMOS[algoritmo](finca)
+    if cache not in _CACHES:
+        _CACHES[cache] = CacheResultados(cache)
+    costo, orden = _CACHES[cache].resolver(finca, algoritmo, ALGORITMOS[algoritmo])
+    return orden, costo
+
+
+def _resolver_archivo(tarea):
+    """
+    Resuelve una finca (lo que corre cada trabajador). Un error en un
+    archivo queda en su fila del resumen y no detiene el lote.
+    """
+    entrada, algoritmo, binaria, cache = tarea
+    fila = {"archivo": entrada, "n": "", "algoritmo": algoritmo, "costo": "",
+            "tiempo_segundos": "", "salida": "", "error": ""}
+    try:
+        finca = Finca.leer(entrada)
+        fila["n"] = len(finca)
+        inicio = time.perf_counter()
+        perm, costo = _resolver(finca, algoritmo, cache)
+        fila["tiempo_segundos"] = f"{time.perf_counter() - inicio:.6f}"
+        fila["costo"] = costo
+        salida = ruta_salida(entrada, binaria)
+        guardar_salida(salida, costo, perm, binaria=binaria)
+        fila["salida"] = salida
+    except Exception as e:
+        fila["error"] = str(e)
+    return fila
+
+
+def resolver_lote(entradas, algoritmo="voraz", procesos=None, binaria=False, chunksize=None, cache=None):
+    """
+    Resuelve todas las fincas de entradas (lista de rutas).
+
+    Parámetros:
+      entradas: rutas de las fincas (texto o binario)
+      algoritmo: clave de ALGORITMOS
+      procesos: trabajadores del pool (por defecto os.cpu_count(); 1 = sin pool)
+      binaria: escribir las salidas en formato binario
+      chunksize: archivos por envío al pool (por defecto ~4 trozos por proceso)
+      cache: directorio de una CacheResultados (None = resolver siempre)
+
+    Devuelve:
+      lista de filas del resumen (diccionarios con CAMPOS_RESUMEN), en el
+      orden de entradas.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo}. Opciones: {', '.join(ALGORITMOS)}")
+    tareas = [(entrada, algoritmo, binaria, cache) for entrada in entradas]
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(tareas)))
+    if procesos == 1:
+        return [_resolver_archivo(tarea) for tarea in tareas]
+
+    chunksize = chunksize or max(1, len(tareas) // (4 * procesos))
+    with mp.Pool(procesos) as pool:
+        return pool.map(_resolver_archivo, tareas, chunksize=chunksize)
+
+
+def escribir_resumen(ruta, filas) -> None:
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS_RESUMEN)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+# ============================
+# CLI (para correr desde terminal)
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve un lote de fincas en paralelo.")
+    parser.add_argument("entradas", help="directorio o patrón glob de fincas")
+    parser.add_argument("--algoritmo", default="voraz", choices=sorted(ALGORITMOS))
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--resumen", default=None,
+                        help="CSV de resumen (por defecto resumen.csv en el directorio de entrada)")
+    parser.add_argument("--binaria", action="store_true", help="salidas en formato binario")
+    parser.add_argument("--cache", default=None, help="directorio de la caché de resultados")
+    args = parser.parse_args(argv)
+
+    entradas = buscar_entradas(args.entradas)
+    if not entradas:
+        print(f"Error: no hay fincas en {args.entradas}", file=sys.stderr)
+        sys.exit(1)
+    resumen = args.resumen
+    if resumen is None:
+        carpeta = args.entradas if os.path.isdir(args.entradas) else os.path.dirname(entradas[0])
+        resumen = os.path.join(carpeta, "resumen.csv")
+
+    inicio = time.perf_counter()
+    filas = resolver_lote(entradas, args.algoritmo, args.procesos, args.binaria, cache=args.cache)
+    escribir_resumen(resumen, filas)
+    errores = sum(1 for fila in filas if fila["error"])
+    print(f"{len(filas)} fincas en {time.perf_counter() - inicio:.2f} s, {errores} con error. Resumen: {resumen}")
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,39 @@
+import argparse
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.utils import leer_finca, guardar_salida, medir_tiempo
-from src.fuerza_bruta import roFB
-from src.voraz import roV 
-from src.dinamica import roPD
-
-def main():
-    finca = leer_finca("data/ejemplo1.txt")
-    
-    print("calculando soluciones...\n")
-    
-    perm_fb, costo_fb, tiempo_fb = medir_tiempo(roFB, finca)
-    perm_v, costo_v, tiempo_v = medir_tiempo(roV, finca)
-    costo_pd, perm_pd, tiempo_pd = medir_tiempo(roPD, finca)
-    
-    print("RESULTADOS")
-    print(f"fuera bruta: costo={costo_fb}, permutacion={perm_fb}, tiempo={tiempo_fb:.6f} seg")
-    print(f"Voraz: costo={costo_v}, permutacion={perm_v}, tiempo={tiempo_v:.6f} seg")
-    print(f"Dinamica: costo={costo_pd}, permutacion={perm_pd}, tiempo={tiempo_pd:.6f} seg")
-    
-    guardar_salida("data/salida_fb.txt", costo_fb, perm_fb)
-    guardar_salida("data/salida_v.txt", costo_v, perm_v)
-    guardar_salida("data/salida_pd.txt", costo_pd, perm_pd)
+from src.finca import Finca
+from src.utils import guardar_salida
+from src.resolver import Presupuesto, resolver
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Riego óptimo: elige el algoritmo según n y el presupuesto.")
+    parser.add_argument("entrada", nargs="?", default="data/ejemplo1.txt", help="finca (texto o binaria)")
+    parser.add_argument("--salida", default="data/salida.txt")
+    parser.add_argument("--segundos", type=float, default=None, help="presupuesto de tiempo")
+    parser.add_argument("--memoria-mb", type=float, default=None, help="presupuesto de memoria para la DP")
+    parser.add_argument("--binaria", action="store_true", help="salida en formato binario")
+    args = parser.parse_args(argv)
+
+    finca = Finca.leer(args.entrada)
+    memoria = None if args.memoria_mb is None else int(args.memoria_mb * 2**20)
+
+    print("calculando solucion...\n")
+
+    inicio = time.perf_counter()
+    resultado = resolver(finca, Presupuesto(args.segundos, memoria))
+    tiempo = time.perf_counter() - inicio
+
+    print("RESULTADO")
+    print(f"motor: {resultado.motor} ({'optimo' if resultado.optimo else 'aproximado'})")
+    print(f"costo={resultado.costo}, n={len(finca)}, tiempo={tiempo:.6f} seg")
+    if len(finca) <= 20:
+        print(f"permutacion={resultado.perm}")
+
+    guardar_salida(args.salida, resultado.costo, resultado.perm, binaria=args.binaria)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+plazo.py — Resolver dentro de un plazo fijo (modo anytime).
+
+    r = resolver_con_plazo(finca, segundos=2.0, progreso=print, cancelar=evento.is_set)
+    r.perm, r.costo, r.optimo
+
+Siempre hay un orden válido guardado, y se reemplaza solo por uno de menor
+costo. Las etapas son:
+  1) voraz: roV con la regla EDD, que es O(n log n) y corre entera aunque
+     el plazo sea más corto (es el orden válido mínimo), y después las
+     demás reglas de REGLAS. Una regla no se interrumpe, así que solo se
+     empieza si n * SEGUNDOS_POR_TABLON_REGLA entra en el tiempo restante.
+  2) local: mejorar_local sobre el mejor orden, hasta converger, hasta el
+     plazo o hasta que se cancele.
+  3) exacta, si n lo permite:
+       n <= LIMITE_FB:           roFB (instantánea);
+       DP estimada en la mitad
+       del tiempo restante:      roPD_numpy (no se interrumpe, por eso el
+                                 margen; ver resolver.estimar_pd);
+       n <= LIMITE_BB:           roBB partiendo del mejor orden, cortada
+                                 por el plazo o la cancelación.
+     Si la etapa exacta termina, el óptimo queda probado.
+
+progreso(Progreso(etapa, costo, segundos)) se llama con cada orden nuevo
+(incluido el de roV). cancelar() se consulta en los mismos puntos que el
+plazo (cada 1024 posiciones de la búsqueda local y cada 1024 nodos de roBB);
+threading.Event().is_set sirve tal cual.
+
+Uso desde consola (ejemplo):
+    python src/plazo.py entrada.txt salida.txt --segundos 2
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.busqueda_local import mejorar_local
+from src.dinamica import roPD_numpy
+from src.finca import Finca
+from src.fuerza_bruta import roFB
+from src.ramificacion_poda import roBB
+from src.resolver import LIMITE_FB, MEMORIA_POR_DEFECTO, estimar_pd
+from src.utils import guardar_salida
+from src.voraz import REGLAS, roV
+
+# Hasta este n se intenta roBB con el tiempo que quede
+LIMITE_BB = 100
+# La DP solo se corre si su estimación entra en esta fracción del tiempo restante
+MARGEN_PD = 0.5
+# Tiempo por tablón de la regla más lenta (mdd, con heaps: ~9.4 s con 1 M)
+SEGUNDOS_POR_TABLON_REGLA = 1.2e-5
+
+
+class Progreso(NamedTuple):
+    """Un orden nuevo: etapa que lo encontró, su costo y segundos desde el inicio."""
+    etapa: str
+    costo: int
+    segundos: float
+
+
+class ResultadoPlazo(NamedTuple):
+    """
+    Informe final de resolver_con_plazo.
+      etapa: la que encontró el orden devuelto ("voraz", "local", "fb", "pd", "bb")
+      optimo: True si se probó que el costo es el mínimo
+      detenido: None, "plazo" o "cancelado"
+      historial: los Progreso de cada orden nuevo
+    """
+    perm: List[int]
+    costo: int
+    etapa: str
+    optimo: bool
+    detenido: Optional[str]
+    segundos: float
+    historial: List[Progreso]
+
+
+class _Reloj:
+    """Plazo y cancelación en una sola función detener(); recuerda el motivo."""
+
+    def __init__(self, segundos, cancelar):
+        self.inicio = time.perf_counter()
+        self.fin = self.inicio + segundos
+        self.cancelar = cancelar
+        self.motivo = None
+
+    def __call__(self):
+        if self.motivo is None:
+            if self.cancelar is not None and self.cancelar():
+                self.motivo = "cancelado"
+            elif time.perf_counter() >= self.fin:
+                self.motivo = "plazo"
+        return self.motivo is not None
+
+    def transcurrido(self):
+        return time.perf_counter() - self.inicio
+
+    def restante(self):
+        return self.fin - time.perf_counter()
+
+
+def resolver_con_plazo(finca, segundos: float, progreso: Optional[Callable] = None,
+                       cancelar: Optional[Callable] = None, memoria: Optional[int] = None) -> ResultadoPlazo:
+    """
+    Mejor orden que se pueda encontrar en `segundos` (ver cabecera del módulo).
+
+    Parámetros:
+      finca: lista de tuplas (ts, tr, p) o Finca
+      segundos: plazo de reloj
+      progreso: función opcional que recibe un Progreso por cada orden nuevo
+      cancelar: función opcional sin argumentos; True = terminar ya
+      memoria: bytes máximos para la DP (por defecto resolver.MEMORIA_POR_DEFECTO)
+
+    Devuelve:
+      ResultadoPlazo
+    """
+    reloj = _Reloj(segundos, cancelar)
+    n = len(finca)
+    historial = []
+    mejor = {}
+
+    def registrar(etapa, perm, costo):
+        if mejor and costo >= mejor["costo"]:
+            return
+        mejor.update(perm=list(perm), costo=costo, etapa=etapa)
+        historial.append(Progreso(etapa, costo, reloj.transcurrido()))
+        if progreso is not None:
+            progreso(historial[-1])
+
+    def informe(optimo):
+        return ResultadoPlazo(mejor["perm"], mejor["costo"], mejor["etapa"], optimo,
+                              None if optimo else reloj.motivo, reloj.transcurrido(), historial)
+
+    for k, regla in enumerate(REGLAS):
+        if k and n * SEGUNDOS_POR_TABLON_REGLA > reloj.restante():
+            continue
+        registrar("voraz", *roV(finca, regla))
+        if mejor["costo"] == 0:
+            return informe(True)
+        if reloj():
+            return informe(False)
+
+    registrar("local", *mejorar_local(finca, mejor["perm"], detener=reloj))
+    if reloj():
+        return informe(False)
+
+    if n <= LIMITE_FB:
+        registrar("fb", *roFB(finca))
+        return informe(True)
+    segundos_pd, bytes_pd = estimar_pd(n)
+    if bytes_pd <= (MEMORIA_POR_DEFECTO if memoria is None else memoria) and \
+            segundos_pd <= MARGEN_PD * reloj.restante():
+        costo, perm = roPD_numpy(finca)
+        registrar("pd", perm, costo)
+        return informe(True)
+    if n <= LIMITE_BB:
+        estadisticas = {}
+        perm, costo = roBB(finca, estadisticas, incumbente=(mejor["perm"], mejor["costo"]), detener=reloj,
+                           al_mejorar=lambda perm, costo: registrar("bb", perm, costo))
+        registrar("bb", perm, costo)
+        return informe(estadisticas["completa"])
+    return informe(False)
+
+
+# ============================
+# CLI (para correr desde terminal)
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mejor orden de riego dentro de un plazo.")
+    parser.add_argument("entrada", help="finca (texto o binaria)")
+    parser.add_argument("salida")
+    parser.add_argument("--segundos", type=float, required=True, help="plazo de reloj")
+    parser.add_argument("--binaria", action="store_true", help="salida en formato binario")
+    args = parser.parse_args(argv)
+
+    try:
+        finca = Finca.leer(args.entrada)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    def mostrar(p):
+        print(f"[{p.segundos:8.3f} s] {p.etapa:>5}: costo={p.costo}", flush=True)
+
+    r = resolver_con_plazo(finca, args.segundos, progreso=mostrar)
+    guardar_salida(args.salida, r.costo, r.perm, binaria=args.binaria)
+    estado = "óptimo probado" if r.optimo else f"sin prueba de optimalidad ({r.detenido or 'n grande'})"
+    print(f"costo={r.costo} ({r.etapa}), {estado}, {r.segundos:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
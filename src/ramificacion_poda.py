@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+ramificacion_poda.py — Ramificación y poda (branch-and-bound) exacta.
+
+Búsqueda en profundidad sobre secuencias parciales (prefijos del orden de
+riego). Cada nodo es un prefijo; sus hijos agregan un tablón más al final.
+
+Podas:
+  - Incumbente inicial: el orden de roV (voraz), así desde el primer nodo
+    ya hay una cota superior razonable.
+  - Cota inferior de los tablones que faltan (ver _cota_inferior): el
+    máximo entre una cota de retraso individual y la de Smith (WSPT).
+  - Dominancia por pares (Emmons / Rinnooy Kan para tardanza ponderada):
+      si tr_i <= tr_j, p_i >= p_j y ts_i <= ts_j, existe un óptimo con i
+      antes de j, y alcanza con ts_i <= tr_j + sum(tr de los que ya se sabe
+      que van antes de j). Además, un tablón con ts_j >= sum(tr) nunca se
+      retrasa y puede ir al final.
+  - Intercambio adyacente: si al cambiar de lugar los dos últimos tablones
+    del prefijo el costo baja estrictamente, el prefijo no es óptimo.
+  - Memoria por conjunto: dos prefijos con el mismo conjunto de tablones
+    terminan en el mismo instante; solo vale la pena seguir el más barato.
+
+Complejidad: exponencial en el peor caso, pero las podas permiten probar
+optimalidad en fincas bastante más grandes que roFB (n!) y roPD (2^n).
+"""
+
+import time
+from typing import List, Tuple
+
+from src.finca import columnas
+from src.instrumentacion import NULO
+from src.voraz import roV
+
+# Cantidad máxima de conjuntos guardados en la memoria de la búsqueda
+LIMITE_MEMORIA = 2_000_000
+# Cada cuántos nodos se consulta detener()
+_NODOS_POR_CONSULTA = 1024
+
+
+class _Detenida(Exception):
+    """Corta la búsqueda desde cualquier profundidad cuando detener() lo pide."""
+
+
+def precedencias(finca: List[Tuple[int, int, int]]) -> List[int]:
+    """
+    Deriva relaciones de precedencia entre tablones que se cumplen en al
+    menos un orden óptimo.
+
+    Retorna una lista pred donde pred[j] es una máscara de bits con los
+    tablones que deben regarse antes de j.
+
+    Reglas:
+      1) i antes de j si tr_i <= tr_j, p_i >= p_j y ts_i <= ts_j
+         (si son idénticos, decide el índice).
+      2) Si ts_j >= sum(tr), j nunca sufre retraso: va después de todos los
+         tablones que sí pueden retrasarse, y entre ellos se ordenan por
+         (ts, -p, tr, índice), orden compatible con la regla 1.
+      3) Emmons: j no puede terminar antes de E_j = tr_j + sum(tr de sus
+         predecesores), así que i va antes de j si tr_i <= tr_j, p_i >= p_j
+         y ts_i <= E_j (al intercambiarlos, i deja de retrasarse al menos lo
+         que se retrasa j de más). Cada relación nueva agranda algún E_j,
+         por eso se repite hasta que no aparecen más.
+
+    Las máscaras quedan cerradas por transitividad (si i va antes de j y
+    j antes de k, pred[k] también tiene a i), sin ciclos.
+    """
+    n = len(finca)
+    ts, tr, p = columnas(finca)
+    pred = [0] * n
+    total_tr = sum(tr)
+    nunca_tarde = [ts_i >= total_tr for ts_i in ts]
+    clave = [(ts[i], -p[i], tr[i], i) for i in range(n)]
+
+    for j in range(n):
+        ts_j, tr_j, p_j = ts[j], tr[j], p[j]
+        for i in range(n):
+            if i == j:
+                continue
+            ts_i, tr_i, p_i = ts[i], tr[i], p[i]
+            if nunca_tarde[j]:
+                antes = not nunca_tarde[i] or clave[i] < clave[j]
+            elif tr_i <= tr_j and p_i >= p_j and ts_i <= ts_j:
+                antes = (tr_i, -p_i, ts_i) != (tr_j, -p_j, ts_j) or i < j
+            else:
+                antes = False
+            if antes:
+                pred[j] |= 1 << i
+
+    cambio = True
+    while cambio:
+        cambio = False
+        for j in range(n):
+            ts_j, tr_j, p_j = ts[j], tr[j], p[j]
+            fin_minimo = tr_j + _suma_tr(pred[j], tr)
+            for i in range(n):
+                if i == j or pred[j] >> i & 1 or pred[i] >> j & 1:
+                    continue
+                if tr[i] <= tr_j and p[i] >= p_j and ts[i] <= fin_minimo:
+                    _agregar_precedencia(pred, i, j)
+                    fin_minimo = tr_j + _suma_tr(pred[j], tr)
+                    cambio = True
+    return pred
+
+
+def _suma_tr(mask, tr):
+    """Suma de tr de los tablones de mask."""
+    suma = 0
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        suma += tr[bit.bit_length() - 1]
+    return suma
+
+
+def _agregar_precedencia(pred, i, j):
+    """
+    Agrega i antes de j manteniendo el cierre transitivo: i y sus
+    predecesores pasan a preceder a j y a todos los sucesores de j.
+    """
+    nuevos = pred[i] | (1 << i)
+    bit_j = 1 << j
+    for k in range(len(pred)):
+        if k == j or pred[k] & bit_j:
+            pred[k] |= nuevos
+
+
+def _cota_inferior(faltan, faltan_wspt, t, ts, tr, p):
+    """
+    Cota inferior del costo de los tablones que faltan si se empieza a
+    regar en el instante t. Es el máximo de dos cotas:
+      1) cada tablón j termina como mínimo en t + tr_j, y alguno de ellos
+         termina exactamente en T = t + sum(tr de los que faltan), así que
+         se suma el menor recargo de ponerlo al final;
+      2) p_j * max(0, C_j - ts_j) >= p_j * (C_j - ts_j), y la suma de
+         p_j * C_j es mínima regando en orden WSPT (tr/p ascendente, regla
+         de Smith), que llega ya ordenado en faltan_wspt.
+    La cota 1 es buena cuando hay poco retraso y la 2 cuando casi todos
+    los tablones quedan retrasados.
+    """
+    fin_total = t
+    for j in faltan:
+        fin_total += tr[j]
+
+    suma = 0
+    recargo = None
+    for j in faltan:
+        temprano = t + tr[j] - ts[j]
+        temprano = p[j] * temprano if temprano > 0 else 0
+        tarde = fin_total - ts[j]
+        tarde = p[j] * tarde if tarde > 0 else 0
+        suma += temprano
+        extra = tarde - temprano
+        if recargo is None or extra < recargo:
+            recargo = extra
+    cota_retraso = suma + (recargo or 0)
+
+    cota_wspt = 0
+    fin = t
+    for j in faltan_wspt:
+        fin += tr[j]
+        cota_wspt += p[j] * (fin - ts[j])
+
+    return cota_retraso if cota_retraso > cota_wspt else cota_wspt
+
+
+def roBB(finca: List[Tuple[int, int, int]], estadisticas=None, instrumentos=NULO,
+         incumbente=None, detener=None, al_mejorar=None):
+    """
+    Solución exacta por ramificación y poda.
+
+    Parámetros:
+      finca: lista de n tuplas (ts_i, tr_i, p_i) o Finca
+      estadisticas: diccionario opcional donde se reportan
+        nodos, podas_cota, podas_dominancia, podas_memoria,
+        costo_inicial (el del incumbente inicial), tiempo_segundos y
+        completa (False si detener cortó la búsqueda).
+      instrumentos: ver src/instrumentacion.py (fases "incumbente" y
+        "busqueda", mismos contadores que estadisticas)
+      incumbente: (perm, costo) inicial; por defecto el de roV
+      detener: función opcional sin argumentos, consultada cada
+        _NODOS_POR_CONSULTA nodos; si devuelve True la búsqueda termina
+        con el mejor orden encontrado, que ya no es óptimo probado
+      al_mejorar: función opcional (perm, costo) llamada con cada
+        incumbente nuevo
+
+    Devuelve:
+      (pi, costo) igual que roFB y roV.
+    """
+    inicio = time.perf_counter()
+    n = len(finca)
+    ts, tr, p = columnas(finca)
+    pred = precedencias(finca)
+
+    if incumbente is None:
+        with instrumentos.fase("incumbente"):
+            incumbente = roV(finca)
+    mejor_perm, mejor_costo = list(incumbente[0]), incumbente[1]
+    costo_inicial = mejor_costo
+    # los hijos se generan en orden EDD para encontrar buenos órdenes pronto
+    orden_rama = sorted(range(n), key=lambda i: (ts[i], -p[i], tr[i]))
+    # orden WSPT para la cota de Smith (ver _cota_inferior)
+    orden_wspt = sorted(range(n), key=lambda i: tr[i] / p[i])
+    memoria = {}
+    contadores = {"nodos": 0, "podas_cota": 0, "podas_dominancia": 0, "podas_memoria": 0}
+    prefijo = []
+
+    def costo_tablon(j, fin):
+        retraso = fin - ts[j]
+        return p[j] * retraso if retraso > 0 else 0
+
+    def buscar(mask, t, costo, ultimo):
+        nonlocal mejor_perm, mejor_costo
+        contadores["nodos"] += 1
+        if detener is not None and not contadores["nodos"] % _NODOS_POR_CONSULTA and detener():
+            raise _Detenida
+        if len(prefijo) == n:
+            if costo < mejor_costo:
+                mejor_costo = costo
+                mejor_perm = list(prefijo)
+                if al_mejorar is not None:
+                    al_mejorar(mejor_perm, mejor_costo)
+            return
+
+        resto = [j for j in orden_rama if not mask >> j & 1]
+        for j in resto:
+            if pred[j] & ~mask:
+                continue
+            fin = t + tr[j]
+            nuevo = costo + costo_tablon(j, fin)
+
+            if ultimo >= 0:
+                s = t - tr[ultimo]
+                actual = costo_tablon(ultimo, t) + costo_tablon(j, fin)
+                cambiado = costo_tablon(j, s + tr[j]) + costo_tablon(ultimo, fin)
+                if cambiado < actual:
+                    contadores["podas_dominancia"] += 1
+                    continue
+
+            hijo = mask | (1 << j)
+            previo = memoria.get(hijo)
+            if previo is not None and previo <= nuevo:
+                contadores["podas_memoria"] += 1
+                continue
+            if previo is not None or len(memoria) < LIMITE_MEMORIA:
+                memoria[hijo] = nuevo
+
+            faltan = [k for k in resto if k != j]
+            faltan_wspt = [k for k in orden_wspt if not hijo >> k & 1]
+            if nuevo + _cota_inferior(faltan, faltan_wspt, fin, ts, tr, p) >= mejor_costo:
+                contadores["podas_cota"] += 1
+                continue
+
+            prefijo.append(j)
+            buscar(hijo, fin, nuevo, j)
+            prefijo.pop()
+
+    completa = True
+    with instrumentos.fase("busqueda"):
+        try:
+            buscar(0, 0, 0, -1)
+        except _Detenida:
+            completa = False
+    for nombre, cantidad in contadores.items():
+        instrumentos.contar(nombre, cantidad)
+
+    if estadisticas is not None:
+        estadisticas.update(contadores)
+        estadisticas["costo_inicial"] = costo_inicial
+        estadisticas["tiempo_segundos"] = time.perf_counter() - inicio
+        estadisticas["completa"] = completa
+    return mejor_perm, mejor_costo
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+resolver.py — Punto de entrada único que elige el algoritmo según n.
+
+    resolver(finca, presupuesto=Presupuesto(segundos=2.0))
+
+  - n <= LIMITE_FB:          fuerza bruta (roFB), exacta.
+  - DP cabe en presupuesto:  programación dinámica por capas (roPD_numpy),
+                             exacta. El tiempo y la memoria se estiman como
+                             SEGUNDOS_POR_ESTADO * n * 2^n y
+                             BYTES_POR_SUBCONJUNTO * 2^n (ver el informe, 6.3).
+  - resto:                   heurística: la mejor regla de despacho de roV y
+                             luego búsqueda local (mejorar_local) con el
+                             tiempo que quede.
+
+Sin presupuesto de tiempo la DP se usa hasta n = LIMITE_PD_SIN_PRESUPUESTO
+(menos de 1 s) y la búsqueda local corre con sus límites por defecto.
+
+Si los costos de la finca pueden pasar de int64 (ts y tr no tienen tope),
+la DP es roPD_compacto con enteros de Python: se estima con
+SEGUNDOS_POR_ESTADO_EXACTA y BYTES_POR_SUBCONJUNTO_EXACTA, y sin
+presupuesto se usa hasta n = LIMITE_PD_EXACTA_SIN_PRESUPUESTO.
+"""
+
+import math
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from src.busqueda_local import mejorar_local
+from src.dinamica import roPD_compacto, roPD_numpy
+from src.finca import columnas_np
+from src.fuerza_bruta import roFB
+from src.utils import _cabe_en_int64
+from src.voraz import roV
+
+# Hasta este n la fuerza bruta es instantánea (8! = 40 320 órdenes)
+LIMITE_FB = 8
+# n máximo de la DP cuando no se da presupuesto de tiempo
+LIMITE_PD_SIN_PRESUPUESTO = 20
+# Constantes de la estimación de roPD_numpy (medidas en n = 16..24)
+SEGUNDOS_POR_ESTADO = 3.5e-8
+BYTES_POR_SUBCONJUNTO = 24
+# Lo mismo para roPD_compacto con enteros de Python (medidas en n = 14..16)
+SEGUNDOS_POR_ESTADO_EXACTA = 1.5e-7
+BYTES_POR_SUBCONJUNTO_EXACTA = 90
+LIMITE_PD_EXACTA_SIN_PRESUPUESTO = 18
+# Memoria máxima para la DP si el presupuesto no dice otra cosa
+MEMORIA_POR_DEFECTO = 1 << 30
+# Sin presupuesto de tiempo, la búsqueda local solo se hace hasta este n
+LIMITE_LOCAL_SIN_PRESUPUESTO = 100_000
+
+
+class Presupuesto(NamedTuple):
+    """Límites opcionales: segundos de reloj y bytes de memoria."""
+    segundos: Optional[float] = None
+    memoria: Optional[int] = None
+
+
+class Resolucion(NamedTuple):
+    """Resultado de resolver: orden, costo, motor usado y si es óptimo probado."""
+    perm: List[int]
+    costo: int
+    motor: str
+    optimo: bool
+
+
+def estimar_pd(n: int, exacta: bool = False) -> Tuple[float, int]:
+    """
+    (segundos, bytes) estimados de roPD_numpy para n tablones, o de
+    roPD_compacto con enteros de Python si exacta es True.
+    """
+    por_estado, por_subconjunto = SEGUNDOS_POR_ESTADO, BYTES_POR_SUBCONJUNTO
+    if exacta:
+        por_estado, por_subconjunto = SEGUNDOS_POR_ESTADO_EXACTA, BYTES_POR_SUBCONJUNTO_EXACTA
+    # desde n ~ 1000, n * 2^n ya no entra en un float
+    segundos = por_estado * n * 2 ** n if n < 1000 else math.inf
+    return segundos, por_subconjunto * 2 ** n
+
+
+def elegir_motor(n: int, presupuesto: Optional[Presupuesto] = None, cabe_en_int64: bool = True) -> str:
+    """
+    Motor que usaría resolver para n tablones: "fb", "pd" o "heuristica".
+    Con cabe_en_int64=False la DP se estima como la de enteros de Python.
+    """
+    presupuesto = presupuesto or Presupuesto()
+    if n <= LIMITE_FB:
+        return "fb"
+    segundos, memoria = estimar_pd(n, exacta=not cabe_en_int64)
+    limite_memoria = presupuesto.memoria if presupuesto.memoria is not None else MEMORIA_POR_DEFECTO
+    limite_n = LIMITE_PD_SIN_PRESUPUESTO if cabe_en_int64 else LIMITE_PD_EXACTA_SIN_PRESUPUESTO
+    if memoria <= limite_memoria:
+        if presupuesto.segundos is None:
+            if n <= limite_n:
+                return "pd"
+        elif segundos <= presupuesto.segundos:
+            return "pd"
+    return "heuristica"
+
+
+def resolver(finca: List[Tuple[int, int, int]], presupuesto: Optional[Presupuesto] = None) -> Resolucion:
+    """
+    Resuelve la finca con el motor adecuado a su tamaño y al presupuesto.
+
+    Parámetros:
+      finca: lista de tuplas (ts, tr, p) o Finca
+      presupuesto: Presupuesto(segundos, memoria) opcional
+
+    Devuelve:
+      Resolucion(perm, costo, motor, optimo). optimo es True cuando el motor
+      es exacto (fb, pd) o cuando el costo es 0.
+    """
+    inicio = time.perf_counter()
+    presupuesto = presupuesto or Presupuesto()
+    n = len(finca)
+    cabe = _cabe_en_int64(*columnas_np(finca))
+    motor = elegir_motor(n, presupuesto, cabe)
+
+    if motor == "fb":
+        perm, costo = roFB(finca)
+        return Resolucion(perm, costo, motor, True)
+    if motor == "pd":
+        costo, perm = roPD_numpy(finca) if cabe else roPD_compacto(finca)
+        return Resolucion(perm, costo, motor, True)
+
+    perm, costo = roV(finca, "mejor")
+    if costo == 0:
+        return Resolucion(perm, costo, "voraz", True)
+    if presupuesto.segundos is not None:
+        restante = presupuesto.segundos - (time.perf_counter() - inicio)
+        if restante <= 0:
+            return Resolucion(perm, costo, "voraz", False)
+        perm, costo = mejorar_local(finca, perm, limite_segundos=restante)
+    elif n <= LIMITE_LOCAL_SIN_PRESUPUESTO:
+        perm, costo = mejorar_local(finca, perm)
+    else:
+        return Resolucion(perm, costo, "voraz", False)
+    return Resolucion(perm, costo, "voraz+local", costo == 0)
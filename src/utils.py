@@ -1,4 +1,130 @@
+import mmap
+import os
+import re
 import time
+
+import numpy as np
+
+from src.finca import columnas_np
+
+# Clases de bytes para leer_finca_np: espacio (sin el salto de linea), digito, signo
+_ESPACIO = np.zeros(256, dtype=bool)
+_ESPACIO[[9, 11, 12, 13, 32]] = True
+_DIGITO = np.zeros(256, dtype=bool)
+_DIGITO[48:58] = True
+_SIGNO = np.zeros(256, dtype=bool)
+_SIGNO[[43, 45]] = True
+_SALTO, _COMA = 10, 44
+# Bytes del formato sin adornos: digitos, comas y saltos de linea
+_LIMPIO = _DIGITO.copy()
+_LIMPIO[[_SALTO, _COMA]] = True
+
+# Bytes que se procesan juntos (se extiende hasta el siguiente salto de linea)
+_BLOQUE_LECTURA = 1 << 22
+
+# Potencias de 10 para contar digitos al escribir (10 .. 10**18)
+_POTENCIAS = 10 ** np.arange(1, 19, dtype=np.int64)
+
+# Filas que se arman juntas al escribir un archivo de texto
+_FILAS_POR_BLOQUE = 1 << 18
+
+# Cabecera de las fincas binarias (formato_binario.MAGIA_FINCA)
+_MAGIA_FINCA = b"RIEGOFB1"
+
+# Digitos maximos por campo para que el valor quepa en int64
+_MAX_DIGITOS = 18
+
+# Cota de los valores intermedios de costo_lote para usar int64 sin desborde
+_LIMITE_INT64 = 2 ** 62
+
+# Lo unico que el lector en bloque rechaza y _leer_finca_exacta acepta:
+# un \r que no es parte de \r\n, o un numero de mas de _MAX_DIGITOS digitos
+_SOLO_EXACTO = re.compile(rb"\r(?!\n)|[0-9]{%d}" % (_MAX_DIGITOS + 1))
+
+
+class _FueraDeInt64(ValueError):
+    """
+    el archivo es valido pero sus valores no entran en int64; filas trae la
+    finca ya leida con enteros de Python, asi leer_finca no la vuelve a leer
+    """
+
+    def __init__(self, filas):
+        super().__init__("Los valores no entran en enteros de 64 bits; use utils.leer_finca.")
+        self.filas = filas
+
+
+def costo_lote(finca, permutaciones, con_inicios=False):
+    """
+    con esta funcion calculamos el costo de una o muchas permutaciones a la vez,
+    es el nucleo que comparten calcular_costo, tiempos_inicio y los algoritmos
+    finca: Finca, arreglo NumPy (n, 3) o lista de tuplas (ts, tr, p)
+    permutaciones: una permutacion (n,) o un lote de k permutaciones (k, n)
+    retorna los costos (un numero para una permutacion, arreglo (k,) para un lote)
+    y si con_inicios=True tambien inicios[..., i] = instante en que empieza el tablon i
+    todo con operaciones de arreglos: gather de tr, cumsum, clip y suma
+    si los valores pueden pasar de int64 se calcula con enteros de Python
+    (ver _cabe_en_int64), asi el costo siempre es exacto
+    """
+    ts, tr, p = columnas_np(finca)
+    perms = np.asarray(permutaciones, dtype=np.intp)
+    if not _cabe_en_int64(ts, tr, p):
+        return _costo_lote_exacto(ts, tr, p, perms, con_inicios)
+    tr = tr[perms]
+    fin_riego = np.cumsum(tr, axis=-1)
+    retraso = np.clip(fin_riego - ts[perms], 0, None)
+    costos = (p[perms] * retraso).sum(axis=-1)
+    if perms.ndim == 1:
+        costos = costos.item()
+    if not con_inicios:
+        return costos
+    # del largo de la finca: los tablones que no estan en la permutacion quedan en 0
+    inicios = np.zeros(perms.shape[:-1] + (len(ts),), dtype=fin_riego.dtype)
+    np.put_along_axis(inicios, perms, fin_riego - tr, axis=-1)
+    return costos, inicios
+
+
+def _cabe_en_int64(ts, tr, p):
+    """
+    con esta funcion vemos si costo_lote puede usar int64: cada costo es a lo
+    sumo n * max|p| * (sum|tr| + max|ts|), y esa cota se calcula en float
+    una lista con enteros que no entran en int64 llega como arreglo de objetos
+    """
+    if not all(c.dtype.kind in "iu" for c in (ts, tr, p)):
+        return False
+    if not len(tr):
+        return True
+    cota = (float(np.abs(tr).sum(dtype=np.float64)) + float(np.abs(ts).max())) * float(np.abs(p).max()) * len(tr)
+    return cota < _LIMITE_INT64
+
+
+def _costo_lote_exacto(ts, tr, p, perms, con_inicios):
+    """
+    con esta funcion hacemos lo mismo que costo_lote con enteros de Python,
+    recorriendo cada permutacion como el calcular_costo original
+    """
+    ts, tr, p = np.asarray(ts).tolist(), np.asarray(tr).tolist(), np.asarray(p).tolist()
+    costos, todos = [], []
+    for perm in np.atleast_2d(perms).tolist():
+        tiempo_actual = 0
+        costo_total = 0
+        inicios = [0] * len(ts)
+        for i in perm:
+            inicios[i] = tiempo_actual
+            tiempo_actual += tr[i]
+            retraso = tiempo_actual - ts[i]
+            if retraso > 0:
+                costo_total += p[i] * retraso
+        costos.append(costo_total)
+        todos.append(inicios)
+    if perms.ndim == 1:
+        costos, todos = costos[0], todos[0]
+    else:
+        costos = np.array(costos, dtype=object)
+    if not con_inicios:
+        return costos
+    return costos, np.array(todos, dtype=object)
+
+
 def calcular_costo(finca, permutacion):
     
     """
@@ -7,67 +133,354 @@ def calcular_costo(finca, permutacion):
     permutacion: lista con el orden de los tablones [0, 1, 2]
     """
     
-    tiempo_actual = 0
-    costo_total = 0
-    
-    for i in permutacion:
-        ts, tr, p = finca[i]
-        fin_riego = tiempo_actual + tr
-        retraso = max(0, fin_riego - ts)
-        costo_total += p * retraso
-        tiempo_actual += tr  
-    
-    return costo_total
+    return costo_lote(finca, permutacion)
 
 
 def tiempos_inicio(finca, permutacion):
     """
     con esta funcion calcularemos en que momento se debe iniciar a regar cada tablon
     """
-    tiempos = [0] * len(finca)
-    tiempo_actual = 0
-    
-    for idx, i in enumerate(permutacion):
-        tiempos[i] = tiempo_actual
-        tiempo_actual += finca[i][1]  
-    
-    return tiempos
+    _, inicios = costo_lote(finca, permutacion, con_inicios=True)
+    return inicios.tolist()
 
 
 def leer_finca(ruta_archivo):
     """
     con esta funcion leemos el archivo de entrada la cual debe estar en un orden especifico
+    usa leer_finca_np, asi que tambien valida el formato; si los valores no
+    entran en int64 se devuelven las filas que leer_finca_np ya leyo con
+    enteros de Python (ver _leer_finca_exacta), sin leer el archivo otra vez
     """
-    with open(ruta_archivo, 'r') as f:
-        lineas = [line.strip() for line in f.readlines()]
-    
-    n = int(lineas[0])
-    finca = [tuple(map(int, linea.split(','))) for linea in lineas[1:n+1]]
+    try:
+        return [tuple(fila) for fila in leer_finca_np(ruta_archivo).tolist()]
+    except _FueraDeInt64 as error:
+        return error.filas
+
+
+def _leer_finca_exacta(ruta_archivo):
+    """
+    con esta funcion leemos el archivo de texto linea por linea con int de Python,
+    como el leer_finca original: acepta cualquier fin de linea (\\n, \\r\\n o \\r solo)
+    y enteros de cualquier largo, con las mismas validaciones que leer_finca_np
+    es el respaldo del lector en bloque, que solo corta en \\n y lee hasta 18 digitos
+    """
+    with open(ruta_archivo, "r", encoding="utf-8") as f:
+        lineas = [linea.strip() for linea in f]
+    lineas = [linea for linea in lineas if linea]
+    if not lineas:
+        raise ValueError("Archivo de entrada vacío. Se esperaba al menos la línea con n.")
+    try:
+        n = int(lineas[0])
+    except ValueError:
+        raise ValueError("La primera línea debe ser un entero n.") from None
+    if len(lineas) != 1 + n:
+        raise ValueError(
+            f"El archivo debe tener exactamente {n+1} líneas no vacías (n + datos={n}); "
+            f"se encontraron {len(lineas)}."
+        )
+    finca = []
+    for k, linea in enumerate(lineas[1:], start=2):
+        campos = linea.split(",")
+        if len(campos) != 3:
+            raise ValueError(_mensaje_linea(1, k))
+        try:
+            fila = tuple(int(campo) for campo in campos)
+        except ValueError:
+            raise ValueError(_mensaje_linea(2, k)) from None
+        if not 1 <= fila[2] <= 4:
+            raise ValueError(_mensaje_linea(3, k, fila))
+        if fila[0] < 0 or fila[1] <= 0:
+            raise ValueError(_mensaje_linea(4, k, fila))
+        finca.append(fila)
     return finca
 
 
+def _mensaje_linea(codigo, k, fila=None):
+    """
+    con esta funcion armamos el mensaje de error de la linea de datos k
+    (numerada como en _leer_finca_desde_archivo: el encabezado es la linea 1)
+    """
+    if codigo == 1:
+        return f"Línea {k}: se esperaban exactamente 3 valores separados por comas (ts,tr,p)."
+    if codigo == 2:
+        return f"Línea {k}: ts,tr,p deben ser enteros."
+    ts, tr, p = fila
+    if codigo == 3:
+        return f"Línea {k}: p debe estar en 1..4, recibido p={p}."
+    return f"Línea {k}: ts >= 0 y tr > 0, recibido ts={ts}, tr={tr}."
 
-def guardar_salida(ruta_archivo, costo, permutacion):
+
+def _formato_simple(region):
+    """
+    con esta funcion vemos si una region que solo tiene digitos, comas y saltos
+    de linea es exactamente "d,d,d\\n" repetido, con 1..18 digitos por campo
+    es el caso comun y se revisa con una sola pasada sobre los separadores
+    """
+    separadores = np.flatnonzero(region < 48)  # coma (44) o salto (10)
+    clases = region[separadores]
+    if region[-1] != _SALTO:
+        separadores = np.append(separadores, len(region))
+        clases = np.append(clases, _SALTO)
+    if len(clases) % 3 or not (clases.reshape(-1, 3) == (_COMA, _COMA, _SALTO)).all():
+        return False
+    anchos = np.diff(separadores, prepend=-1) - 1
+    return bool(anchos.min() >= 1 and anchos.max() <= _MAX_DIGITOS)
+
+
+def _codigos_generales(b, lineas, inicios, fines):
+    """
+    con esta funcion validamos el formato de cada linea de datos cuando hay
+    espacios, signos, lineas vacias u otros bytes; retorna un codigo por linea
+    (0 = bien, 1 = no son 3 campos, 2 = no son enteros)
+    todo se hace con sumas acumuladas sobre el bloque, sin recorrer linea por linea
+    """
+    def acumulado(mascara):
+        return np.concatenate(([0], np.cumsum(mascara, dtype=np.int64)))
+
+    es_coma = b == _COMA
+    contenido = ~(_ESPACIO[b] | es_coma | (b == _SALTO))
+    anterior = np.concatenate(([False], contenido[:-1]))
+    signo = _SIGNO[b]
+    ac_coma = acumulado(es_coma)
+    ac_contenido = acumulado(contenido)
+    ac_tramos = acumulado(contenido & ~anterior)
+    ac_signo = acumulado(signo)
+    # un signo que no abre su tramo ("5-3", "--5") o un byte que no es
+    # digito, signo, espacio ni coma invalidan la linea
+    ac_raro = acumulado((signo & anterior) | (contenido & ~signo & ~_DIGITO[b]))
+
+    s, e = inicios[lineas], fines[lineas]
+    codigos = np.zeros(len(lineas), dtype=np.int8)
+    tres = (ac_coma[e] - ac_coma[s]) == 2
+    codigos[~tres] = 1
+
+    posiciones = np.flatnonzero(es_coma)
+    primera = ac_coma[s[tres]]
+    c1 = posiciones[primera]
+    c2 = posiciones[primera + 1]
+    a = np.stack((s[tres], c1 + 1, c2 + 1))
+    z = np.stack((c1, c2, e[tres]))
+    # cada campo: un solo tramo sin espacios, a lo sumo un signo y 1..18 digitos
+    digitos = (ac_contenido[z] - ac_contenido[a]) - (ac_signo[z] - ac_signo[a])
+    campos_ok = ((ac_tramos[z] - ac_tramos[a]) == 1) & (digitos >= 1) & (digitos <= _MAX_DIGITOS)
+    enteros = campos_ok.all(axis=0) & ((ac_raro[e[tres]] - ac_raro[s[tres]]) == 0)
+    codigos[np.flatnonzero(tres)[~enteros]] = 2
+    return codigos
+
+
+def _parsear_bloque(b, lineas, inicios, fines, limpio):
+    """
+    con esta funcion convertimos las lineas de datos de un bloque de bytes b
+    (lineas: indices de las lineas no vacias, inicios/fines: limites de cada linea,
+    limpio: el bloque solo tiene digitos, comas y saltos de linea)
+    retorna (filas (m, 3), indice de la primera linea con error o None, codigo)
+    con codigo 1 = no son 3 campos, 2 = no son enteros, 3 = p fuera de 1..4,
+    4 = ts < 0 o tr <= 0; filas trae al menos las lineas hasta ese error
+    """
+    s = inicios[lineas]
+    if limpio and _formato_simple(b[s[0]:]):
+        corte = len(lineas)
+    else:
+        codigos = _codigos_generales(b, lineas, inicios, fines)
+        malas = np.flatnonzero(codigos)
+        corte = malas[0] if len(malas) else len(lineas)
+    # las lineas anteriores al primer error de formato ya son validas:
+    # el texto se convierte en C con np.fromstring (comas -> espacios)
+    fin_texto = s[corte] if corte < len(lineas) else len(b)
+    texto = b[s[0]:fin_texto].tobytes().replace(b",", b" ")
+    filas = np.fromstring(texto, dtype=np.int64, sep=" ").reshape(-1, 3)
+
+    rango = np.zeros(len(filas), dtype=np.int8)
+    rango[(filas[:, 0] < 0) | (filas[:, 1] <= 0)] = 4
+    rango[(filas[:, 2] < 1) | (filas[:, 2] > 4)] = 3
+    fuera = np.flatnonzero(rango)
+    if len(fuera):
+        return filas, fuera[0], int(rango[fuera[0]])
+    if corte < len(lineas):
+        return filas, corte, int(codigos[corte])
+    return filas, None, 0
+
+
+def leer_finca_np(ruta_archivo):
+    """
+    con esta funcion leemos el archivo de entrada en bloque y sin pasar por
+    objetos de Python por linea: el archivo se mapea en memoria (mmap) y los
+    campos se validan y convierten con operaciones de arreglos
+    retorna un arreglo NumPy (n, 3) de int64 con columnas ts, tr, p
+    hace las mismas validaciones estrictas que voraz._leer_finca_desde_archivo
+    (lineas vacias ignoradas, exactamente n lineas de datos, 3 enteros por linea,
+    p en 1..4, ts >= 0 y tr > 0) y con los mismos numeros de linea
+    si el archivo es una finca binaria (ver formato_binario) se lee esa sin copiarla
+    si el lector en bloque lo rechaza y el archivo tiene fines de linea \\r solos
+    o enteros de 19 o mas digitos se prueba con _leer_finca_exacta, que da los
+    mismos mensajes de error; los demas errores se lanzan sin volver a leer
+    """
+    with open(ruta_archivo, "rb") as f:
+        if f.read(8) == _MAGIA_FINCA:
+            # import diferido: formato_binario importa este modulo
+            from src.formato_binario import leer_finca_binaria
+            return leer_finca_binaria(ruta_archivo)
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Archivo de entrada vacío. Se esperaba al menos la línea con n.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            finca, error = _leer_mapeado(mm)
+            exacto = error is not None and _SOLO_EXACTO.search(mm) is not None
+    # el error se lanza con el mapa ya cerrado: la traza no retiene vistas de mm
+    if error is not None and not exacto:
+        raise ValueError(error)
+    if exacto:
+        # fines de linea \r solos o mas de 18 digitos: se prueba linea por linea
+        try:
+            filas = _leer_finca_exacta(ruta_archivo)
+        except UnicodeDecodeError:
+            raise ValueError(error) from None
+        try:
+            return np.array(filas, dtype=np.int64).reshape(-1, 3)
+        except OverflowError:
+            raise _FueraDeInt64(filas) from None
+    return finca
+
+
+def _leer_mapeado(mm):
+    """
+    con esta funcion recorremos el archivo mapeado por bloques de lineas completas
+    retorna (finca, None) o (None, mensaje de error)
+    ningun arreglo devuelto es una vista de mm, asi se puede cerrar al terminar
+    """
+    total = len(mm)
+    datos = np.frombuffer(mm, dtype=np.uint8)
+    n = None
+    vistas = 0  # lineas no vacias vistas, contando el encabezado
+    error = None
+    bloques = []
+    desde = 0
+    while desde < total:
+        hasta = min(total, desde + _BLOQUE_LECTURA)
+        if hasta < total:
+            salto = mm.find(b"\n", hasta - 1)
+            hasta = total if salto == -1 else salto + 1
+        b = datos[desde:hasta]
+        desde = hasta
+
+        saltos = np.flatnonzero(b == _SALTO)
+        inicios = np.concatenate(([0], saltos + 1))
+        fines = np.concatenate((saltos, [len(b)]))
+        limpio = bool(_LIMPIO[b].all())
+        if limpio:
+            lineas = np.flatnonzero(fines > inicios)
+        else:
+            util = np.concatenate(([0], np.cumsum(~_ESPACIO[b] & (b != _SALTO), dtype=np.int64)))
+            lineas = np.flatnonzero(util[fines] > util[inicios])
+
+        if n is None:
+            if not len(lineas):
+                continue
+            h = lineas[0]
+            try:
+                n = int(b[inicios[h]:fines[h]].tobytes().decode("utf-8"))
+            except ValueError:
+                return None, "La primera línea debe ser un entero n."
+            vistas = 1
+            lineas = lineas[1:]
+
+        primera = vistas
+        vistas += len(lineas)
+        if error is not None or not len(lineas) or vistas > 1 + n:
+            # ya hubo un error o sobran lineas: solo se sigue contando
+            continue
+        filas, malo, codigo = _parsear_bloque(b, lineas, inicios, fines, limpio)
+        bloques.append(filas)
+        if malo is not None:
+            fila = None
+            if codigo >= 3:
+                fila = filas[malo].tolist()
+            bloques[-1] = filas[:malo]
+            error = _mensaje_linea(codigo, primera + malo + 1, fila)
+
+    if n is None:
+        return None, "Archivo de entrada vacío. Se esperaba al menos la línea con n."
+    if vistas != 1 + n:
+        return None, (
+            f"El archivo debe tener exactamente {n+1} líneas no vacías (n + datos={n}); "
+            f"se encontraron {vistas}."
+        )
+    if error is not None:
+        return None, error
+    if not bloques:
+        return np.zeros((0, 3), dtype=np.int64), None
+    return np.concatenate(bloques), None
+
+
+
+def _texto_filas(columnas):
+    """
+    con esta funcion pasamos columnas de enteros (arreglos de igual largo) al texto
+    "a,b,...\\n" por fila, armando los digitos con operaciones de arreglos en un
+    solo buffer de bytes en vez de un str por numero
+    """
+    columnas = [np.asarray(c, dtype=np.int64) for c in columnas]
+    if any(len(c) and c.min() < 0 for c in columnas):
+        # con negativos se usa el camino simple
+        filas = zip(*(c.tolist() for c in columnas))
+        return "".join(",".join(map(str, fila)) + "\n" for fila in filas).encode()
+    digitos = [1 + np.searchsorted(_POTENCIAS, c, side="right") for c in columnas]
+    largo = sum(digitos) + len(columnas)  # digitos + comas + salto de linea
+    fin_fila = np.cumsum(largo)
+    buffer = np.full(int(fin_fila[-1]) if len(fin_fila) else 0, _COMA, dtype=np.uint8)
+    buffer[fin_fila - 1] = _SALTO
+    fin = fin_fila - 1  # posicion despues del ultimo digito de la ultima columna
+    for c, d in reversed(list(zip(columnas, digitos))):
+        resto = c.copy()
+        for j in range(int(d.max()) if len(d) else 0):
+            activos = d > j
+            buffer[(fin - 1 - j)[activos]] = 48 + resto[activos] % 10
+            resto //= 10
+        fin = fin - d - 1
+    return buffer.tobytes()
+
+
+def _escribir_filas(f, columnas):
+    """
+    con esta funcion escribimos en el archivo binario f las filas de las columnas
+    en bloques de _FILAS_POR_BLOQUE, asi la memoria extra no depende de n
+    """
+    total = len(columnas[0]) if columnas else 0
+    for desde in range(0, total, _FILAS_POR_BLOQUE):
+        f.write(_texto_filas([c[desde:desde + _FILAS_POR_BLOQUE] for c in columnas]))
+
+
+def guardar_salida(ruta_archivo, costo, permutacion, binaria=False, inicios=None):
     """
     con esta funcion se guarda el archivo con la informacion del costo y la permutacion
+    con binaria=True se escribe en el formato binario de formato_binario
+    inicios: opcional, instante de inicio de cada tablon (como lo da tiempos_inicio);
+    si se da, cada linea queda "pi,inicio de pi" en lugar de solo "pi"
+    el texto se arma por bloques desde arreglos (ver _texto_filas) y es identico
+    byte a byte al de escribir un numero por linea
     """
-    with open(ruta_archivo, 'w') as f:
-        f.write(str(costo) + '\n')
-        for i in permutacion:
-            f.write(str(i) + '\n')
-            
-            
+    if binaria:
+        from src.formato_binario import guardar_salida_binaria
+        guardar_salida_binaria(ruta_archivo, costo, permutacion)
+        return
+    perm = np.asarray(permutacion, dtype=np.int64)
+    columnas = [perm]
+    if inicios is not None:
+        columnas.append(np.asarray(inicios, dtype=np.int64)[perm])
+    with open(ruta_archivo, 'wb') as f:
+        f.write(f"{costo}\n".encode())
+        _escribir_filas(f, columnas)
+
+
 def medir_tiempo(funcion, finca):
     """
     con esta funcion medimos el tiempo que tarda cada funcion implementada
     en calcular los resultados, este recibe la funcion y finca con las tuplas
+    retorna siempre (perm, costo, duracion), tambien con las variantes de roPD
+    que devuelven (costo, orden); para fases y contadores ver instrumentacion.py
     """
-    inicio = time.time()
-    perm, costo = funcion(finca)
-    fin = time.time()
-    duracion = fin - inicio
+    from src.instrumentacion import normalizar
+    inicio = time.perf_counter()
+    resultado = funcion(finca)
+    duracion = time.perf_counter() - inicio
+    perm, costo = normalizar(resultado)
     return perm, costo, duracion
-
-
-            
-    
\ No newline at end of file
@@ -2,10 +2,17 @@
 """
 voraz.py — Algoritmo voraz para el problema de riego óptimo.
 
-Regla voraz implementada:
+Regla voraz por defecto:
     EDD con prioridades:
       Ordenar los tablones por (ts ascendente, p descendente, tr ascendente).
 
+Otras reglas de despacho registradas en REGLAS (ver roV(finca, regla=...)):
+    wspt  tr/p ascendente (regla de Smith)
+    mdd   menor max(ts, t + tr)
+    wmdd  menor max(tr, ts - t) / p
+    atc   apparent tardiness cost
+    mejor prueba todas y se queda con la de menor costo
+
 Formato de entrada (archivo de texto):
     n
     ts0,tr0,p0
@@ -22,16 +29,41 @@ Formato de salida (archivo de texto):
 
 Uso desde consola (ejemplo):
     python src/voraz.py entrada.txt salida.txt
+    python src/voraz.py entrada.txt salida.txt --regla mejor
+  Con --regla mejor se imprime el costo de cada regla.
+  La entrada puede ser de texto o binaria (src/formato_binario.py, se
+  detecta sola); con --binaria la salida se escribe en binario y con
+  --inicios cada línea de texto lleva también el instante de inicio.
+
+Modo en flujo (ejemplo):
+    productor | python src/voraz.py --stream [--max-pendientes K] [--regla wspt]
+    python src/voraz.py --stream entrada.txt salida.txt
+  Lee líneas "ts,tr,p" o "ts,tr,p,llegada" de stdin (o de un archivo, sin
+  necesitar n al principio) y escribe "i,inicio,costo_acumulado" por cada
+  tablón en cuanto el regador queda libre (ver roV_flujo).
 
 Complejidad:
 - Ordenar n tablones: O(n log n).
+- Reglas dependientes del tiempo (mdd, wmdd, atc): O(n log n) con heaps.
 - Calcular inicios y costo: O(n).
 - Total: O(n log n).
 """
 
 from typing import List, Tuple
+import argparse
+import heapq
+import math
+import os
 import sys
 
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.finca import Finca, columnas, columnas_np
+from src.instrumentacion import NULO
+from src.utils import _mensaje_linea, costo_lote, guardar_salida, leer_finca_np
+
 
 # ============================
 # Cálculo de costo y tiempos
@@ -48,116 +80,384 @@ def _calc_cost_and_starts(
       - costo_total = sum_i p_i * max(0, C_i - ts_i)
 
     Parámetros:
-      finca: lista de tuplas (ts, tr, p) por índice de tablón i
+      finca: lista de tuplas (ts, tr, p) por índice de tablón i, o Finca
       perm:  lista de índices de tablón en el orden de riego
 
     Retorna:
       (start, completion, costo_total)
     """
-    n = len(finca)
-    start = [0] * n
-    completion = [0] * n
+    costo_total, inicios = costo_lote(finca, perm, con_inicios=True)
+    start = inicios.tolist()
+    completion = (inicios + columnas_np(finca)[1]).tolist()
+
+    return start, completion, costo_total
+
+
+# ============================
+# Registro de reglas de despacho
+# ============================
+# nombre -> función(finca) que devuelve la permutación pi.
+# El orden de registro decide los empates del modo "mejor".
+REGLAS = {}
+
+# Constante de escala K de la regla ATC (suele usarse entre 1 y 3)
+K_ATC = 2.0
+
+
+def regla(nombre: str):
+    """
+    Decorador que registra una regla de despacho bajo `nombre`.
+    """
+    def registrar(funcion):
+        REGLAS[nombre] = funcion
+        return funcion
+    return registrar
+
 
-    # t acumula el tiempo corrido del recurso de riego
+@regla("edd")
+def _regla_edd(finca: List[Tuple[int, int, int]]) -> List[int]:
+    """EDD con prioridades: (ts asc, p desc, tr asc)."""
+    ts, tr, p = columnas_np(finca)
+    # lexsort es estable: los empates quedan por índice, como con sorted
+    return np.lexsort((tr, -p, ts)).tolist()
+
+
+@regla("wspt")
+def _regla_wspt(finca: List[Tuple[int, int, int]]) -> List[int]:
+    """WSPT (regla de Smith): tr/p ascendente, desempate por ts."""
+    ts, tr, p = columnas_np(finca)
+    return np.lexsort((ts, tr / p)).tolist()
+
+
+def _despacho_dinamico(ts, tr, valor, clave_critica, clave_espera, grupo=None) -> List[int]:
+    """
+    Despacho para reglas cuya prioridad depende del instante t.
+
+    En todas las reglas de este archivo un tablón j pasa a ser "crítico"
+    cuando t >= ts_j - tr_j (ya no alcanza a terminar a tiempo), y dentro de
+    cada estado el orden relativo entre tablones no cambia con t:
+      - críticos: un heap por clave_critica[j];
+      - en espera: un heap por clave_espera[j] (uno por grupo si la regla
+        solo es invariante entre tablones del mismo grupo).
+    En cada paso se comparan las cimas con valor(t, j, critico) (menor es
+    mejor, empate por índice). Los tablones se activan recorriendo una sola
+    vez la lista ordenada por umbral. Total O(n log n) por grupo.
+    """
+    n = len(ts)
+    umbral = [ts[j] - tr[j] for j in range(n)]
+    grupo = grupo or [0] * n
+    por_activar = sorted(range(n), key=lambda j: umbral[j])
+    criticos = []
+    espera = {}
+    for j in range(n):
+        espera.setdefault(grupo[j], []).append((clave_espera[j], j))
+    for heap in espera.values():
+        heapq.heapify(heap)
+
+    tomado = [False] * n   # regado o movido a críticos
+    pi = []
     t = 0
-    for i in perm:
-        start[i] = t
-        ts, tr, p = finca[i]
-        t += tr
-        completion[i] = start[i] + tr
+    k = 0
+    while len(pi) < n:
+        while k < n and umbral[por_activar[k]] <= t:
+            j = por_activar[k]
+            k += 1
+            if not tomado[j]:
+                tomado[j] = True
+                heapq.heappush(criticos, (clave_critica[j], j))
+
+        mejor = None
+        if criticos:
+            j = criticos[0][1]
+            mejor = (valor(t, j, True), j, None)
+        for g, heap in espera.items():
+            while heap and tomado[heap[0][1]]:
+                heapq.heappop(heap)
+            if heap:
+                j = heap[0][1]
+                candidato = (valor(t, j, False), j, g)
+                if mejor is None or candidato[:2] < mejor[:2]:
+                    mejor = candidato
+
+        _, j, g = mejor
+        if g is None:
+            heapq.heappop(criticos)
+        else:
+            heapq.heappop(espera[g])
+            tomado[j] = True
+        pi.append(j)
+        t += tr[j]
+    return pi
+
+
+@regla("mdd")
+def _regla_mdd(finca: List[Tuple[int, int, int]]) -> List[int]:
+    """MDD (modified due date): menor max(ts_j, t + tr_j)."""
+    ts, tr, _ = columnas(finca)
+
+    def valor(t, j, critico):
+        return t + tr[j] if critico else ts[j]
+
+    return _despacho_dinamico(ts, tr, valor, tr, ts)
+
+
+@regla("wmdd")
+def _regla_wmdd(finca: List[Tuple[int, int, int]]) -> List[int]:
+    """MDD ponderada (Kanet y Li): menor max(tr_j, ts_j - t) / p_j."""
+    ts, tr, p = columnas(finca)
+
+    def valor(t, j, critico):
+        return tr[j] / p[j] if critico else (ts[j] - t) / p[j]
+
+    # (ts_j - t)/p_j solo conserva el orden entre tablones de igual p
+    return _despacho_dinamico(ts, tr, valor, [tr[j] / p[j] for j in range(len(finca))], ts, grupo=p)
+
+
+@regla("atc")
+def _regla_atc(finca: List[Tuple[int, int, int]]) -> List[int]:
+    """
+    ATC (apparent tardiness cost): mayor
+        (p_j / tr_j) * exp(-max(ts_j - tr_j - t, 0) / (K * tr_promedio)).
+    Se trabaja con -log del índice para que menor sea mejor.
+    """
+    n = len(finca)
+    if n == 0:
+        return []
+    ts, tr, p = columnas(finca)
+    escala = K_ATC * sum(tr) / n
+    base = [math.log(tr[j] / p[j]) for j in range(n)]
+    holgura = [(ts[j] - tr[j]) / escala for j in range(n)]
 
-    # costo por sufrimiento: p_i * max(0, C_i - ts_i)
-    costo_total = 0
-    for i, (ts, tr, p) in enumerate(finca):
-        tardanza = completion[i] - ts
-        if tardanza < 0:
-            tardanza = 0
-        costo_total += p * tardanza
+    def valor(t, j, critico):
+        return base[j] if critico else base[j] + holgura[j] - t / escala
 
-    return start, completion, costo_total
+    return _despacho_dinamico(ts, tr, valor, base, [base[j] + holgura[j] for j in range(n)])
+
+
+def evaluar_reglas(finca: List[Tuple[int, int, int]]):
+    """
+    Aplica todas las reglas registradas.
+    Devuelve un diccionario nombre -> (pi, costo), en orden de registro.
+    """
+    ordenes = {nombre: funcion(finca) for nombre, funcion in REGLAS.items()}
+    # todos los órdenes se evalúan juntos como un lote (k x n)
+    costos = costo_lote(finca, list(ordenes.values()))
+    return {nombre: (pi, int(c)) for (nombre, pi), c in zip(ordenes.items(), costos)}
+
+
+def mejor_regla(resultados):
+    """
+    (pi, costo) de menor costo entre los resultados de evaluar_reglas
+    (empate: la primera registrada). Así quien ya evaluó las reglas, como
+    main al mostrar el costo de cada una, no las vuelve a correr.
+    """
+    return min(resultados.values(), key=lambda r: r[1])
 
 
 # ============================
 # Algoritmo voraz principal
 # ============================
-def roV(finca: List[Tuple[int, int, int]]):
+def roV(finca: List[Tuple[int, int, int]], regla: str = "edd", instrumentos=NULO):
     """
     Algoritmo voraz propuesto.
-    Regla: EDD con prioridades -> ordenar por (ts asc, p desc, tr asc).
+    Regla por defecto: EDD con prioridades -> ordenar por (ts asc, p desc, tr asc).
 
     Parámetros:
-      finca: lista de n tuplas (ts_i, tr_i, p_i) para i=0..n-1
+      finca: lista de n tuplas (ts_i, tr_i, p_i) para i=0..n-1, o Finca
+      regla: nombre de una regla de REGLAS ("edd", "wspt", "mdd", "wmdd",
+        "atc") o "mejor" para probarlas todas y quedarse con la de menor
+        costo (empate: la primera registrada).
+      instrumentos: ver src/instrumentacion.py (fases "orden" y "costo",
+        contador "permutaciones_evaluadas")
 
     Devuelve:
       (pi, costo)
         - pi: lista con la permutación (orden) de índices de tablones a regar.
         - costo: costo total CRF de la programación propuesta.
     """
-    n = len(finca)
-    indices = list(range(n))
+    if regla == "mejor":
+        with instrumentos.fase("orden"):
+            resultados = evaluar_reglas(finca)
+        instrumentos.contar("permutaciones_evaluadas", len(resultados))
+        return mejor_regla(resultados)
+    if regla not in REGLAS:
+        raise ValueError(f"Regla desconocida: {regla}. Opciones: {', '.join(REGLAS)}, mejor.")
 
-    # Orden clave: primero ts asc, luego prioridad descendente (-p), y tr asc
-    pi = sorted(indices, key=lambda i: (finca[i][0], -finca[i][2], finca[i][1]))
+    with instrumentos.fase("orden"):
+        pi = REGLAS[regla](finca)
 
     # Calcula el costo asociado a ese orden
-    _, _, costo = _calc_cost_and_starts(finca, pi)
+    with instrumentos.fase("costo"):
+        _, _, costo = _calc_cost_and_starts(finca, pi)
+    instrumentos.contar("permutaciones_evaluadas")
     return pi, costo
 
 
 # ============================
-# Entrada / salida de archivos
+# Modo en flujo (online)
 # ============================
-def _leer_finca_desde_archivo(path: str) -> List[Tuple[int, int, int]]:
+# Reglas con prioridad fija por tablón: nombre -> clave(ts, tr, p), menor primero.
+# Los empates se deciden por orden de llegada, como en REGLAS.
+CLAVES_FLUJO = {
+    "edd": lambda ts, tr, p: (ts, -p, tr),
+    "wspt": lambda ts, tr, p: (tr / p, ts),
+}
+
+# Tope por defecto de la cola de pendientes en flujo: cada pendiente ocupa
+# unos 140 bytes, así que la cola nunca pasa de ~140 MB.
+MAX_PENDIENTES = 1_000_000
+
+
+def leer_tablones_flujo(lineas):
     """
-    Lee el archivo de entrada con el formato especificado en el enunciado.
-    Retorna una lista de tuplas (ts, tr, p).
+    Recorre líneas "ts,tr,p" o "ts,tr,p,llegada" y devuelve (generador)
+    tuplas (ts, tr, p, llegada) a medida que llegan.
+
+    Si la primera línea no vacía es un solo entero se toma como n y se
+    ignora (así sirven los archivos de entrada de siempre). Sin columna de
+    llegada un tablón llega en el mismo instante que el anterior (0 para el
+    primero); las llegadas no pueden retroceder. Los errores de formato
+    usan los mensajes de leer_finca con el número de línea física.
+    """
+    llegada = 0
+    primera = True
+    for k, linea in enumerate(lineas, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        if primera:
+            primera = False
+            if "," not in linea:
+                try:
+                    int(linea)
+                    continue
+                except ValueError:
+                    pass
+        partes = linea.split(",")
+        if len(partes) not in (3, 4):
+            raise ValueError(f"Línea {k}: se esperaban 3 valores (ts,tr,p) o 4 (ts,tr,p,llegada) separados por comas.")
+        try:
+            valores = [int(x) for x in partes]
+        except ValueError:
+            raise ValueError(_mensaje_linea(2, k)) from None
+        ts, tr, p = valores[:3]
+        if not 1 <= p <= 4:
+            raise ValueError(_mensaje_linea(3, k, (ts, tr, p)))
+        if ts < 0 or tr <= 0:
+            raise ValueError(_mensaje_linea(4, k, (ts, tr, p)))
+        if len(valores) == 4:
+            if valores[3] < llegada:
+                raise ValueError(f"Línea {k}: la llegada {valores[3]} es anterior a la previa ({llegada}).")
+            llegada = valores[3]
+        yield ts, tr, p, llegada
+
+
+def roV_flujo(tablones, regla: str = "edd", max_pendientes=MAX_PENDIENTES):
     """
-    with open(path, "r", encoding="utf-8") as f:
-        # Solo consideramos líneas no vacías (estrictas para el conteo)
-        lineas = [ln.strip() for ln in f if ln.strip() != ""]
+    Voraz en línea: simula el regador a medida que llegan los tablones.
 
-    if not lineas:
-        raise ValueError("Archivo de entrada vacío. Se esperaba al menos la línea con n.")
+    Cuando el regador queda libre en el instante t, entran a la cola de
+    prioridad todos los tablones con llegada <= t y se riega el de menor
+    clave según la regla (si no hay ninguno, el regador espera a la próxima
+    llegada). Para decidir en t solo hace falta haber leído la primera
+    llegada posterior a t, así que la salida va saliendo mientras se lee.
 
-    # Primera línea: n
+    Parámetros:
+      tablones: iterable de (ts, tr, p) o (ts, tr, p, llegada), con las
+        llegadas sin retroceder (ver leer_tablones_flujo)
+      regla: "edd" o "wspt" (las de CLAVES_FLUJO; el resto de REGLAS
+        depende del instante y de todos los pendientes)
+      max_pendientes: tope de la cola (MAX_PENDIENTES por defecto); si está
+        llena se riega sin esperar a que lleguen más, así la memoria queda
+        acotada por este número. None quita el tope: hasta n pendientes.
+        Mientras el tope no se alcance y con todo llegando en 0, el orden
+        es el de roV(finca, regla).
+
+    Devuelve (generador):
+      (i, inicio, costo_acumulado) por tablón regado; i es el orden de
+      llegada (0, 1, ...).
+    """
+    if regla not in CLAVES_FLUJO:
+        raise ValueError(f"Regla sin modo en flujo: {regla}. Opciones: {', '.join(CLAVES_FLUJO)}.")
+    if max_pendientes is not None and max_pendientes < 1:
+        raise ValueError("max_pendientes debe ser al menos 1.")
+    clave = CLAVES_FLUJO[regla]
+    entrada = iter(tablones)
+    pendientes = []
+    t = 0
+    costo = 0
+    i = 0
+    siguiente = next(entrada, None)
+    while True:
+        while siguiente is not None and (max_pendientes is None or len(pendientes) < max_pendientes):
+            ts, tr, p = siguiente[:3]
+            if len(siguiente) > 3 and siguiente[3] > t:
+                if pendientes:
+                    break
+                t = siguiente[3]  # regador ocioso hasta la próxima llegada
+            # tupla plana: se compara mucho más rápido que una clave anidada
+            heapq.heappush(pendientes, clave(ts, tr, p) + (i, ts, tr, p))
+            i += 1
+            siguiente = next(entrada, None)
+        if not pendientes:
+            return
+        j, ts, tr, p = heapq.heappop(pendientes)[-4:]
+        inicio = t
+        t += tr
+        if t > ts:
+            costo += p * (t - ts)
+        yield j, inicio, costo
+
+
+def _main_flujo(argv):
+    """python src/voraz.py --stream [entrada|-] [salida|-] [--max-pendientes K] [--regla R]"""
+    parser = argparse.ArgumentParser(prog="voraz.py --stream", description="Voraz en línea sobre un flujo de tablones.")
+    parser.add_argument("entrada", nargs="?", default="-", help="archivo o - para stdin")
+    parser.add_argument("salida", nargs="?", default="-", help="archivo o - para stdout")
+    parser.add_argument("--max-pendientes", type=int, default=MAX_PENDIENTES,
+                        help=f"tope de la cola de pendientes (por defecto {MAX_PENDIENTES})")
+    parser.add_argument("--regla", default="edd", choices=sorted(CLAVES_FLUJO))
+    args = parser.parse_args(argv)
+    entrada, salida = args.entrada, args.salida
+
+    origen = sys.stdin if entrada == "-" else open(entrada, encoding="utf-8")
+    destino = sys.stdout if salida == "-" else open(salida, "w", encoding="utf-8")
+    # por consola o tubería cada decisión se entrega apenas se toma
+    al_momento = entrada == "-" or salida == "-"
     try:
-        n = int(lineas[0])
+        for j, inicio, costo in roV_flujo(leer_tablones_flujo(origen), args.regla, args.max_pendientes):
+            destino.write(f"{j},{inicio},{costo}\n")
+            if al_momento:
+                destino.flush()
     except Exception as e:
-        raise ValueError("La primera línea debe ser un entero n.") from e
-
-    #  Validación estricta: deben ser exactamente n+1 líneas no vacías
-    if len(lineas) != 1 + n:
-        raise ValueError(
-            f"El archivo debe tener exactamente {n+1} líneas no vacías (n + datos={n}); "
-            f"se encontraron {len(lineas)}."
-        )
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if origen is not sys.stdin:
+            origen.close()
+        if destino is not sys.stdout:
+            destino.close()
 
-    finca: List[Tuple[int, int, int]] = []
-    for k in range(1, 1 + n):
-        partes = lineas[k].split(",")
-        if len(partes) != 3:
-            raise ValueError(
-                f"Línea {k+1}: se esperaban exactamente 3 valores separados por comas (ts,tr,p)."
-            )
-        try:
-            ts = int(partes[0].strip())
-            tr = int(partes[1].strip())
-            p = int(partes[2].strip())
-        except Exception as e:
-            raise ValueError(f"Línea {k+1}: ts,tr,p deben ser enteros.") from e
-
-        # Validaciones básicas sugeridas por el enunciado
-        if p < 1 or p > 4:
-            raise ValueError(f"Línea {k+1}: p debe estar en 1..4, recibido p={p}.")
-        if ts < 0 or tr <= 0:
-            raise ValueError(f"Línea {k+1}: ts >= 0 y tr > 0, recibido ts={ts}, tr={tr}.")
 
-        finca.append((ts, tr, p))
+# ============================
+# Entrada / salida de archivos
+# ============================
+def _leer_finca_desde_archivo(path: str) -> List[Tuple[int, int, int]]:
+    """
+    Lee el archivo de entrada con el formato especificado en el enunciado.
+    Retorna una lista de tuplas (ts, tr, p).
 
-    return finca
+    La lectura y las validaciones estrictas (n+1 líneas no vacías, 3 enteros
+    por línea, p en 1..4, ts >= 0, tr > 0) las hace utils.leer_finca_np en
+    bloque sobre el archivo mapeado en memoria; los mensajes de error y los
+    números de línea son los de siempre.
+    """
+    return [tuple(fila) for fila in leer_finca_np(path).tolist()]
 
 
-def _escribir_salida(path: str, costo: int, perm: List[int]) -> None:
+def _escribir_salida(
+    path: str, costo: int, perm: List[int], binaria: bool = False, inicios=None
+) -> None:
     """
     Escribe el archivo de salida con el formato:
       Costo
@@ -165,11 +465,11 @@ def _escribir_salida(path: str, costo: int, perm: List[int]) -> None:
       pi1
       ...
       pi(n-1)
+    Con binaria=True usa el formato binario (formato_binario.guardar_salida_binaria).
+    Con inicios (instante de inicio por tablón) cada línea es "pi_k,inicio".
+    La escritura es por bloques desde arreglos (utils.guardar_salida).
     """
-    with open(path, "w", encoding="utf-8") as g:
-        g.write(f"{costo}\n")
-        for i in perm:
-            g.write(f"{i}\n")
+    guardar_salida(path, costo, perm, binaria=binaria, inicios=inicios)
 
 
 def _validar_permutacion(perm: List[int], n: int) -> None:
@@ -184,16 +484,46 @@ def _validar_permutacion(perm: List[int], n: int) -> None:
 # ============================
 def main(argv=None):
     argv = list(sys.argv[1:] if argv is None else argv)
+    if "--stream" in argv:
+        argv.remove("--stream")
+        _main_flujo(argv)
+        return
+    regla_elegida = "edd"
+    binaria = "--binaria" in argv
+    if binaria:
+        argv.remove("--binaria")
+    con_inicios = "--inicios" in argv
+    if con_inicios:
+        argv.remove("--inicios")
+    if "--regla" in argv:
+        pos = argv.index("--regla")
+        if pos + 1 >= len(argv):
+            argv = []
+        else:
+            regla_elegida = argv[pos + 1]
+            del argv[pos:pos + 2]
     if len(argv) != 2:
-        print("Uso: python src/voraz.py <archivo_entrada> <archivo_salida>", file=sys.stderr)
+        print(
+            "Uso: python src/voraz.py <archivo_entrada> <archivo_salida> [--regla NOMBRE] [--binaria] [--inicios]",
+            file=sys.stderr,
+        )
         sys.exit(2)
 
     entrada, salida = argv
     try:
-        finca = _leer_finca_desde_archivo(entrada)
-        perm, costo = roV(finca)
+        finca = Finca.leer(entrada)
+        if regla_elegida == "mejor":
+            resultados = evaluar_reglas(finca)
+            for nombre, (_, costo_regla) in resultados.items():
+                print(f"{nombre}: {costo_regla}")
+            perm, costo = mejor_regla(resultados)
+        else:
+            perm, costo = roV(finca, regla_elegida)
         _validar_permutacion(perm, len(finca))
-        _escribir_salida(salida, costo, perm)
+        inicios = None
+        if con_inicios:
+            inicios, _, _ = _calc_cost_and_starts(finca, perm)
+        _escribir_salida(salida, costo, perm, binaria, inicios)
     except Exception as e:
         # Mensaje y salida con error para que los tests (subprocess.run(..., check=True))
         # detecten el fallo como CalledProcessError.
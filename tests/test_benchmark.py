@@ -0,0 +1,64 @@
+import copy
+import json
+import os
+from pathlib import Path
+
+import pytest
+from src.benchmark import MOTORES, comparar, correr_suite, generar_finca, medir, registrar_motor
+from src.voraz import roV
+
+BM_DIR = Path(__file__).resolve().parent / "benchmarks"
+
+
+# ----------------------------------------------------------
+# (a) Instancias reproducibles y estadísticas coherentes
+# ----------------------------------------------------------
+def test_generar_y_medir():
+    assert generar_finca(50, 7) == generar_finca(50, 7)
+    assert generar_finca(50, 7) != generar_finca(50, 8)
+
+    m = medir(roV, generar_finca(200, 1), repeticiones=5)
+    assert m["costo"] == roV(generar_finca(200, 1))[1]
+    assert 0 < m["min_s"] <= m["mediana_s"] <= m["p95_s"]
+    assert m["pico_bytes"] > 0
+
+
+# ----------------------------------------------------------
+# (b) Suite en JSON y detección de regresiones contra una base
+# ----------------------------------------------------------
+def test_suite_y_comparacion(tmp_path):
+    registrar_motor("prueba_roV", (10,), roV)
+    try:
+        actual = correr_suite(["roPD_numpy", "prueba_roV"], [8, 12], repeticiones=3)
+    finally:
+        del MOTORES["prueba_roV"]
+    assert [(f["motor"], f["n"]) for f in actual["resultados"]] == [
+        ("roPD_numpy", 8), ("roPD_numpy", 12), ("prueba_roV", 8), ("prueba_roV", 12)
+    ]
+    assert {"python", "numpy", "nucleos", "commit"} <= set(actual["entorno"])
+    ruta = tmp_path / "bench.json"
+    ruta.write_text(json.dumps(actual))
+    base = json.loads(ruta.read_text())
+
+    assert comparar(actual, base) == []
+    lenta = copy.deepcopy(actual)
+    lenta["resultados"][1]["mediana_s"] = base["resultados"][1]["mediana_s"] * 2 + 1
+    lenta["resultados"][2]["costo"] += 1
+    regresiones = comparar(lenta, base)
+    assert len(regresiones) == 2
+    assert regresiones[0].startswith("roPD_numpy n=12: mediana")
+    assert regresiones[1].startswith("prueba_roV n=8: costo")
+
+
+# ----------------------------------------------------------
+# (c) Suite completa contra la base guardada (RUN_SLOW=1)
+#     Base en tests/benchmarks/base.json
+# ----------------------------------------------------------
+@pytest.mark.skipif(os.environ.get("RUN_SLOW", "0") != "1", reason="benchmark lento")
+def test_suite_completa_contra_base():
+    base = json.loads((BM_DIR / "base.json").read_text(encoding="utf-8"))
+    actual = correr_suite(repeticiones=base["parametros"]["repeticiones"])
+    (BM_DIR / "bench_suite.json").write_text(json.dumps(actual, indent=2), encoding="utf-8")
+    # en otra máquina los tiempos no son comparables; los costos siempre
+    regresiones = [r for r in comparar(actual, base, tolerancia=float("inf")) if "costo" in r]
+    assert regresiones == []
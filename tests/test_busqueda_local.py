@@ -0,0 +1,56 @@
+import os
+import random
+import time
+import pytest
+from src.benchmark import generar_finca
+from src.busqueda_local import mejorar_local, roV_local
+from src.dinamica import roPD_numpy
+from src.voraz import roV
+from src.utils import calcular_costo
+
+
+# ----------------------------------------------------------
+# (a) El costo incremental coincide con el recalculado
+# ----------------------------------------------------------
+@pytest.mark.parametrize("ventana", [1, 3, 8])
+def test_costo_incremental_correcto(ventana):
+    rnd = random.Random(ventana)
+    for seed in range(50):
+        n = rnd.randint(0, 15)
+        finca = generar_finca(n, seed)
+        perm = list(range(n))
+        rnd.shuffle(perm)
+        mejor, costo = mejorar_local(finca, perm, ventana=ventana)
+        assert sorted(mejor) == list(range(n))
+        assert costo == calcular_costo(finca, mejor)
+        assert costo <= calcular_costo(finca, perm)
+
+# ----------------------------------------------------------
+# (b) Nunca empeora a roV y nunca baja del óptimo
+# ----------------------------------------------------------
+def test_roV_local_entre_optimo_y_voraz():
+    for seed in range(10):
+        finca = generar_finca(14, seed)
+        _, costo = roV_local(finca)
+        assert roPD_numpy(finca)[0] <= costo <= roV(finca)[1]
+
+
+def test_limite_de_tiempo():
+    finca = generar_finca(3000, semilla=1)
+    perm, _ = roV(finca)
+    mejor, costo = mejorar_local(finca, perm, limite_segundos=0)
+    assert costo == calcular_costo(finca, mejor)
+
+# ----------------------------------------------------------
+# (c) Tamaño de benchmark n=50 000 (RUN_SLOW=1)
+# ----------------------------------------------------------
+@pytest.mark.skipif(os.environ.get("RUN_SLOW", "0") != "1", reason="benchmark lento")
+def test_mejora_local_n50000():
+    finca = generar_finca(50_000, semilla=5001)
+    perm, costo_voraz = roV(finca)
+    start = time.time()
+    mejor, costo = mejorar_local(finca, perm, max_pasadas=3)
+    end = time.time()
+    print(f"\n[LOCAL n=50000] Tiempo: {end - start:.3f} s, roV={costo_voraz}, local={costo}")
+    assert costo == calcular_costo(finca, mejor)
+    assert costo <= costo_voraz
@@ -0,0 +1,129 @@
+import os
+import random
+
+from src.benchmark import generar_finca
+from src.cache import CacheResultados, clave
+from src.dinamica import roPD
+from src.lote import buscar_entradas, resolver_lote
+from src.utils import calcular_costo
+
+
+class Contador:
+    """roPD que cuenta cuántas veces se llamó."""
+
+    def __init__(self):
+        self.llamadas = 0
+
+    def __call__(self, finca):
+        self.llamadas += 1
+        return roPD(finca)
+
+
+# ----------------------------------------------------------
+# (a) Fallo y después acierto sin volver a resolver
+# ----------------------------------------------------------
+def test_acierto_en_memoria():
+    finca = generar_finca(10, semilla=1)
+    cache = CacheResultados()
+    pd = Contador()
+    assert cache.obtener(finca, "pd") is None
+    primero = cache.resolver(finca, "pd", pd)
+    assert primero == roPD(finca)
+    assert cache.resolver(finca, "pd", pd) == primero
+    assert pd.llamadas == 1
+    assert cache.estadisticas == {"aciertos_memoria": 1, "aciertos_disco": 0, "fallos": 2}
+    # otro algoritmo es otra clave
+    assert clave(finca, "pd") != clave(finca, "fb")
+    assert cache.obtener(finca, "fb") is None
+
+
+# ----------------------------------------------------------
+# (b) La misma finca reordenada acierta con el orden traducido
+# ----------------------------------------------------------
+def test_finca_reordenada():
+    finca = generar_finca(11, semilla=2) + [(5, 2, 3), (5, 2, 3)]  # con tablones repetidos
+    cache = CacheResultados()
+    costo, _ = cache.resolver(finca, "pd", roPD)
+
+    rnd = random.Random(3)
+    for _ in range(5):
+        otra = finca[:]
+        rnd.shuffle(otra)
+        assert clave(otra, "pd") == clave(finca, "pd")
+        c, orden = cache.obtener(otra, "pd")
+        assert c == costo
+        assert sorted(orden) == list(range(len(otra)))
+        assert calcular_costo(otra, orden) == costo
+    assert clave(finca[:-1], "pd") != clave(finca, "pd")
+
+
+# ----------------------------------------------------------
+# (c) Nivel en disco: persiste entre instancias y se acota por tamaño
+# ----------------------------------------------------------
+def test_disco_persistente_y_acotado(tmp_path):
+    fincas = [generar_finca(8, semilla=s) for s in range(6)]
+    cache = CacheResultados(tmp_path)
+    esperados = [cache.resolver(f, "pd", roPD) for f in fincas]
+
+    otra = CacheResultados(tmp_path)
+    pd = Contador()
+    assert [otra.resolver(f, "pd", pd) for f in fincas] == esperados
+    assert pd.llamadas == 0 and otra.estadisticas["aciertos_disco"] == 6
+
+    tamano = (tmp_path / (clave(fincas[0], "pd") + ".bin")).stat().st_size
+    chica = CacheResultados(tmp_path, max_bytes_disco=3 * tamano)
+    chica.resolver(generar_finca(8, semilla=99), "pd", roPD)
+    assert len(list(tmp_path.glob("*.bin"))) == 3
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_disco_sin_recorrer_en_cada_escritura(tmp_path, monkeypatch):
+    recorridos = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda d: recorridos.append(d) or scandir(d))
+    fincas = [generar_finca(8, semilla=s) for s in range(6)]
+    cache = CacheResultados(tmp_path)
+    for f in fincas + fincas[:2]:  # las dos últimas reemplazan su archivo
+        cache.guardar(f, "pd", *roPD(f))
+    assert len(recorridos) == 1  # solo al crear la caché
+    monkeypatch.undo()  # glob también usa os.scandir
+    assert cache._bytes_disco == sum(r.stat().st_size for r in tmp_path.glob("*.bin"))
+
+    tamano = (tmp_path / (clave(fincas[0], "pd") + ".bin")).stat().st_size
+    cache.max_bytes_disco = 6 * tamano
+    monkeypatch.setattr(os, "scandir", lambda d: recorridos.append(d) or scandir(d))
+    cache.resolver(generar_finca(8, semilla=99), "pd", roPD)  # pasa el tope: limpia
+    assert len(recorridos) == 2
+    monkeypatch.undo()
+    assert len(list(tmp_path.glob("*.bin"))) == 6
+    assert cache._bytes_disco == 6 * tamano
+
+
+# ----------------------------------------------------------
+# (d) LRU en memoria acotado por bytes
+# ----------------------------------------------------------
+def test_lru_en_memoria():
+    fincas = [generar_finca(10, semilla=s) for s in range(4)]
+    cache = CacheResultados(max_bytes_memoria=3 * 8 * 10)
+    for f in fincas[:3]:
+        cache.resolver(f, "pd", roPD)
+    cache.obtener(fincas[0], "pd")          # 0 pasa a ser el más reciente
+    cache.resolver(fincas[3], "pd", roPD)   # sale 1, el menos usado
+    assert cache.obtener(fincas[0], "pd") is not None
+    assert cache.obtener(fincas[1], "pd") is None
+    assert cache.obtener(fincas[2], "pd") is not None
+
+
+# ----------------------------------------------------------
+# (e) El lote con --cache no cambia los resultados
+# ----------------------------------------------------------
+def test_lote_con_cache(tmp_path):
+    for k in range(4):
+        finca = generar_finca(9, semilla=k % 2)  # dos fincas, cada una dos veces
+        (tmp_path / f"f{k}.txt").write_text(f"{len(finca)}\n" + "".join(f"{a},{b},{c}\n" for a, b, c in finca))
+    entradas = buscar_entradas(str(tmp_path))
+    sin_cache = resolver_lote(entradas, "pd", procesos=1)
+    con_cache = resolver_lote(entradas, "pd", procesos=1, cache=str(tmp_path / "cache"))
+    assert [f["costo"] for f in con_cache] == [f["costo"] for f in sin_cache]
+    assert all(not f["error"] for f in con_cache)
+    assert len(list((tmp_path / "cache").glob("*.bin"))) == 2
@@ -1,7 +1,18 @@
 import pytest
+import csv
+import os
 import random
+import subprocess
+import sys
 import time
-from src.dinamica import roPD
+import tracemalloc
+from pathlib import Path
+import src.dinamica as dinamica
+from src.dinamica import (roPD, roPD_mascaras, roPD_compacto, roPD_numpy, roPD_ideales, roPD_disco,
+                          roPD_paralelo)
+from src.utils import calcular_costo
+
+BM_DIR = Path(__file__).resolve().parent / "benchmarks"
 
 
 # ----------------------------------------------------------
@@ -66,3 +77,284 @@ def test_dinamica_grande():
     assert isinstance(costo, (int, float))
     assert isinstance(orden, list)
     assert costo >= 0
+
+# ----------------------------------------------------------
+# (e) Motor por máscaras: mismo (costo, orden) que roPD
+# ----------------------------------------------------------
+def test_mascaras_igual_a_roPD():
+    rnd = random.Random(2024)
+    for _ in range(50):
+        n = rnd.randint(1, 8)
+        finca = [(rnd.randint(0, 20), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+        costo, orden = roPD_mascaras(finca)
+        assert (costo, orden) == roPD(finca)
+        assert calcular_costo(finca, orden) == costo
+
+
+def test_mascaras_finca_vacia():
+    assert roPD_mascaras([]) == (0, [])
+
+
+def test_mascaras_costos_fuera_de_int64():
+    finca = [(2 * 10**18, 12 * 10**17, 1), (0, 1, 4), (5, 3 * 10**18, 4)]
+    assert roPD_mascaras(finca) == roPD(finca)
+    assert roPD_mascaras(finca)[0] == calcular_costo(finca, roPD(finca)[1]) > 2**63
+
+
+# ----------------------------------------------------------
+# (f) Estado solo-subconjunto: mismo resultado, menos memoria
+# ----------------------------------------------------------
+def test_compacto_igual_a_roPD():
+    rnd = random.Random(7)
+    for _ in range(50):
+        n = rnd.randint(1, 8)
+        finca = [(rnd.randint(0, 20), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+        assert roPD_compacto(finca) == roPD(finca)
+
+
+def test_compacto_costos_fuera_de_int64():
+    for finca in ([(0, 2**61, 4), (0, 2**61, 4)],
+                  [(2 * 10**18, 12 * 10**17, 1), (0, 1, 4), (5, 3 * 10**18, 4)]):
+        costo, orden = roPD_compacto(finca)
+        assert (costo, orden) == roPD(finca) and costo >= 2**62
+
+
+def _pico_memoria(motor, finca):
+    tracemalloc.start()
+    motor(finca)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def test_compacto_usa_menos_memoria():
+    finca = generar_finca(12)
+    pico_pd = _pico_memoria(roPD, finca)
+    pico_compacto = _pico_memoria(roPD_compacto, finca)
+    print(f"\n[MEMORIA n=12] roPD={pico_pd} B, roPD_compacto={pico_compacto} B")
+    assert pico_compacto * 10 < pico_pd
+
+
+# ----------------------------------------------------------
+# (g) DP vectorizada por capas con NumPy
+# ----------------------------------------------------------
+def test_numpy_igual_a_roPD():
+    rnd = random.Random(99)
+    for _ in range(50):
+        n = rnd.randint(1, 9)
+        finca = [(rnd.randint(0, 20), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+        costo, orden = roPD_numpy(finca)
+        assert isinstance(costo, int)
+        assert (costo, orden) == roPD(finca)
+
+
+def test_numpy_costos_grandes():
+    # antes: el _INF de las columnas ajenas desbordaba y el orden no terminaba
+    finca = [(2 * 10**18, 12 * 10**17, 1), (0, 1, 4)]
+    assert roPD_numpy(finca) == roPD(finca) == (4, [1, 0])
+    finca = [(0, 2**61, 4), (0, 2**61, 4), (3, 5, 1)]
+    assert roPD_numpy(finca) == roPD(finca)
+    # cerca del tope de int64 pero dentro: sigue en NumPy y da lo mismo
+    finca = [(10**15, 10**15, 4), (0, 10**15, 1), (10**14, 3, 2)]
+    assert roPD_numpy(finca) == roPD(finca)
+
+
+def test_numpy_igual_a_compacto_n16():
+    finca = generar_finca(16)
+    start = time.time()
+    resultado = roPD_numpy(finca)
+    end = time.time()
+    print(f"\n[NUMPY] Tiempo: {end - start:.5f} s, n={len(finca)}")
+    assert resultado == roPD_compacto(finca)
+
+
+# ----------------------------------------------------------
+# (h) DP sobre ideales de las precedencias: mismo costo que roPD
+#     visitando muchos menos estados
+# ----------------------------------------------------------
+def test_ideales_igual_a_roPD():
+    rnd = random.Random(23)
+    for _ in range(200):
+        n = rnd.randint(0, 9)
+        finca = [(rnd.randint(0, 15), rnd.randint(1, 4), rnd.randint(1, 4)) for _ in range(n)]
+        finca += finca[:rnd.randint(0, 2)]  # con tablones repetidos
+        costo, orden = roPD_ideales(finca)
+        assert sorted(orden) == list(range(len(finca)))
+        assert calcular_costo(finca, orden) == costo == roPD_numpy(finca)[0]
+
+
+def test_ideales_n30():
+    rnd = random.Random(30)
+    finca = [(max(0, int(rnd.gauss(30, 15))), rnd.randint(1, 10), rnd.randint(1, 4)) for _ in range(30)]
+    estadisticas = {}
+    start = time.time()
+    costo, orden = roPD_ideales(finca, estadisticas)
+    end = time.time()
+    print(f"\n[IDEALES n=30] Tiempo: {end - start:.5f} s, estados={estadisticas['estados']} "
+          f"de {estadisticas['subconjuntos']}")
+    assert estadisticas["subconjuntos"] == 2 ** 30 - 1
+    assert estadisticas["estados"] < 10 ** 5
+    assert calcular_costo(finca, orden) == costo
+
+
+# ----------------------------------------------------------
+# (i) Tablas en disco: mismo resultado que roPD_numpy y se
+#     retoma desde la última capa completa
+# ----------------------------------------------------------
+def test_disco_igual_a_numpy(tmp_path):
+    rnd = random.Random(24)
+    for _ in range(30):
+        n = rnd.randint(0, 9)
+        finca = [(rnd.randint(0, 20), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+        assert roPD_disco(finca, tmp_path) == roPD_numpy(finca)
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ValueError, match="no entran en int64"):
+        roPD_disco([(2 * 10**18, 12 * 10**17, 1), (0, 1, 4)], tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_disco_retoma_despues_de_un_corte(tmp_path, monkeypatch):
+    finca = generar_finca(14)
+    relajar = dinamica._relajar_capa
+    llamadas = []
+
+    def cortar(*args):
+        if len(llamadas) == 6:
+            raise KeyboardInterrupt
+        llamadas.append(1)
+        relajar(*args)
+
+    monkeypatch.setattr(dinamica, "_relajar_capa", cortar)
+    with pytest.raises(KeyboardInterrupt):
+        roPD_disco(finca, tmp_path)
+    monkeypatch.setattr(dinamica, "_relajar_capa", relajar)
+
+    with pytest.raises(ValueError, match="otra finca"):
+        roPD_disco(finca[::-1], tmp_path)
+    estadisticas = {}
+    assert roPD_disco(finca, tmp_path, borrar=False, estadisticas=estadisticas) == roPD_numpy(finca)
+    assert estadisticas["capas_retomadas"] == 6
+    assert estadisticas["bytes_disco"] >= 17 * 2 ** 14
+    # con las tablas completas solo se reconstruye el orden
+    assert roPD_disco(finca, tmp_path, estadisticas=estadisticas) == roPD_numpy(finca)
+    assert estadisticas["capas_retomadas"] == 14
+
+
+# ----------------------------------------------------------
+# (j) Benchmark: hasta qué n llega cada motor con el mismo
+#     presupuesto de tiempo (RUN_SLOW=1 para ejecutarlo).
+#     Resultados en tests/benchmarks/bench_pd.csv
+# ----------------------------------------------------------
+def _n_maximo_en_presupuesto(motor, presupuesto, n_inicial=8):
+    n = n_inicial
+    filas = []
+    while True:
+        rnd = random.Random(n)
+        finca = [(rnd.randint(5, 40), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+        t0 = time.perf_counter()
+        motor(finca)
+        elapsed = time.perf_counter() - t0
+        filas.append((n, elapsed))
+        if elapsed > presupuesto:
+            return filas
+        n += 1
+
+
+@pytest.mark.skipif(os.environ.get("RUN_SLOW", "0") != "1", reason="benchmark lento")
+def test_benchmark_presupuesto_motores():
+    presupuesto = float(os.environ.get("PRESUPUESTO_PD", "5"))
+    csv_path = BM_DIR / "bench_pd.csv"
+    new_file = not csv_path.exists()
+    with csv_path.open("a", newline="", encoding="utf-8") as g:
+        w = csv.writer(g)
+        if new_file:
+            w.writerow(["motor", "n", "tiempo_segundos"])
+        for motor in (roPD, roPD_mascaras, roPD_compacto, roPD_numpy):
+            filas = _n_maximo_en_presupuesto(motor, presupuesto)
+            for n, elapsed in filas:
+                w.writerow([motor.__name__, n, f"{elapsed:.6f}"])
+            # el último n excedió el presupuesto
+            print(f"[{motor.__name__}] n máximo en {presupuesto}s: {filas[-2][0] if len(filas) > 1 else '-'}")
+
+
+# ----------------------------------------------------------
+# (k) Benchmark de roPD_disco: pico de memoria residente y
+#     tiempo frente a roPD_numpy, cada corrida en su propio
+#     proceso (RUN_SLOW=1; N_PD_DISCO="22,24,26" para elegir n).
+#     Resultados en tests/benchmarks/bench_pd_disco.csv
+# ----------------------------------------------------------
+_MEDIR_PD = """
+import random, resource, sys, tempfile, time
+from src.dinamica import roPD_disco, roPD_numpy
+n, motor = int(sys.argv[1]), sys.argv[2]
+rnd = random.Random(n)
+finca = [(rnd.randint(5, 40), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+t0 = time.perf_counter()
+if motor == "roPD_numpy":
+    roPD_numpy(finca)
+else:
+    with tempfile.TemporaryDirectory(dir=sys.argv[3]) as directorio:
+        roPD_disco(finca, directorio)
+print(time.perf_counter() - t0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+@pytest.mark.skipif(os.environ.get("RUN_SLOW", "0") != "1", reason="benchmark lento")
+def test_benchmark_disco(tmp_path):
+    raiz = Path(__file__).resolve().parent.parent
+    csv_path = BM_DIR / "bench_pd_disco.csv"
+    new_file = not csv_path.exists()
+    with csv_path.open("a", newline="", encoding="utf-8") as g:
+        w = csv.writer(g)
+        if new_file:
+            w.writerow(["motor", "n", "tiempo_segundos", "pico_rss_mb"])
+        for n in map(int, os.environ.get("N_PD_DISCO", "20,22").split(",")):
+            for motor in ("roPD_numpy", "roPD_disco"):
+                salida = subprocess.run([sys.executable, "-c", _MEDIR_PD, str(n), motor, str(tmp_path)],
+                                        cwd=raiz, capture_output=True, text=True, check=True).stdout
+                elapsed, rss_kb = salida.split()
+                w.writerow([motor, n, f"{float(elapsed):.3f}", f"{int(rss_kb) / 1024:.1f}"])
+                print(f"[{motor} n={n}] {float(elapsed):.2f} s, pico RSS {int(rss_kb) / 1024:.0f} MB")
+
+
+# ----------------------------------------------------------
+# (l) DP por capas en varios procesos: idéntica a la serial
+# ----------------------------------------------------------
+def test_paralelo_igual_a_numpy():
+    rnd = random.Random(25)
+    for n in (0, 1, 5, 8):  # n <= _BITS_TRAMO: va directo a roPD_numpy
+        finca = [(rnd.randint(0, 20), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+        assert roPD_paralelo(finca, procesos=2) == roPD_numpy(finca)
+    # con el pool; 4 * procesos = 12, 20, 28 no dividen las 256 combinaciones de bits altos
+    for n, procesos in ((9, 2), (10, 3), (12, 5), (13, 7), (14, 3), (16, 5)):
+        finca = [(rnd.randint(0, 20), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+        assert roPD_paralelo(finca, procesos=procesos) == roPD_numpy(finca)
+    grande = [(2 * 10**18, 12 * 10**17, 1)] + [(0, 1, 4)] * 9
+    assert roPD_paralelo(grande, procesos=2) == roPD(grande)
+
+
+# ----------------------------------------------------------
+# (m) Escalado fuerte de roPD_paralelo por cantidad de
+#     procesos (RUN_SLOW=1). Resultados en
+#     tests/benchmarks/bench_pd_paralelo.csv
+# ----------------------------------------------------------
+@pytest.mark.skipif(os.environ.get("RUN_SLOW", "0") != "1", reason="benchmark lento")
+@pytest.mark.parametrize("n", [20, 22, 24])
+def test_paralelo_escalado(n):
+    rnd = random.Random(n)
+    finca = [(rnd.randint(5, 40), rnd.randint(1, 5), rnd.randint(1, 4)) for _ in range(n)]
+    csv_path = BM_DIR / "bench_pd_paralelo.csv"
+    new_file = not csv_path.exists()
+    with csv_path.open("a", newline="", encoding="utf-8") as g:
+        w = csv.writer(g)
+        if new_file:
+            w.writerow(["n", "procesos", "nucleos", "tiempo_segundos"])
+        esperado = None
+        for procesos in (1, 2, 4, 8):
+            start = time.perf_counter()
+            resultado = roPD_paralelo(finca, procesos=procesos)
+            elapsed = time.perf_counter() - start
+            esperado = esperado or resultado
+            assert resultado == esperado
+            w.writerow([n, procesos, os.cpu_count(), f"{elapsed:.6f}"])
+            print(f"\n[PD PARALELO n={n} procesos={procesos}] Tiempo: {elapsed:.5f} s")
@@ -0,0 +1,72 @@
+import pickle
+
+import numpy as np
+import pytest
+from src.benchmark import generar_finca
+from src.busqueda_local import roV_local
+from src.cache import CacheResultados
+from src.dinamica import roPD, roPD_compacto, roPD_ideales, roPD_numpy
+from src.finca import Finca, columnas, columnas_np
+from src.formato_binario import guardar_finca_binaria
+from src.fuerza_bruta import roFB, roFB_paralelo
+from src.ramificacion_poda import precedencias, roBB
+from src.resolver import resolver
+from src.utils import calcular_costo, leer_finca
+from src.voraz import REGLAS, roV
+
+
+# ----------------------------------------------------------
+# (a) Se comporta como la lista de tuplas
+# ----------------------------------------------------------
+def test_compatible_con_lista_de_tuplas():
+    lista = generar_finca(20, semilla=1)
+    finca = Finca.desde(lista)
+    assert Finca.desde(finca) is finca
+    assert len(finca) == 20 and finca[3] == lista[3] and list(finca) == lista
+    assert finca.tolist() == lista and finca[5:8].tolist() == lista[5:8]
+    assert np.array_equal(np.asarray(finca), np.array(lista))
+    assert pickle.loads(pickle.dumps(finca)) == finca
+    assert finca.nbytes == 24 * 20
+    assert not hasattr(finca, "__dict__")
+    assert Finca.desde([]).tolist() == []
+
+    assert columnas(finca) == columnas(lista)
+    assert all(np.array_equal(a, b) for a, b in zip(columnas_np(finca), columnas_np(lista)))
+    with pytest.raises(ValueError, match="mismo largo"):
+        Finca([1, 2], [1], [1, 1])
+
+
+# ----------------------------------------------------------
+# (b) Todos los algoritmos la aceptan y dan lo mismo
+# ----------------------------------------------------------
+def test_algoritmos_dan_lo_mismo():
+    lista = generar_finca(9, semilla=2)
+    finca = Finca.desde(lista)
+    for funcion in (roV, roV_local, roFB, roPD, roPD_compacto, roPD_numpy, roPD_ideales, roBB, precedencias,
+                    lambda f: roFB_paralelo(f, procesos=2), lambda f: resolver(f)[:2],
+                    lambda f: CacheResultados().resolver(f, "pd")):
+        assert funcion(finca) == funcion(lista)
+    grande = generar_finca(3000, semilla=3) + [(5, 2, 2)] * 50  # con empates
+    for nombre, regla in REGLAS.items():
+        assert regla(Finca.desde(grande)) == regla(grande), nombre
+    perm = roV(grande)[0]
+    assert calcular_costo(Finca.desde(grande), perm) == calcular_costo(grande, perm)
+
+
+# ----------------------------------------------------------
+# (c) Lectura de texto y binaria (esta última sin copiar)
+# ----------------------------------------------------------
+def test_leer(tmp_path):
+    lista = generar_finca(100, semilla=4)
+    texto = tmp_path / "finca.txt"
+    texto.write_text(f"{len(lista)}\n" + "".join(f"{a},{b},{c}\n" for a, b, c in lista))
+    binario = tmp_path / "finca.bin"
+    guardar_finca_binaria(binario, lista)
+
+    assert Finca.leer(texto).tolist() == leer_finca(texto) == lista
+    finca = Finca.leer(binario)
+    assert finca.tolist() == lista
+    assert not finca.ts.flags.owndata and not finca.ts.flags.writeable
+    texto.write_text("1\n1,1,9\n")
+    with pytest.raises(ValueError, match="p debe estar en 1..4"):
+        Finca.leer(texto)
@@ -0,0 +1,73 @@
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+from src.benchmark import generar_finca
+from src.formato_binario import (
+    binario_a_texto,
+    es_finca_binaria,
+    guardar_finca_binaria,
+    leer_finca_binaria,
+    leer_salida_binaria,
+    texto_a_binario,
+)
+from src.utils import guardar_salida, leer_finca, leer_finca_np
+from src.voraz import roV
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# ----------------------------------------------------------
+# (a) Ida y vuelta texto -> binario -> texto sin pérdidas
+# ----------------------------------------------------------
+def test_conversion_ida_y_vuelta(tmp_path):
+    finca = generar_finca(500, semilla=1)
+    texto = tmp_path / "finca.txt"
+    texto.write_text(f"{len(finca)}\n" + "\n".join(f"{a},{b},{c}" for a, b, c in finca) + "\n")
+
+    assert texto_a_binario(texto, tmp_path / "finca.bin") == 500
+    assert binario_a_texto(tmp_path / "finca.bin", tmp_path / "otra.txt") == 500
+    assert (tmp_path / "otra.txt").read_text() == texto.read_text()
+
+
+# ----------------------------------------------------------
+# (b) Lectura sin copia y detección automática en los lectores
+# ----------------------------------------------------------
+def test_lectura_memmap_y_deteccion(tmp_path):
+    finca = generar_finca(100, semilla=2)
+    ruta = tmp_path / "finca.bin"
+    guardar_finca_binaria(ruta, finca)
+    assert es_finca_binaria(ruta)
+
+    datos = leer_finca_binaria(ruta)
+    assert isinstance(datos.base, np.memmap)
+    assert datos.shape == (100, 3)
+    assert leer_finca(str(ruta)) == finca
+    assert (leer_finca_np(str(ruta)) == datos).all()
+
+    guardar_finca_binaria(ruta, [(1, 1, 1), (0, 2, 5)])
+    with pytest.raises(ValueError, match="Tablón 1: p debe estar en 1..4"):
+        leer_finca_binaria(ruta)
+    ruta.write_bytes(ruta.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="tamaño inválido"):
+        leer_finca_binaria(ruta)
+
+
+# ----------------------------------------------------------
+# (c) La CLI de voraz lee binario y escribe la salida binaria
+# ----------------------------------------------------------
+def test_cli_voraz_binaria(tmp_path):
+    finca = generar_finca(200, semilla=3)
+    entrada = tmp_path / "finca.bin"
+    salida = tmp_path / "salida.bin"
+    guardar_finca_binaria(entrada, finca)
+    subprocess.run(
+        ["python", str(BASE_DIR / "src" / "voraz.py"), str(entrada), str(salida), "--binaria"],
+        check=True,
+    )
+    costo, perm = leer_salida_binaria(salida)
+    assert (costo, perm.tolist()) == (roV(finca)[1], roV(finca)[0])
+
+    guardar_salida(str(tmp_path / "s.bin"), costo, perm, binaria=True)
+    assert (tmp_path / "s.bin").read_bytes() == salida.read_bytes()
@@ -1,7 +1,15 @@
 import pytest
+import csv
+import os
 import random
 import time
-from src.fuerza_bruta import roFB
+import itertools
+import tracemalloc
+from pathlib import Path
+from src.fuerza_bruta import (
+    roFB, roFB_all, roFB_podado, _roFB_clasico, roFB_paralelo,
+    roFB_iter, roFB_mejores, roFB_dentro_de,
+)
 from src.utils import calcular_costo #funcion ubicada en utils
 
 # ----------------------------------------------------------
@@ -78,3 +86,109 @@ def test_fuerza_bruta_extra_grande():
     end = time.time()
     assert isinstance(costo, (int, float))
     print(f"\n[EXTRA GRANDE] Tiempo: {end - start:.5f} s, n={len(finca)}")
+
+# ----------------------------------------------------------
+# Prueba (f): enumeración por prefijos con poda = clásica
+# ----------------------------------------------------------
+def test_fuerza_bruta_podada_igual_a_clasica():
+    rnd = random.Random(5)
+    for _ in range(100):
+        n = rnd.randint(0, 7)
+        finca = [(rnd.randint(0, 15), rnd.randint(1, 4), rnd.randint(1, 4)) for _ in range(n)]
+        assert roFB_podado(finca) == _roFB_clasico(finca)
+        assert roFB(finca) == _roFB_clasico(finca)
+
+
+def test_fuerza_bruta_prioridad_negativa_usa_clasica():
+    # con p < 0 el costo de un prefijo puede bajar: la poda no es válida
+    finca = [(0, 2, -1), (0, 1, 1), (1, 1, 1)]
+    assert roFB(finca) == _roFB_clasico(finca)
+    assert roFB(finca, podar=False) == _roFB_clasico(finca)
+
+
+def test_fuerza_bruta_clasica_fuera_de_int64():
+    # costo_lote pasa a enteros de Python: el costo sigue siendo un int exacto
+    finca = [(0, 3 * 10**18, 4), (0, 3 * 10**18, 4), (5, 1, 2)]
+    perm, costo = roFB(finca, podar=False)
+    assert (perm, costo) == roFB_podado(finca) == ([2, 0, 1], 36 * 10**18 + 8)
+    assert type(costo) is int
+    finca = [(0, 3 * 10**18, -1), (0, 1, 1), (4, 2 * 10**18, 3)]
+    assert roFB(finca) == _roFB_clasico(finca)
+    assert calcular_costo(finca, roFB(finca)[0]) == roFB(finca)[1]
+
+
+# ----------------------------------------------------------
+# Prueba (g): versión multinúcleo = roFB serial
+# ----------------------------------------------------------
+@pytest.mark.parametrize("profundidad", [1, 2])
+def test_fuerza_bruta_paralela_igual_a_serial(profundidad):
+    rnd = random.Random(11)
+    for _ in range(10):
+        n = rnd.randint(2, 7)
+        # rangos chicos para forzar empates entre ramas
+        finca = [(rnd.randint(0, 8), rnd.randint(1, 3), rnd.randint(1, 2)) for _ in range(n)]
+        assert roFB_paralelo(finca, procesos=2, profundidad=profundidad) == roFB(finca)
+
+
+# ----------------------------------------------------------
+# Prueba (h): variantes en flujo (generador, top-k, tolerancia)
+# ----------------------------------------------------------
+def test_fuerza_bruta_iter_igual_a_all():
+    finca = generar_finca(6)
+    esperado = [(list(perm), calcular_costo(finca, perm)) for perm in itertools.permutations(range(6))]
+    assert list(roFB_iter(finca)) == esperado
+    assert roFB_all(finca) == esperado
+
+
+def test_fuerza_bruta_iter_es_perezoso():
+    finca = generar_finca(14)  # 14! permutaciones: solo se puede si es perezoso
+    perm, costo = next(roFB_iter(finca))
+    assert perm == list(range(14))
+    assert costo == calcular_costo(finca, perm)
+
+
+def test_fuerza_bruta_mejores_y_tolerancia():
+    finca = generar_finca(6)
+    todas = sorted(roFB_all(finca), key=lambda x: x[1])
+    assert roFB_mejores(finca, 10) == todas[:10]
+    optimo = todas[0][1]
+    dentro = list(roFB_dentro_de(finca, 3))
+    assert sorted(dentro, key=lambda x: x[1]) == [x for x in todas if x[1] <= optimo + 3]
+
+
+def test_fuerza_bruta_mejores_memoria_acotada():
+    finca = generar_finca(9)
+    tracemalloc.start()
+    mejores = roFB_mejores(finca, 100)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n[TOP-100 n=9] pico de memoria: {pico} B")
+    assert len(mejores) == 100
+    assert mejores[0][1] == roFB(finca)[1]
+    assert pico < 1_000_000  # los 9! resultados en una lista ocuparían decenas de MB
+
+
+# ----------------------------------------------------------
+# Prueba (i): escalado por cantidad de procesos (RUN_SLOW=1)
+#             Resultados en tests/benchmarks/bench_fb_paralelo.csv
+# ----------------------------------------------------------
+@pytest.mark.skipif(os.environ.get("RUN_SLOW", "0") != "1", reason="benchmark lento")
+@pytest.mark.parametrize("n", [10, 11])
+def test_fuerza_bruta_paralela_escalado(n):
+    random.seed(n)
+    finca = generar_finca(n)
+    csv_path = Path(__file__).resolve().parent / "benchmarks" / "bench_fb_paralelo.csv"
+    new_file = not csv_path.exists()
+    with csv_path.open("a", newline="", encoding="utf-8") as g:
+        w = csv.writer(g)
+        if new_file:
+            w.writerow(["n", "procesos", "nucleos", "tiempo_segundos"])
+        esperado = None
+        for procesos in (1, 2, 4, 8):
+            start = time.perf_counter()
+            resultado = roFB_paralelo(finca, procesos=procesos)
+            elapsed = time.perf_counter() - start
+            esperado = esperado or resultado
+            assert resultado == esperado
+            w.writerow([n, procesos, os.cpu_count(), f"{elapsed:.6f}"])
+            print(f"\n[PARALELO n={n} procesos={procesos}] Tiempo: {elapsed:.5f} s")
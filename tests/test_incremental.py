@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from src.benchmark import generar_finca
+from src.incremental import PlanificadorIncremental
+from src.utils import tiempos_inicio
+from src.voraz import roV
+
+
+def comparar_con_roV(plan, vivos):
+    """El plan debe dar el mismo orden, costo e inicios que roV sobre los tablones vivos."""
+    ids = sorted(vivos)
+    finca = [vivos[i] for i in ids]
+    pi, costo = roV(finca)
+    assert plan.orden() == [ids[k] for k in pi]
+    assert plan.costo == costo
+    assert len(plan) == len(ids)
+    inicios = tiempos_inicio(finca, pi) if finca else []
+    assert [plan.inicio(i) for i in ids] == inicios
+
+
+# ----------------------------------------------------------
+# (a) Construcción: mismo orden y costo que roV
+# ----------------------------------------------------------
+def test_construccion_igual_que_roV():
+    for n in (0, 1, 2, 7, 100, 1000):
+        finca = generar_finca(n, semilla=n)
+        plan = PlanificadorIncremental(finca)
+        comparar_con_roV(plan, dict(enumerate(finca)))
+
+
+# ----------------------------------------------------------
+# (b) Ediciones al azar: después de cada una coincide con roV
+#     (mu alto = muchos tablones a tiempo, que cruzan el 0 al editar)
+# ----------------------------------------------------------
+@pytest.mark.parametrize("mu", [30, 150])
+def test_ediciones_al_azar(mu):
+    rnd = random.Random(mu)
+    finca = generar_finca(30, semilla=mu, media=mu)
+    plan = PlanificadorIncremental(finca, semilla=mu)
+    vivos = dict(enumerate(finca))
+    for k in range(150):
+        nuevo = generar_finca(1, semilla=1000 * mu + k, media=mu)[0]
+        r = rnd.random()
+        if r < 0.35 or not vivos:
+            vivos[plan.agregar(*nuevo)] = nuevo
+        elif r < 0.6:
+            i = rnd.choice(list(vivos))
+            plan.quitar(i)
+            del vivos[i]
+        else:
+            i = rnd.choice(list(vivos))
+            plan.modificar(i, *nuevo)
+            vivos[i] = nuevo
+        comparar_con_roV(plan, vivos)
+
+
+# ----------------------------------------------------------
+# (c) Índices estables y validaciones
+# ----------------------------------------------------------
+def test_indices_y_errores():
+    plan = PlanificadorIncremental([(5, 2, 1), (3, 1, 2)])
+    assert plan.agregar(4, 1, 4) == 2
+    plan.quitar(0)
+    assert 0 not in plan and 2 in plan
+    assert plan.agregar(1, 1, 1) == 3
+    plan.modificar(2, tr=3)
+    assert plan.tablon(2) == (4, 3, 4)
+    assert plan.orden() == [3, 1, 2]
+
+    with pytest.raises(ValueError, match="Tablón 0: no está"):
+        plan.quitar(0)
+    with pytest.raises(ValueError, match="p debe estar en 1..4"):
+        plan.modificar(1, p=5)
+    with pytest.raises(ValueError, match="ts >= 0 y tr > 0"):
+        plan.agregar(1, 0, 1)
+    with pytest.raises(ValueError, match="Tablón 1: p debe"):
+        PlanificadorIncremental([(1, 1, 1), (1, 1, 9)])
+    assert plan.tablon(1) == (3, 1, 2)
@@ -0,0 +1,81 @@
+
+from src.benchmark import generar_finca
+from src.dinamica import roPD, roPD_numpy
+from src.fuerza_bruta import roFB
+from src.instrumentacion import NULO, Instrumentos, ejecutar, instrumentar, normalizar
+from src.ramificacion_poda import roBB
+from src.utils import medir_tiempo
+from src.voraz import roV
+
+
+# ----------------------------------------------------------
+# (a) Mismo orden (perm, costo) para todos los algoritmos
+# ----------------------------------------------------------
+def test_normalizar_y_medir_tiempo():
+    finca = generar_finca(8, semilla=1)
+    costo, orden = roPD(finca)
+    assert normalizar((costo, orden)) == (orden, costo)
+    assert normalizar((orden, costo)) == (orden, costo)
+    for funcion in (roFB, roPD, roPD_numpy, roV):
+        perm, c, duracion = medir_tiempo(funcion, finca)
+        assert isinstance(perm, list) and isinstance(c, int) and duracion >= 0
+    assert medir_tiempo(roPD, finca)[:2] == (orden, costo)
+
+
+# ----------------------------------------------------------
+# (b) Fases, contadores y memoria de cada motor
+# ----------------------------------------------------------
+def test_contadores_y_fases():
+    finca = generar_finca(10, semilla=2)
+
+    m = instrumentar(roPD_numpy, finca, memoria=True)
+    assert m.contadores == {"estados_dp": 2**10 - 1, "transiciones_dp": 10 * 2**9}
+    assert {"tiempos", "capas", "reconstruccion", "resolucion"} <= set(m.fases)
+    assert m.pico_memoria_bytes > 8 * 2**10
+    assert (m.costo, m.perm) == (roPD_numpy(finca)[0], roPD_numpy(finca)[1])
+
+    assert instrumentar(roPD, finca).contadores["estados_dp"] == 10 * 2**9
+
+    estadisticas = {}
+    roBB(finca, estadisticas)
+    m = instrumentar(roBB, finca)
+    assert all(m.contadores[k] == estadisticas[k] for k in ("nodos", "podas_cota", "podas_memoria"))
+    assert {"incumbente", "busqueda"} <= set(m.fases)
+
+    m = instrumentar(roFB, generar_finca(7, semilla=3), podar=False)
+    assert m.contadores["permutaciones_evaluadas"] == 5040
+    assert m.pico_memoria_bytes is None
+
+    m = instrumentar(roV, finca, regla="mejor")
+    assert m.contadores["permutaciones_evaluadas"] == 5
+
+
+# ----------------------------------------------------------
+# (c) Desactivado no guarda nada; activado suma fases repetidas
+# ----------------------------------------------------------
+def test_nulo_y_fases_repetidas():
+    with NULO.fase("x"):
+        NULO.contar("y", 3)
+    assert not NULO.activo
+
+    ins = Instrumentos()
+    for _ in range(3):
+        with ins.fase("x"):
+            ins.contar("y", 2)
+    assert ins.contadores == {"y": 6}
+    assert list(ins.fases) == ["x"] and ins.fases["x"] > 0
+
+
+# ----------------------------------------------------------
+# (d) Corrida completa: lectura, resolución, verificación, escritura
+# ----------------------------------------------------------
+def test_ejecutar_por_fases(tmp_path):
+    finca = generar_finca(500, semilla=4)
+    entrada = tmp_path / "finca.txt"
+    entrada.write_text(f"{len(finca)}\n" + "".join(f"{a},{b},{c}\n" for a, b, c in finca))
+    salida = tmp_path / "salida.txt"
+
+    m = ejecutar(str(entrada), roV, str(salida))
+    assert {"lectura", "resolucion", "verificacion", "escritura", "orden", "costo"} <= set(m.fases)
+    assert m.contadores["tablones"] == 500
+    assert int(salida.read_text().split()[0]) == m.costo == roV(finca)[1]
@@ -0,0 +1,67 @@
+import csv
+import subprocess
+from pathlib import Path
+
+from src.benchmark import generar_finca
+from src.lote import buscar_entradas, resolver_lote, ruta_salida
+from src.utils import calcular_costo
+from src.voraz import roV
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def escribir_finca(ruta, finca):
+    ruta.write_text(f"{len(finca)}\n" + "".join(f"{a},{b},{c}\n" for a, b, c in finca))
+
+
+def leer_salida(ruta):
+    lineas = ruta.read_text().split()
+    return int(lineas[0]), [int(x) for x in lineas[1:]]
+
+
+# ----------------------------------------------------------
+# (a) El lote en varios procesos da lo mismo que resolver una por una
+# ----------------------------------------------------------
+def test_lote_igual_que_uno_por_uno(tmp_path):
+    fincas = {f"f{k:02d}.txt": generar_finca(5 + k, semilla=k) for k in range(12)}
+    for nombre, finca in fincas.items():
+        escribir_finca(tmp_path / nombre, finca)
+    (tmp_path / "mala.txt").write_text("2\n1,1,1\n")
+
+    entradas = buscar_entradas(str(tmp_path))
+    assert len(entradas) == 13
+    filas = resolver_lote(entradas, "pd", procesos=2, chunksize=3)
+
+    assert [f["archivo"] for f in filas] == entradas
+    for fila in filas:
+        nombre = Path(fila["archivo"]).name
+        if nombre == "mala.txt":
+            assert "exactamente 3 líneas" in fila["error"]
+            continue
+        finca = fincas[nombre]
+        costo, perm = leer_salida(Path(ruta_salida(fila["archivo"])))
+        assert fila["costo"] == costo == calcular_costo(finca, perm)
+        assert fila["n"] == len(finca)
+        assert costo <= roV(finca)[1]
+
+    # las salidas no se vuelven a tomar como entradas
+    assert len(buscar_entradas(str(tmp_path))) == 13
+
+
+# ----------------------------------------------------------
+# (b) CLI: glob de entrada y resumen CSV
+# ----------------------------------------------------------
+def test_cli_lote_con_glob(tmp_path):
+    for k in range(4):
+        escribir_finca(tmp_path / f"g{k}.txt", generar_finca(30, semilla=10 + k))
+    resumen = tmp_path / "r.csv"
+    subprocess.run(
+        ["python", str(BASE_DIR / "src" / "lote.py"), str(tmp_path / "g*.txt"),
+         "--procesos", "2", "--resumen", str(resumen)],
+        check=True, capture_output=True,
+    )
+    with open(resumen, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert [Path(f["archivo"]).name for f in filas] == [f"g{k}.txt" for k in range(4)]
+    assert all(f["algoritmo"] == "voraz" and f["n"] == "30" and not f["error"] for f in filas)
+    assert all((tmp_path / f"g{k}.salida.txt").exists() for k in range(4))
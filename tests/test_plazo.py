@@ -0,0 +1,70 @@
+import threading
+import time
+
+from src.benchmark import generar_finca
+from src.busqueda_local import mejorar_local
+from src.dinamica import roPD
+from src.plazo import resolver_con_plazo
+from src.ramificacion_poda import roBB
+from src.utils import calcular_costo
+from src.voraz import roV
+
+
+def es_valido(finca, r):
+    return sorted(r.perm) == list(range(len(finca))) and calcular_costo(finca, r.perm) == r.costo
+
+
+# ----------------------------------------------------------
+# (a) n chico: óptimo probado, historial decreciente y progreso
+# ----------------------------------------------------------
+def test_optimo_con_tiempo_de_sobra():
+    for n in (6, 14):
+        finca = generar_finca(n, semilla=n)
+        vistos = []
+        r = resolver_con_plazo(finca, segundos=30, progreso=vistos.append)
+        assert r.optimo and r.detenido is None
+        assert r.costo == roPD(finca)[0] and es_valido(finca, r)
+        assert vistos == r.historial and vistos[0].etapa == "voraz"
+        costos = [p.costo for p in vistos]
+        assert costos == sorted(costos, reverse=True) and len(set(costos)) == len(costos)
+
+
+# ----------------------------------------------------------
+# (b) Plazo corto: devuelve a tiempo un orden válido sin prueba
+# ----------------------------------------------------------
+def test_plazo_corto():
+    finca = generar_finca(100, semilla=56)
+    inicio = time.perf_counter()
+    r = resolver_con_plazo(finca, segundos=0.3, memoria=0)
+    assert time.perf_counter() - inicio < 1.5
+    assert es_valido(finca, r) and r.costo <= roV(finca)[1]
+    assert not r.optimo and r.detenido == "plazo"
+
+
+# ----------------------------------------------------------
+# (c) Cancelación desde otro hilo o con una función
+# ----------------------------------------------------------
+def test_cancelacion():
+    finca = generar_finca(100, semilla=56)
+    evento = threading.Event()
+    threading.Timer(0.2, evento.set).start()
+    r = resolver_con_plazo(finca, segundos=60, cancelar=evento.is_set, memoria=0)
+    assert es_valido(finca, r) and not r.optimo and r.detenido == "cancelado"
+
+    r = resolver_con_plazo(finca, segundos=60, cancelar=lambda: True)
+    assert es_valido(finca, r) and r.etapa == "voraz" and r.detenido == "cancelado"
+
+
+# ----------------------------------------------------------
+# (d) Los ganchos detener de roBB y mejorar_local
+# ----------------------------------------------------------
+def test_ganchos_detener():
+    finca = generar_finca(40, semilla=7)
+    perm0, costo0 = roV(finca)
+    estadisticas = {}
+    perm, costo = roBB(finca, estadisticas, incumbente=(perm0, costo0), detener=lambda: True)
+    assert not estadisticas["completa"] and costo <= costo0
+    assert calcular_costo(finca, perm) == costo
+
+    perm, costo = mejorar_local(finca, perm0, detener=lambda: True)
+    assert sorted(perm) == list(range(40)) and calcular_costo(finca, perm) == costo <= costo0
@@ -0,0 +1,81 @@
+import os
+import random
+import time
+import pytest
+from src.benchmark import generar_finca
+from src.ramificacion_poda import roBB, precedencias
+from src.dinamica import roPD_numpy
+from src.voraz import roV
+from src.utils import calcular_costo
+
+
+# ----------------------------------------------------------
+# (a) Óptimo igual al de la programación dinámica
+# ----------------------------------------------------------
+def test_roBB_igual_a_roPD():
+    rnd = random.Random(31)
+    for _ in range(200):
+        n = rnd.randint(0, 9)
+        finca = [(rnd.randint(0, 15), rnd.randint(1, 4), rnd.randint(1, 4)) for _ in range(n)]
+        perm, costo = roBB(finca)
+        assert sorted(perm) == list(range(n))
+        assert calcular_costo(finca, perm) == costo
+        assert costo == roPD_numpy(finca)[0]
+
+# ----------------------------------------------------------
+# (b) Precedencias: el dominante va antes y no hay ciclos
+# ----------------------------------------------------------
+def test_precedencias_dominancia():
+    # 0 domina a 1 (menor tr, mayor p, menor ts); 2 nunca se retrasa
+    finca = [(2, 1, 4), (5, 3, 2), (100, 2, 1)]
+    pred = precedencias(finca)
+    assert pred[1] & (1 << 0)
+    assert not pred[0] & (1 << 1)
+    assert pred[2] == 0b011
+
+
+def test_precedencias_emmons_y_cierre():
+    # 1 tiene que esperar a 0 (regla 1), así que no termina antes de 4:
+    # 2 (menor tr, mayor p, ts = 3 > ts_1 pero <= 4) va antes de 1 (regla 3)
+    finca = [(0, 1, 4), (2, 3, 2), (3, 2, 3), (7, 5, 1)]
+    pred = precedencias(finca)
+    assert pred[1] == 0b101
+    assert pred[3] == 0b111
+    for j, mask in enumerate(pred):
+        assert not mask >> j & 1
+        assert all(mask | pred[i] == mask for i in range(len(finca)) if mask >> i & 1)
+
+
+def test_precedencias_identicos_por_indice():
+    pred = precedencias([(5, 2, 3), (5, 2, 3)])
+    assert pred == [0, 0b01]
+
+# ----------------------------------------------------------
+# (c) Estadísticas y finca mediana (n=20, más allá de roFB)
+# ----------------------------------------------------------
+def test_roBB_estadisticas_n20():
+    finca = generar_finca(20, semilla=7)
+    estadisticas = {}
+    perm, costo = roBB(finca, estadisticas)
+    print(f"\n[roBB n=20] costo={costo} nodos={estadisticas['nodos']} "
+          f"tiempo={estadisticas['tiempo_segundos']:.4f}s")
+    assert costo == roPD_numpy(finca)[0]
+    assert estadisticas["costo_inicial"] == roV(finca)[1]
+    assert estadisticas["nodos"] >= 1
+    for clave in ("podas_cota", "podas_dominancia", "podas_memoria", "tiempo_segundos"):
+        assert clave in estadisticas
+
+# ----------------------------------------------------------
+# (d) Escalado más allá de roPD (RUN_SLOW=1 para ejecutarlo)
+# ----------------------------------------------------------
+@pytest.mark.skipif(os.environ.get("RUN_SLOW", "0") != "1", reason="benchmark lento")
+@pytest.mark.parametrize("n", [30, 40, 50])
+def test_roBB_escalado(n):
+    finca = generar_finca(n, semilla=n)
+    estadisticas = {}
+    start = time.time()
+    perm, costo = roBB(finca, estadisticas)
+    end = time.time()
+    print(f"\n[roBB n={n}] tiempo={end - start:.3f}s nodos={estadisticas['nodos']} "
+          f"costo={costo} (roV={estadisticas['costo_inicial']})")
+    assert calcular_costo(finca, perm) == costo <= estadisticas["costo_inicial"]
@@ -0,0 +1,89 @@
+import subprocess
+from pathlib import Path
+
+from src.benchmark import generar_finca
+from src.dinamica import roPD_compacto, roPD_numpy
+from src.fuerza_bruta import roFB
+from src.resolver import Presupuesto, elegir_motor, estimar_pd, resolver
+from src.utils import calcular_costo
+from src.voraz import roV
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# ----------------------------------------------------------
+# (a) Elección del motor según n y el presupuesto
+# ----------------------------------------------------------
+def test_elegir_motor():
+    assert elegir_motor(5) == "fb"
+    assert elegir_motor(15) == "pd"
+    assert elegir_motor(21) == "heuristica"
+    assert elegir_motor(21, Presupuesto(segundos=10)) == "pd"
+    assert elegir_motor(21, Presupuesto(segundos=0.1)) == "heuristica"
+    assert elegir_motor(18, Presupuesto(memoria=1 << 20)) == "heuristica"
+    assert elegir_motor(100, Presupuesto(segundos=3600)) == "heuristica"
+    assert elegir_motor(1_000_000, Presupuesto(segundos=3600)) == "heuristica"
+    assert elegir_motor(20, cabe_en_int64=False) == "heuristica"
+    assert elegir_motor(16, cabe_en_int64=False) == "pd"
+
+
+# ----------------------------------------------------------
+# (b) Los motores exactos reportan óptimo y coinciden con roFB/roPD
+# ----------------------------------------------------------
+def test_resolver_exacto_y_heuristico():
+    for n, seed in ((6, 1), (8, 2), (12, 3), (14, 4)):
+        finca = generar_finca(n, seed)
+        r = resolver(finca)
+        assert r.optimo and r.motor in ("fb", "pd")
+        assert r.costo == calcular_costo(finca, r.perm)
+        assert r.costo == (roFB(finca)[1] if n <= 8 else roPD_numpy(finca)[0])
+
+    finca = generar_finca(300, semilla=5)
+    r = resolver(finca, Presupuesto(segundos=1.0))
+    assert r.motor == "voraz+local" and not r.optimo
+    assert r.costo == calcular_costo(finca, r.perm) <= roV(finca)[1]
+
+    holgada = [(1000, 1, 1)] * 50
+    assert resolver(holgada).optimo
+
+    # ts y tr sin tope: la DP no puede desbordar int64
+    for finca in ([(0, 10**17, 4)] * 10, [(2 * 10**18, 12 * 10**17, 1)] + generar_finca(11, semilla=6)):
+        r = resolver(finca)
+        assert r.motor == "pd" and r.optimo
+        assert r.costo == calcular_costo(finca, r.perm) == roPD_compacto(finca)[0]
+
+
+# ----------------------------------------------------------
+# (c) n grande: la estimación de PD no desborda y se usa la heurística
+# ----------------------------------------------------------
+def test_resolver_n_grande():
+    assert estimar_pd(1014)[0] == estimar_pd(5000)[0] == float("inf")
+    finca = generar_finca(1500, semilla=9)
+    for presupuesto in (None, Presupuesto(segundos=3600, memoria=1 << 40)):
+        r = resolver(finca, presupuesto)
+        assert r.motor == "voraz+local" and not r.optimo
+        assert r.costo == calcular_costo(finca, r.perm)
+
+
+# ----------------------------------------------------------
+# (d) main.py usa el resolver
+# ----------------------------------------------------------
+def test_main_con_resolver(tmp_path):
+    salida = tmp_path / "salida.txt"
+    proc = subprocess.run(
+        ["python", str(BASE_DIR / "src" / "main.py"), str(BASE_DIR / "data" / "ejemplo1.txt"),
+         "--salida", str(salida)],
+        check=True, capture_output=True, text=True,
+    )
+    assert "motor: fb (optimo)" in proc.stdout
+    assert int(salida.read_text().split()[0]) == roFB([(10, 3, 4), (5, 3, 3), (2, 2, 1), (8, 1, 1), (6, 4, 2)])[1]
+
+    # una entrada válida con costos que no entran en int64
+    entrada = tmp_path / "grande.txt"
+    entrada.write_text("10\n" + "0,100000000000000000,4\n" * 10)
+    proc = subprocess.run(
+        ["python", str(BASE_DIR / "src" / "main.py"), str(entrada), "--salida", str(salida)],
+        check=True, capture_output=True, text=True, timeout=60,
+    )
+    assert "motor: pd (optimo)" in proc.stdout
+    assert int(salida.read_text().split()[0]) == 4 * 10**17 * 55
@@ -51,3 +51,158 @@ def test_guardar_salida(tmp_path):
     assert [int(x) for x in lineas[1:]] == perm, "La permutación escrita es incorrecta"
  
  
+
+def test_costo_lote_una_y_varias_permutaciones():
+    """
+    con este test se verifica que costo_lote calcule lo mismo para una permutacion
+    suelta que para un lote (k x n), y que los inicios sean los de tiempos_inicio
+    """
+    import numpy as np
+    from src.utils import costo_lote, tiempos_inicio
+
+    finca = [(10, 3, 4), (5, 3, 3), (2, 2, 1), (8, 1, 1), (6, 4, 2)]
+    lote = [[0, 1, 4, 2, 3], [2, 1, 4, 3, 0], [0, 1, 2, 3, 4]]
+
+    assert costo_lote(finca, lote[0]) == 26
+    assert costo_lote(np.array(finca), lote[1]) == 20
+
+    costos, inicios = costo_lote(finca, lote, con_inicios=True)
+    assert costos.tolist() == [calcular_costo(finca, perm) for perm in lote]
+    assert inicios.shape == (3, 5)
+    for fila, perm in zip(inicios.tolist(), lote):
+        assert fila == tiempos_inicio(finca, perm)
+    assert tiempos_inicio(finca, [0, 1, 4, 2, 3]) == [0, 3, 10, 12, 6]
+
+
+def test_costo_exacto_con_valores_grandes():
+    """
+    con este test se verifica que calcular_costo y costo_lote no desborden int64
+    con valores grandes (se calcula con enteros de Python) y que tiempos_inicio
+    acepte permutaciones parciales como el original
+    """
+    from src.finca import Finca
+    from src.utils import costo_lote, tiempos_inicio
+
+    grande = [(0, 10**10, 10**10), (0, 10**10, 10**10)]
+    assert calcular_costo(grande, [0, 1]) == 3 * 10**20
+    assert calcular_costo(Finca.desde(grande), [1, 0]) == 3 * 10**20
+    assert calcular_costo([(0, 10**25, 1), (5, 1, 2)], [1, 0]) == 10**25 + 1
+    costos, inicios = costo_lote(grande, [[0, 1], [1, 0]], con_inicios=True)
+    assert costos.tolist() == [3 * 10**20] * 2
+    assert inicios.tolist() == [[0, 10**10], [10**10, 0]]
+
+    f3 = [(5, 2, 1), (3, 1, 2), (4, 3, 1)]
+    assert tiempos_inicio(f3, [2, 0]) == [3, 0, 0]
+    assert tiempos_inicio(grande, [1]) == [0, 0]
+
+
+def test_leer_finca_acepta_lo_del_lector_original(tmp_path):
+    """
+    con este test se verifica que leer_finca siga aceptando fines de linea \\r solos
+    y enteros de mas de 18 digitos, y que leer_finca_np avise si no entran en int64
+    """
+    from src.utils import leer_finca_np
+
+    ruta = tmp_path / "finca.txt"
+    ruta.write_bytes(b"2\r10,3,4\r5,3,3\r")
+    assert leer_finca(str(ruta)) == [(10, 3, 4), (5, 3, 3)]
+    assert leer_finca_np(str(ruta)).tolist() == [[10, 3, 4], [5, 3, 3]]
+
+    ruta.write_text("1\n1234567890123456789012345,0000000000000000000007,4\n")
+    assert leer_finca(str(ruta)) == [(1234567890123456789012345, 7, 4)]
+    with pytest.raises(ValueError, match="no entran en enteros de 64 bits"):
+        leer_finca_np(str(ruta))
+    ruta.write_bytes(b"1\r1,x,1\r")
+    with pytest.raises(ValueError, match="deben ser enteros"):
+        leer_finca(str(ruta))
+
+
+def test_leer_finca_no_relee_los_archivos_invalidos(tmp_path, monkeypatch):
+    """
+    con este test se verifica que un archivo invalido se lea una sola vez: el
+    lector linea por linea solo entra con \r solos o mas de 18 digitos, y
+    leer_finca no vuelve a leer el archivo si los valores no entran en int64
+    """
+    import src.utils as utils
+
+    llamadas = []
+    exacta = utils._leer_finca_exacta
+    monkeypatch.setattr(utils, "_leer_finca_exacta", lambda ruta: llamadas.append(ruta) or exacta(ruta))
+    ruta = tmp_path / "finca.txt"
+    for texto, mensaje in (("2\n1,x,1\n2,2,2\n", "deben ser enteros"), ("1\n1,1,7\n", "p debe estar"),
+                           ("3\n1,1,1\n", "exactamente 4"), ("n\n", "entero n")):
+        ruta.write_text(texto)
+        with pytest.raises(ValueError, match=mensaje):
+            leer_finca(str(ruta))
+    assert llamadas == []
+
+    ruta.write_text("1\n1234567890123456789012345,7,4\n")
+    assert leer_finca(str(ruta)) == [(1234567890123456789012345, 7, 4)]
+    assert len(llamadas) == 1
+
+
+def test_leer_finca_np_valida_con_numeros_de_linea(tmp_path, monkeypatch):
+    """
+    con este test se verifica que leer_finca_np lea lo mismo que leer_finca, tambien
+    partiendo el archivo en bloques chicos, y que los errores traigan la linea
+    contando solo las lineas no vacias (el encabezado es la linea 1)
+    """
+    import re
+    import numpy as np
+    import src.utils as utils
+    from src.utils import leer_finca_np
+
+    ruta = tmp_path / "finca.txt"
+    ruta.write_text("3\n\n 10, 3 ,4\r\n+5,3,3\n\t\n2,2,1")
+    esperado = [(10, 3, 4), (5, 3, 3), (2, 2, 1)]
+    assert leer_finca_np(str(ruta)).tolist() == [list(t) for t in esperado]
+    monkeypatch.setattr(utils, "_BLOQUE_LECTURA", 5)
+    assert leer_finca(str(ruta)) == esperado
+
+    filas = np.random.default_rng(0).integers(1, 5, size=(2000, 3))
+    ruta.write_text("2000\n" + "\n".join(",".join(map(str, f)) for f in filas) + "\n")
+    assert (leer_finca_np(str(ruta)) == filas).all()
+
+    casos = [
+        ("", "Archivo de entrada vacío"),
+        ("dos\n1,1,1\n", "La primera línea debe ser un entero n."),
+        ("2\n1,1,1\n", "exactamente 3 líneas no vacías (n + datos=2); se encontraron 2."),
+        ("2\n1,1,1\n\n1,1\n", "Línea 3: se esperaban exactamente 3 valores"),
+        ("2\n1,1,1\n1,1 1,1\n", "Línea 3: ts,tr,p deben ser enteros."),
+        ("2\n1,1,1\n1,1,-\n", "Línea 3: ts,tr,p deben ser enteros."),
+        ("2\n1,1,5\n1,1\n", "Línea 2: p debe estar en 1..4, recibido p=5."),
+        ("2\n1,1,1\n1,0,1\n", "Línea 3: ts >= 0 y tr > 0, recibido ts=1, tr=0."),
+    ]
+    for contenido, mensaje in casos:
+        ruta.write_text(contenido)
+        with pytest.raises(ValueError, match=re.escape(mensaje)):
+            leer_finca_np(str(ruta))
+
+
+def test_guardar_salida_en_bloque_igual_al_formato_de_siempre(tmp_path, monkeypatch):
+    """
+    con este test se verifica que guardar_salida escriba exactamente los mismos bytes
+    que un write por linea (tambien partiendo en bloques chicos), y que con inicios
+    cada linea lleve el instante de inicio del tablon que se riega
+    """
+    import random
+    import numpy as np
+    import src.utils as utils
+    from src.utils import tiempos_inicio
+
+    monkeypatch.setattr(utils, "_FILAS_POR_BLOQUE", 7)
+    rnd = random.Random(4)
+    finca = [(rnd.randint(0, 10**6), rnd.randint(1, 10**5), rnd.randint(1, 4)) for _ in range(300)]
+    perm = list(range(300))
+    rnd.shuffle(perm)
+    costo = calcular_costo(finca, perm)
+
+    for ruta, datos in ((tmp_path / "a.txt", perm), (tmp_path / "b.txt", np.array(perm))):
+        guardar_salida(str(ruta), costo, datos)
+        assert ruta.read_bytes() == (f"{costo}\n" + "".join(f"{i}\n" for i in perm)).encode()
+
+    inicios = tiempos_inicio(finca, perm)
+    guardar_salida(str(tmp_path / "c.txt"), costo, perm, inicios=inicios)
+    lineas = (tmp_path / "c.txt").read_text().splitlines()
+    assert lineas[0] == str(costo)
+    assert lineas[1:] == [f"{i},{inicios[i]}" for i in perm]
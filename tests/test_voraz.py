@@ -8,12 +8,16 @@ Pruebas integradas (todo en un solo archivo):
 4) Escalado con tiempos y 5 repeticiones por tamaño:
    - Siempre: 10, 100, 1_000
    - Opcional (si RUN_SLOW=1): 10_000, 50_000
+5) Registro de reglas de despacho y modo "mejor".
+6) Modo en flujo (--stream): igual a roV bajo el tope, llegadas y salida al momento.
 
 Los resultados de tiempos se guardan en tests/benchmarks/bench_<n>.csv
 """
 
 from pathlib import Path
 import csv
+import inspect
+import itertools
 import os
 import random
 import subprocess
@@ -223,3 +227,137 @@ def test_escalado_con_tiempos(n):
 
         _registrar_benchmark_csv(n, rep, elapsed)
         print(f"[n={n} rep={rep}] tiempo={elapsed:.6f}s costo={costo}")
+
+
+# ----------------------------
+# 5) Registro de reglas de despacho
+# ----------------------------
+def _despacho_ingenuo(finca, prioridad):
+    """Referencia O(n^2): en cada paso elige el menor (prioridad(t, j), j)."""
+    pendientes = set(range(len(finca)))
+    t = 0
+    pi = []
+    while pendientes:
+        j = min(pendientes, key=lambda j: (prioridad(t, j), j))
+        pendientes.remove(j)
+        pi.append(j)
+        t += finca[j][1]
+    return pi
+
+
+def test_reglas_dinamicas_igual_a_referencia():
+    from src.voraz import REGLAS
+    import math
+    for seed in range(40):
+        finca = _generar_finca(random.Random(seed).randint(1, 30), seed)
+        ts = [f[0] for f in finca]
+        tr = [f[1] for f in finca]
+        p = [f[2] for f in finca]
+        assert REGLAS["mdd"](finca) == _despacho_ingenuo(finca, lambda t, j: max(ts[j], t + tr[j]))
+        assert REGLAS["wmdd"](finca) == _despacho_ingenuo(finca, lambda t, j: max(tr[j], ts[j] - t) / p[j])
+        escala = 2.0 * sum(tr) / len(finca)
+        atc = _despacho_ingenuo(
+            finca, lambda t, j: -(p[j] / tr[j]) * math.exp(-max(ts[j] - tr[j] - t, 0) / escala)
+        )
+        assert _recalcular_costo(finca, REGLAS["atc"](finca)) == _recalcular_costo(finca, atc)
+
+
+def test_regla_mejor_y_reporte_de_costos():
+    from src.voraz import roV, evaluar_reglas
+    finca = _generar_finca(200, seed=77)
+    resultados = evaluar_reglas(finca)
+    assert set(resultados) >= {"edd", "wspt", "mdd", "wmdd", "atc"}
+    for nombre, (perm, costo) in resultados.items():
+        _validar_perm(perm, len(finca))
+        assert costo == _recalcular_costo(finca, perm), nombre
+    assert roV(finca, "mejor")[1] == min(c for _, c in resultados.values())
+    assert roV(finca) == resultados["edd"]
+    with pytest.raises(ValueError):
+        roV(finca, "no-existe")
+
+
+def test_cli_regla_mejor():
+    finca = _generar_finca(50, seed=3)
+    _escribir_entrada_finca(ENTRADA, finca)
+    proc = subprocess.run(
+        ["python", str(SRC), str(ENTRADA), str(SALIDA), "--regla", "mejor"],
+        check=True, capture_output=True, text=True,
+    )
+    costos = dict(linea.split(": ") for linea in proc.stdout.strip().splitlines())
+    costo, perm, _ = _leer_salida(SALIDA)
+    _validar_perm(perm, 50)
+    assert costo == min(int(c) for c in costos.values())
+
+
+def test_main_regla_mejor_evalua_una_vez(monkeypatch, capsys):
+    import src.voraz as voraz
+    finca = _generar_finca(50, seed=4)
+    _escribir_entrada_finca(ENTRADA, finca)
+    llamadas = []
+    evaluar = voraz.evaluar_reglas
+    monkeypatch.setattr(voraz, "evaluar_reglas", lambda f: llamadas.append(1) or evaluar(f))
+    voraz.main([str(ENTRADA), str(SALIDA), "--regla", "mejor"])
+    assert len(llamadas) == 1
+    costos = dict(linea.split(": ") for linea in capsys.readouterr().out.strip().splitlines())
+    assert _leer_salida(SALIDA)[0] == voraz.roV(finca, "mejor")[1] == min(int(c) for c in costos.values())
+
+
+# ----------------------------
+# 6) Modo en flujo (--stream)
+# ----------------------------
+def test_flujo_igual_a_roV_y_con_llegadas():
+    from src.voraz import MAX_PENDIENTES, leer_tablones_flujo, roV, roV_flujo
+    finca = _generar_finca(300, seed=21)
+    for regla in ("edd", "wspt"):
+        emitidos = list(roV_flujo(finca, regla))
+        perm, costo = roV(finca, regla)
+        assert [j for j, _, _ in emitidos] == perm
+        assert emitidos[-1][2] == costo
+        assert [inicio for _, inicio, _ in emitidos] == [
+            sum(finca[k][1] for k in perm[:pos]) for pos in range(len(perm))
+        ]
+    # con tope 1 no hay elección: se riega en orden de llegada
+    assert [j for j, _, _ in roV_flujo(finca, max_pendientes=1)] == list(range(300))
+    # el tope por defecto es finito: una entrada sin fin igual produce salida
+    assert inspect.signature(roV_flujo).parameters["max_pendientes"].default == MAX_PENDIENTES
+    assert list(itertools.islice(roV_flujo(itertools.repeat((5, 1, 1)), max_pendientes=50), 3)) == [
+        (0, 0, 0), (1, 1, 0), (2, 2, 0)]
+    assert list(roV_flujo(finca, max_pendientes=None)) == list(roV_flujo(finca))
+
+    # el regador espera la llegada de 2; al llegar 3 ya está regando 2
+    lineas = ["4\n", "10,4,1,0\n", "3,2,2\n", "\n", "0,5,4,20\n", "1,1,1,21\n"]
+    tablones = list(leer_tablones_flujo(lineas))
+    assert tablones[1] == (3, 2, 2, 0)
+    assert list(roV_flujo(tablones)) == [(1, 0, 0), (0, 2, 0), (2, 20, 100), (3, 25, 125)]
+    with pytest.raises(ValueError, match="Línea 3: la llegada 5 es anterior"):
+        list(leer_tablones_flujo(["1,1,1,9\n", "\n", "1,1,1,5\n"]))
+    with pytest.raises(ValueError, match="Línea 1: p debe estar en 1..4"):
+        list(leer_tablones_flujo(["1,1,7\n"]))
+
+
+def test_cli_flujo_emite_antes_del_fin():
+    import select
+    proc = subprocess.Popen(
+        ["python", str(SRC), "--stream", "--max-pendientes", "8"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        proc.stdin.write("5,3,2,0\n1,1,1,50\n")
+        proc.stdin.flush()
+        # la entrada sigue abierta y el primer tablón ya tiene que estar decidido
+        listo, _, _ = select.select([proc.stdout], [], [], 30)
+        assert listo and proc.stdout.readline() == "0,0,0\n"
+        proc.stdin.write("1,1,1,50\n")
+        proc.stdin.close()
+        assert proc.stdout.read().splitlines() == ["1,50,50", "2,51,101"]
+        assert proc.wait(timeout=30) == 0
+    finally:
+        proc.kill()
+
+    finca = _generar_finca(40, seed=5)
+    _escribir_entrada_finca(ENTRADA, finca)
+    subprocess.run(["python", str(SRC), "--stream", str(ENTRADA), str(SALIDA)], check=True)
+    from src.voraz import roV
+    filas = [linea.split(",") for linea in SALIDA.read_text(encoding="utf-8").split()]
+    assert [int(f[0]) for f in filas] == roV(finca)[0]
+    assert int(filas[-1][2]) == roV(finca)[1]